@@ -11,6 +11,10 @@ import os
 
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings.dev')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'BookLog.settings')
+# под ASGI синхронный код идёт в разных потоках, и постоянное соединение
+# осталось бы открытым у каждого — по умолчанию соединение на запрос
+# (значение из окружения процесса важнее .env; DB_POOL работает как обычно)
+os.environ.setdefault('DB_CONN_MAX_AGE', '0')
 
 application = get_asgi_application()
@@ -0,0 +1,119 @@
+# BookLog/db.py
+"""
+Соединения с PostgreSQL по воркерам.
+
+Режим задаётся в settings (DB_CONN_MAX_AGE, DB_POOL — см. settings/base.py).
+Каждый процесс считает обслуженные запросы и открытия соединения Django
+(connection_created) и раз в PUBLISH_EVERY запросов кладёт свои цифры в общий
+кэш — manage.py db_connections показывает их по всем воркерам. Если соединений
+открыто почти столько же, сколько запросов, переиспользование не работает.
+
+С локальным кэшем (без REDIS_URL) каждый процесс видит только себя.
+"""
+import os
+import time
+
+from django.core.cache import cache
+from django.core.signals import request_started
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+
+WORKERS_KEY = 'db:workers'
+WORKER_KEY = 'db:worker:{pid}'
+# запись воркера, который давно не публиковался (остановлен), пропадает сама
+STATS_TIMEOUT = 600
+PUBLISH_EVERY = 50
+
+_stats = {'pid': None}
+
+
+def _local():
+    # после fork (gunicorn/uvicorn --workers) счётчики начинаются заново
+    if _stats['pid'] != os.getpid():
+        _stats.update(pid=os.getpid(), started_at=time.time(), requests=0, connects=0)
+    return _stats
+
+
+def _on_connection_created(sender, connection, **kwargs):
+    if connection.alias == DEFAULT_DB_ALIAS:
+        _local()['connects'] += 1
+
+
+def _on_request_started(sender, **kwargs):
+    stats = _local()
+    stats['requests'] += 1
+    if stats['requests'] % PUBLISH_EVERY == 1:
+        publish()
+
+
+def connect_signals():
+    connection_created.connect(_on_connection_created, dispatch_uid='booklog-db-connects')
+    request_started.connect(_on_request_started, dispatch_uid='booklog-db-requests')
+
+
+def pool_stats(alias=DEFAULT_DB_ALIAS):
+    """
+    Статистика psycopg_pool этого процесса или None, если пул выключен.
+    """
+    pool = connections[alias].pool
+    return pool.get_stats() if pool is not None else None
+
+
+def worker_stats():
+    stats = _local()
+    settings_dict = connections[DEFAULT_DB_ALIAS].settings_dict
+    requests, connects = stats['requests'], stats['connects']
+    return {
+        'pid': stats['pid'],
+        'uptime_s': round(time.time() - stats['started_at']),
+        'requests': requests,
+        'connects': connects,
+        # доля запросов, обслуженных без открытия соединения
+        'reuse': round(1 - connects / requests, 3) if requests else None,
+        'conn_max_age': settings_dict['CONN_MAX_AGE'],
+        'health_checks': settings_dict['CONN_HEALTH_CHECKS'],
+        'pool': pool_stats(),
+    }
+
+
+def publish():
+    stats = worker_stats()
+    cache.set(WORKER_KEY.format(pid=stats['pid']), stats, STATS_TIMEOUT)
+    pids = cache.get(WORKERS_KEY, [])
+    if stats['pid'] not in pids:
+        cache.set(WORKERS_KEY, pids + [stats['pid']], None)
+
+
+def worker_reports():
+    """
+    Последние опубликованные цифры всех живых воркеров (по pid).
+    """
+    pids = cache.get(WORKERS_KEY, [])
+    found = cache.get_many([WORKER_KEY.format(pid=pid) for pid in pids])
+    alive = list(found.values())
+    if len(alive) < len(pids):
+        cache.set(WORKERS_KEY, [stats['pid'] for stats in alive], None)
+    return sorted(alive, key=lambda stats: stats['pid'])
+
+
+def measure_connect(repeat=5, alias=DEFAULT_DB_ALIAS):
+    """
+    Среднее время (мс) открытия нового соединения и SELECT 1 по уже открытому —
+    столько экономит каждый запрос, обслуженный без нового соединения.
+    """
+    connection = connections[alias]
+    connect, query = [], []
+    for _ in range(repeat):
+        connection.close()
+        started = time.perf_counter()
+        connection.ensure_connection()
+        connect.append((time.perf_counter() - started) * 1000)
+        with connection.cursor() as cursor:
+            started = time.perf_counter()
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+            query.append((time.perf_counter() - started) * 1000)
+    return {
+        'connect_ms': round(sum(connect) / repeat, 2),
+        'query_ms': round(sum(query) / repeat, 3),
+    }
@@ -1,47 +1,313 @@
 # permissions.py
+"""
+Права доступа API.
 
+permission_map вьюсета ({'action': PermClass | checker | [..., ...]}, см.
+ActionBasedPermissionsMixin) компилируется один раз при объявлении класса:
+несколько ролевых классов (IsJournalist, IsStaff, ...) схлопываются в одну
+проверку «роль входит в множество», остальное оборачивается в объекты
+пермишнов заранее — на запросе только вызываются готовые экземпляры.
+Роль пользователя вычисляется один раз на запрос (request_role).
+
+Чекеры владения (is_self) умеют превращаться в условие на queryset: для
+list-действий ActionBasedPermissionsMixin.filter_queryset добавляет его в
+WHERE, и чужие строки отсекает БД, а не проверки по каждому объекту.
+Владелец ищется в полях OWNER_FIELDS модели; если своего поля нет (цитата
+принадлежит владельцу записи журнала), вьюсет задаёт путь: owner_lookup.
+"""
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
 from rest_framework import permissions
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.permissions import AllowAny, BasePermission
 from users.models import UserTypes
 from .roles import ROLES
 
 
+# поля, в которых модели хранят владельца: каталог — created_by,
+# BookLog — owner, Like/Share — user; остальное — через view.owner_lookup
+OWNER_FIELDS = ('created_by', 'owner', 'user')
+
+ANON = 'ANON'
+
+# условие, которому не удовлетворяет ни одна строка (Django не пойдёт с ним в БД)
+NOTHING = Q(pk__in=[])
+
+
+def request_role(request):
+    """
+    Роль пользователя запроса — имя из UserTypes ('READER', 'STAFF', ...) или 'ANON'.
+    Вычисляется один раз и запоминается на объекте запроса.
+    """
+    user = request.user
+    cached = getattr(request, '_role_cache', None)
+    if cached is not None and cached[0] is user:
+        return cached[1]
+    if user is None or not user.is_authenticated:
+        role = ANON
+    else:
+        role = UserTypes(int(user.user_type)).name
+    request._role_cache = (user, role)
+    return role
+
+
+def owner_field(model):
+    names = {field.name for field in model._meta.concrete_fields}
+    return next((field for field in OWNER_FIELDS if field in names), None)
+
+
+def owner_lookup(view, model):
+    """
+    Путь к владельцу в стиле ORM: view.owner_lookup ('book_log__owner')
+    или поле модели из OWNER_FIELDS. None — владельца у модели нет.
+    """
+    return getattr(view, 'owner_lookup', None) or owner_field(model)
+
+
+def owner_id(obj, lookup):
+    *path, field = lookup.split('__')
+    for name in path:
+        obj = getattr(obj, name, None)
+        if obj is None:
+            return None
+    return getattr(obj, f'{field}_id', None)
+
+
+def filters_queryset(queryset_filter):
+    """
+    Декоратор чекера: queryset_filter(request, view, queryset) -> Q — то же
+    правило в виде условия на строки (для list, где объектов не проверяют).
+    """
+    def decorate(checker):
+        checker.queryset_filter = queryset_filter
+        return checker
+    return decorate
+
+
+def owned_by_user(request, view, queryset):
+    lookup = owner_lookup(view, queryset.model)
+    if lookup is None or request_role(request) == ANON:
+        return NOTHING
+    return Q(**{f'{lookup}_id': request.user.pk})
+
+
+@filters_queryset(owned_by_user)
 def is_self(request, view, obj=None):
     """
-    Проверяет, что created_by_id у объекта совпадает с request.user.id.
-    Для object-level пермишнов.
+    Проверяет, что владелец объекта (см. owner_lookup) совпадает с request.user.id.
+    Без объекта (проверка на уровне view) пропускает залогиненных: сам объект
+    проверит has_object_permission, а список ограничит owned_by_user.
     """
     if obj is None:
-        obj = view.get_object()
-    return getattr(obj, 'created_by_id', None) == request.user.id
+        return request_role(request) != ANON
+    lookup = owner_lookup(view, type(obj))
+    if lookup is None:
+        return False
+    found = owner_id(obj, lookup)
+    return found is not None and found == request.user.id
+
+
+def queryset_filter(permission, request, view, queryset):
+    """
+    Условие на строки, которое даёт permission: None — без ограничений.
+    """
+    rule = getattr(permission, 'queryset_filter', None)
+    if rule is not None:
+        return rule(request, view, queryset)
+    return None if permission.has_permission(request, view) else NOTHING
+
+
+# 1) Роли
+class RolePermission(BasePermission):
+    """
+    Пропускает пользователей, чья роль (request_role) входит в roles.
+    """
+    roles = frozenset()
+
+    def __init__(self, roles=None):
+        if roles is not None:
+            self.roles = frozenset(roles)
+
+    def has_permission(self, request, view):
+        return request_role(request) in self.roles
+
+
+class IsJournalist(RolePermission):
+    roles = frozenset({UserTypes.JOURNALIST.name})
+
+
+class IsReader(RolePermission):
+    roles = frozenset({UserTypes.READER.name})
+
+
+class IsStaff(RolePermission):
+    roles = frozenset({UserTypes.STAFF.name})
+
+
+class IsAdmin(RolePermission):
+    roles = frozenset({UserTypes.ADMIN.name})
+
+
+# 2) Запретить только анонимов (возвращает 403, а не 401)
+class DenyAnonymous(BasePermission):
+    def has_permission(self, request, view):
+        return request_role(request) != ANON
+
+
+# 3) Обёртка для функций-чекеров вида is_self(request, view, obj=None)
+class CheckerPermission(BasePermission):
+    def __init__(self, checker):
+        self.checker = checker
+
+    def has_permission(self, request, view):
+        # сама проверка возможна только на уровне объекта
+        return request_role(request) != ANON
+
+    def has_object_permission(self, request, view, obj):
+        return bool(self.checker(request, view, obj=obj))
+
+    def queryset_filter(self, request, view, queryset):
+        if not self.has_permission(request, view):
+            return NOTHING
+        rule = getattr(self.checker, 'queryset_filter', None)
+        # чекер без правила для queryset проверяет только отдельные объекты
+        return rule(request, view, queryset) if rule is not None else None
+
+
+# 4) «ИЛИ»-permission: если любой из списка даёт True — разрешаем
+class OrPermission(BasePermission):
+    def __init__(self, perms):
+        self.perms = list(perms)
+
+    def has_permission(self, request, view):
+        return any(p.has_permission(request, view) for p in self.perms)
+
+    def has_object_permission(self, request, view, obj):
+        # объект доступен, если хотя бы один пермишн пропускает и на уровне view, и на уровне объекта
+        return any(
+            p.has_permission(request, view) and p.has_object_permission(request, view, obj)
+            for p in self.perms
+        )
+
+    def queryset_filter(self, request, view, queryset):
+        conditions = []
+        for perm in self.perms:
+            if not perm.has_permission(request, view):
+                continue
+            condition = queryset_filter(perm, request, view, queryset)
+            if condition is None:
+                return None
+            conditions.append(condition)
+        return reduce(or_, conditions) if conditions else NOTHING
+
+
+def make_permission(perm):
+    if isinstance(perm, BasePermission):
+        return perm
+    if isinstance(perm, type) and issubclass(perm, BasePermission):
+        return perm()
+    return CheckerPermission(perm)
+
+
+def compile_permission(perms):
+    """
+    Значение permission_map -> один готовый экземпляр пермишна.
+    Ролевые классы из списка объединяются в одну проверку по множеству ролей.
+    """
+    if not isinstance(perms, (list, tuple)):
+        perms = [perms]
+    roles = [perm for perm in perms if isinstance(perm, type) and issubclass(perm, RolePermission)]
+    compiled = [RolePermission(frozenset().union(*(perm.roles for perm in roles)))] if roles else []
+    compiled += [make_permission(perm) for perm in perms if perm not in roles]
+    if len(compiled) == 1:
+        return compiled[0]
+    return OrPermission(compiled)
+
+
+def compile_permission_map(permission_map):
+    return {action: compile_permission(perms) for action, perms in permission_map.items()}
+
+
+def has_queryset_rule(permission):
+    """
+    Есть ли в пермишне чекер с правилом для queryset (как у is_self).
+    """
+    if isinstance(permission, OrPermission):
+        return any(has_queryset_rule(perm) for perm in permission.perms)
+    if isinstance(permission, CheckerPermission):
+        return getattr(permission.checker, 'queryset_filter', None) is not None
+    return False
+
+
+# 5) Mixin для per‐action permissions
+class ActionBasedPermissionsMixin:
+    """
+    Определяем в подклассах словарь:
+        permission_map = {
+          'action_name': [PermClass1, PermClass2, …],
+          …
+        }
+    Если для action даётся несколько классов — они объединяются через OR (OrPermission).
+    Если action нет в map — берётся [AllowAny] (то есть метод публичный).
+    Словарь компилируется при объявлении класса (compiled_permissions).
+    Для list-действий с чекером владения (is_self) строки фильтруются в SQL
+    (filtered_actions); остальные действия filter_queryset не трогает.
+    """
+    permission_map = {}
+    default_permission = AllowAny()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.compiled_permissions = compile_permission_map(cls.permission_map)
+        cls.filtered_actions = frozenset(
+            action for action, permission in cls.compiled_permissions.items() if has_queryset_rule(permission)
+        )
+
+    def get_permissions(self):
+        return [self.compiled_permissions.get(self.action, self.default_permission)]
+
+    def filter_queryset(self, queryset):
+        """
+        Для списков правила владения (is_self) становятся условием в SQL.
+        Отдельные объекты по-прежнему проверяет has_object_permission.
+        """
+        queryset = super().filter_queryset(queryset)
+        if getattr(self, 'detail', False) or self.action not in self.filtered_actions:
+            return queryset
+        condition = queryset_filter(self.get_permissions()[0], self.request, self, queryset)
+        return queryset if condition is None else queryset.filter(condition)
 
 
 class RolesPermission(permissions.BasePermission):
     """
     Доступ по роли из UserTypes + кастомные чекеры из ROLES.
     """
+    # (класс view, action) -> {РОЛЬ: чекер}: view_permissions не меняются после объявления класса
+    _normalized = {}
 
     def has_permission(self, request, view):
-        perms_map = view.get_view_permissions().get(view.action, {})
-        return self._check_role(request, view, perms_map, None)
+        return self._check_role(request, view, self._perms_map(view), None)
 
     def has_object_permission(self, request, view, obj):
-        perms_map = view.get_view_permissions().get(view.action, {})
-        return self._check_role(request, view, perms_map, obj)
+        return self._check_role(request, view, self._perms_map(view), obj)
+
+    def _perms_map(self, view):
+        key = (type(view), view.action)
+        normalized = self._normalized.get(key)
+        if normalized is None:
+            # нормализуем ключи из view_permissions
+            normalized = self._normalized[key] = {
+                raw_role.upper(): checker
+                for raw_role, checker in view.get_view_permissions().get(view.action, {}).items()
+            }
+        return normalized
 
     def _check_role(self, request, view, perms_map, obj):
         # если неавторизованный — сводим всё к одной роли 'ANON'
-        if request.user.is_anonymous:
-            user_role = 'ANON'
-        else:
-            user_role = UserTypes(request.user.user_type).name.upper()
-
-        # нормализуем ключи из view_permissions
-        normalized = {
-            raw_role.upper(): checker
-            for raw_role, checker in perms_map.items()
-        }
-        checker = normalized.get(user_role)
+        user_role = request_role(request)
+
+        checker = perms_map.get(user_role)
         if not checker:
             return False
 
@@ -19,6 +19,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     # Сторонние
     'corsheaders',
@@ -38,6 +39,7 @@ INSTALLED_APPS = [
     "users.apps.UsersConfig",
     'authentication',
     'journal',
+    'jobs',
 ]
 
 MIDDLEWARE = [
@@ -81,9 +83,46 @@ DATABASES = {
         'PASSWORD': config('POSTGRES_PASSWORD'),
         'HOST':     config('DB_HOST', default='db'),
         'PORT':     config('DB_PORT', default=5432, cast=int),
+        # соединение живёт между запросами воркера DB_CONN_MAX_AGE секунд (0 — своё на каждый запрос);
+        # перед повторным использованием Django проверяет, что оно не оборвалось
+        'CONN_MAX_AGE':       config('DB_CONN_MAX_AGE', default=60, cast=int),
+        'CONN_HEALTH_CHECKS': config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
     }
 }
 
+# Пул соединений psycopg в каждом воркере (psycopg_pool ставится с psycopg[pool] из requirements.txt).
+# С пулом CONN_MAX_AGE должен быть 0: соединение возвращается в пул в конце запроса,
+# живые соединения проверяет сам пул
+DB_POOL = config('DB_POOL', default=False, cast=bool)
+if DB_POOL:
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+            'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+            'timeout':  config('DB_POOL_TIMEOUT', default=10, cast=int),
+        },
+    }
+
+# Кэш: по умолчанию локальная память процесса, в проде — Redis (REDIS_URL)
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND':  'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND':  'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'booklog',
+        }
+    }
+CATALOGUE_CACHE_ALIAS = 'default'
+CATALOGUE_CACHE_TIMEOUT = config('CATALOGUE_CACHE_TIMEOUT', default=300, cast=int)
+
 # Авто-поля, локализация, время
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 LANGUAGE_CODE = 'ru'
@@ -95,11 +134,17 @@ STATIC_URL = 'static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# загрузки хранятся по хэшу содержимого, одинаковые файлы — один раз (journal/storage.py)
+STORAGES = {
+    'default': {'BACKEND': 'journal.storage.ContentAddressedStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
 
 # REST framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'dj_rest_auth.jwt_auth.JWTCookieAuthentication',
+        # JWTCookieAuthentication + кэш проверенных токенов (authentication/token_cache.py)
+        'authentication.jwt.CachedJWTCookieAuthentication',
     ),
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.MultiPartParser',
@@ -113,6 +158,11 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Пагинация списков journal (keyset/cursor, см. journal/api/pagination.py)
+JOURNAL_PAGE_SIZE = config('JOURNAL_PAGE_SIZE', default=50, cast=int)
+JOURNAL_MAX_PAGE_SIZE = config('JOURNAL_MAX_PAGE_SIZE', default=500, cast=int)
+JOURNAL_PAGINATION_REQUIRED = config('JOURNAL_PAGINATION_REQUIRED', default=False, cast=bool)
+
 # JWT
 # dj-rest-auth
 REST_AUTH = {
@@ -124,7 +174,10 @@ REST_AUTH = {
     'REGISTER_SERIALIZER': 'users.api.serializers.CustomRegisterSerializer',
 }
 SIMPLE_JWT = {
-    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=1),
+    # проверка токена дешёвая (кэш), а выход отзывает и access-токены (по BlacklistedToken
+    # в БД — во всех воркерах, не позже AUTH_TOKEN_CACHE_TTL) — минутный срок жизни
+    # только заставлял SPA обновлять токен каждую минуту
+    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=config('JWT_ACCESS_TOKEN_MINUTES', default=15, cast=int)),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=30),
     #'ROTATE_REFRESH_TOKENS': True,
     #'BLACKLIST_AFTER_ROTATION': True,
@@ -133,6 +186,9 @@ SIMPLE_JWT = {
     'USER_ID_FIELD': 'id',
     'USER_ID_CLAIM': 'user_id',
 }
+# сколько секунд и сколько токенов помнит каждый процесс (0 — не кэшировать)
+AUTH_TOKEN_CACHE_TTL = config('AUTH_TOKEN_CACHE_TTL', default=60, cast=int)
+AUTH_TOKEN_CACHE_SIZE = config('AUTH_TOKEN_CACHE_SIZE', default=10000, cast=int)
 
 # Пользователь
 AUTH_USER_MODEL = 'users.User'
@@ -154,6 +210,18 @@ ACCOUNT_EMAIL_CONFIRMATION_AUTHENTICATED_REDIRECT_URL = config('FRONTEND_URL')
 PASSWORD_RESET_CONFIRM_REDIRECT_BASE_URL = f"{config('FRONTEND_URL')}/password-reset/confirm"
 ACCOUNT_EMAIL_CONFIRMATION_HMAC = False
 
+# Почта уходит через очередь фоновых задач (jobs/mail.py): EMAIL_BACKEND кладёт
+# письмо в БД, воркер `manage.py run_jobs` отправляет его через EMAIL_DELIVERY_BACKEND
+EMAIL_BACKEND = 'jobs.mail.QueuedEmailBackend'
+EMAIL_DELIVERY_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+
+# Очередь фоновых задач (jobs/queue.py)
+JOBS_MAX_ATTEMPTS = config('JOBS_MAX_ATTEMPTS', default=5, cast=int)
+JOBS_RETRY_BASE_SECONDS = config('JOBS_RETRY_BASE_SECONDS', default=30, cast=int)
+JOBS_RETRY_MAX_SECONDS = config('JOBS_RETRY_MAX_SECONDS', default=3600, cast=int)
+JOBS_LEASE_SECONDS = config('JOBS_LEASE_SECONDS', default=300, cast=int)
+JOBS_KEEP_DONE_DAYS = config('JOBS_KEEP_DONE_DAYS', default=7, cast=int)
+
 # Логирование, токены удаления профиля и роли
 PROFILE_DELETION_TOKEN_EXPIRY = 24 * 3600
 REST_FRAMEWORK_ROLES = {
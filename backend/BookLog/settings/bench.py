@@ -0,0 +1,14 @@
+from decouple import config
+
+from .dev import *
+
+# Одноразовая БД для бенчмарков (benchmarks/, manage.py seed_benchmark / run_benchmark):
+#   DJANGO_SETTINGS_MODULE=BookLog.settings.bench python manage.py migrate
+DATABASES['default']['NAME'] = config('BENCH_POSTGRES_DB', default='booklog_bench')
+BENCHMARK_DATABASE = True
+
+# с DEBUG=True Django копит все SQL-запросы в памяти — это исказило бы замер памяти
+DEBUG = False
+
+# запросы идут через тестовый клиент
+ALLOWED_HOSTS += ['testserver']
@@ -11,10 +11,13 @@ INSTALLED_APPS += [
     'django_extensions',
     'pytest_django',
     'rest_framework.authtoken',
+    'benchmarks',
 ]
 
-# Консольный e-mail
+# Консольный e-mail: сразу, без очереди (воркер в dev обычно не запущен);
+# чтобы проверить очередь — EMAIL_BACKEND = 'jobs.mail.QueuedEmailBackend' и run_jobs
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+EMAIL_DELIVERY_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
 # Дополнительные настройки CORS
 CORS_ALLOW_ALL_ORIGINS = True
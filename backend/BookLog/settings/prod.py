@@ -10,8 +10,9 @@ for app in ('django_extensions', 'pytest_django', 'rest_framework.authtoken'):
     if app in INSTALLED_APPS:
         INSTALLED_APPS.remove(app)
 
-# SMTP для реальной отправки почты
-EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.smtp.EmailBackend')
+# SMTP для реальной отправки почты — её выполняет воркер очереди (run_jobs),
+# запросы только ставят письма в очередь (EMAIL_BACKEND из base)
+EMAIL_DELIVERY_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.smtp.EmailBackend')
 EMAIL_HOST          = config('EMAIL_HOST')
 EMAIL_PORT          = config('EMAIL_PORT', cast=int)
 EMAIL_HOST_USER     = config('EMAIL_HOST_USER')
@@ -2,7 +2,10 @@
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
+
+from journal.storage import BLOB_PREFIX
+from journal.views import serve_blob
 
 urlpatterns = [
     path('api/auth/', include('authentication.urls')),
@@ -16,11 +19,14 @@ urlpatterns = [
           namespace='journal'            # <- чтобы reverse('journal:…') работал 100%
         )
 ),
-
 ]
 
-# В режиме DEBUG раздаём медиа-файлы
+# В режиме DEBUG раздаём медиа-файлы (в проде — nginx, см. nginx/booklog.conf)
 if settings.DEBUG:
+    # медиа по содержимому — с вечным кэшем (journal/storage.py)
+    urlpatterns.append(
+        re_path(rf'^{settings.MEDIA_URL.lstrip("/")}{BLOB_PREFIX}/(?P<path>.+)$', serve_blob),
+    )
     urlpatterns += static(
         settings.MEDIA_URL,
         document_root=settings.MEDIA_ROOT
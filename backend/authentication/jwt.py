@@ -0,0 +1,38 @@
+# authentication/jwt.py
+from django.utils.translation import gettext_lazy as _
+from dj_rest_auth.jwt_auth import JWTCookieAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+
+from authentication.token_cache import count, is_revoked, verified_tokens
+
+
+class CachedJWTCookieAuthentication(JWTCookieAuthentication):
+    """
+    JWTCookieAuthentication, которая помнит уже проверенные токены
+    (authentication/token_cache.py): повторный запрос с тем же токеном
+    не проверяет подпись и не читает User из БД.
+
+    Экземпляр создаётся на каждый запрос, поэтому найденного в кэше
+    пользователя можно передать из get_validated_token в get_user через self.
+    """
+
+    def get_validated_token(self, raw_token):
+        cached = verified_tokens.get(raw_token)
+        if cached is not None:
+            token, self.cached_user = cached
+            return token
+        self.cached_user = None
+        self.raw_token = raw_token
+        return super().get_validated_token(raw_token)
+
+    def get_user(self, validated_token):
+        if self.cached_user is not None:
+            return self.cached_user
+
+        user = super().get_user(validated_token)
+        count('token_cache_misses')
+        # после выхода пользователя токены, выданные раньше, не принимаем
+        if is_revoked(user.pk, validated_token):
+            raise AuthenticationFailed(_('Token has been revoked'), code='token_revoked')
+        verified_tokens.put(self.raw_token, validated_token, user)
+        return user
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from authentication.token_cache import auth_stats, reset_auth_stats, stats_are_shared
+
+
+class Command(BaseCommand):
+    help = "Обновления JWT (token/refresh/) и попадания кэша проверенных токенов по всем воркерам"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help="Обнулить счётчики")
+
+    def handle(self, *args, **options):
+        if not stats_are_shared():
+            self.stderr.write(self.style.WARNING(
+                "Кэш Django локальный для процесса (не задан REDIS_URL): счётчики воркеров сюда не попадают"
+            ))
+        stats = auth_stats()
+        if options['reset']:
+            reset_auth_stats()
+
+        checks = stats['token_cache_hits'] + stats['token_cache_misses']
+        ratio = stats['token_cache_hits'] / checks * 100 if checks else 0
+        self.stdout.write(f"обновлений токена: {stats['refreshes']}, отказов: {stats['refresh_failures']}")
+        self.stdout.write(
+            f"кэш токенов — попаданий: {stats['token_cache_hits']}, промахов (запрос в БД): "
+            f"{stats['token_cache_misses']}, hit ratio: {ratio:.1f}%"
+        )
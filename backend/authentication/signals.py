@@ -0,0 +1,23 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from authentication.token_cache import verified_tokens
+
+
+# пользователь в кэше проверенных токенов (authentication/token_cache.py) должен быть актуальным
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def forget_cached_user(sender, instance, **kwargs):
+    verified_tokens.invalidate_user(instance.pk)
+
+
+# выход (dj-rest-auth кладёт refresh-токен в blacklist) отзывает и access-токены:
+# сам отзыв читается из BlacklistedToken (token_cache.is_revoked), здесь только
+# забываем уже проверенные токены этого процесса
+@receiver(post_save, sender=BlacklistedToken)
+def revoke_on_logout(sender, instance, created, **kwargs):
+    user_id = instance.token.user_id
+    if created and user_id is not None:
+        verified_tokens.invalidate_user(user_id)
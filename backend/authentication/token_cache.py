@@ -0,0 +1,151 @@
+# authentication/token_cache.py
+"""
+Кэш проверенных access-токенов в памяти процесса.
+
+Без него каждый запрос с JWT декодирует токен, проверяет подпись и читает
+строку User из БД. CachedJWTCookieAuthentication (authentication/jwt.py)
+кладёт сюда пару (токен, пользователь) на AUTH_TOKEN_CACHE_TTL секунд
+(и не дольше срока жизни самого токена), и следующий запрос с тем же токеном
+обходится поиском в словаре.
+
+Запись пользователя сбрасывается при сохранении/удалении User и при выходе
+(blacklist refresh-токена) — см. authentication/signals.py. Кэш у каждого
+процесса свой: другие воркеры увидят изменения не позже чем через TTL.
+Отзыв токенов при выходе хранится в БД (revoked_since), поэтому действует
+во всех воркерах независимо от бэкенда кэша Django.
+
+Счётчики (обновления токенов, попадания/промахи кэша) лежат в общем кэше
+Django, чтобы их можно было сложить по всем воркерам: manage.py auth_stats.
+С локальным кэшем (без REDIS_URL) у каждого процесса счётчики свои.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+STATS_KEYS = {
+    'refreshes': 'auth:stats:refreshes',
+    'refresh_failures': 'auth:stats:refresh_failures',
+    'token_cache_hits': 'auth:stats:token_cache_hits',
+    'token_cache_misses': 'auth:stats:token_cache_misses',
+}
+
+# попадания случаются на каждом запросе — в общий кэш отправляем пачками
+HITS_FLUSH_EVERY = 100
+
+
+def count(name, amount=1):
+    key = STATS_KEYS[name]
+    try:
+        cache.incr(key, amount)
+    except ValueError:
+        if not cache.add(key, amount, None):
+            cache.incr(key, amount)
+
+
+def auth_stats():
+    values = cache.get_many(STATS_KEYS.values())
+    return {name: values.get(key, 0) for name, key in STATS_KEYS.items()}
+
+
+def reset_auth_stats():
+    cache.delete_many(STATS_KEYS.values())
+
+
+def stats_are_shared():
+    # locmem у каждого процесса свой — manage.py auth_stats увидит только себя
+    return not isinstance(caches['default'], LocMemCache)
+
+
+def is_revoked(user_id, validated_token):
+    """
+    Выход пользователя (blacklist его refresh-токена) отзывает access-токены,
+    выданные раньше секунды выхода (iat в токене — целые секунды).
+    Проверяется при промахе кэша — одним запросом по индексу outstanding.user_id.
+    (С BLACKLIST_AFTER_ROTATION так же отзывалось бы каждое обновление токена.)
+    """
+    issued_at = validated_token.get('iat', 0)
+    return BlacklistedToken.objects.filter(
+        token__user_id=user_id,
+        blacklisted_at__gte=datetime.fromtimestamp(issued_at + 1, tz=timezone.utc),
+    ).exists()
+
+
+class VerifiedTokenCache:
+    """
+    LRU: сырой токен -> (проверенный токен, пользователь, до какого времени верить).
+    """
+
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.by_user = {}
+        self.lock = threading.Lock()
+        self.pending_hits = 0
+
+    @staticmethod
+    def key(raw_token):
+        return raw_token if isinstance(raw_token, bytes) else raw_token.encode()
+
+    def get(self, raw_token):
+        key = self.key(raw_token)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            token, user, expires_at = entry
+            if expires_at <= time.time():
+                self._remove(key)
+                return None
+            self.entries.move_to_end(key)
+            self.pending_hits += 1
+            flush = 0
+            if self.pending_hits >= HITS_FLUSH_EVERY:
+                flush, self.pending_hits = self.pending_hits, 0
+        if flush:
+            count('token_cache_hits', flush)
+        # копия: запрос может менять request.user, не трогая общий объект
+        return token, copy.copy(user)
+
+    def put(self, raw_token, token, user):
+        ttl = getattr(settings, 'AUTH_TOKEN_CACHE_TTL', 60)
+        max_size = getattr(settings, 'AUTH_TOKEN_CACHE_SIZE', 10000)
+        if ttl <= 0 or max_size <= 0:
+            return
+        expires_at = min(time.time() + ttl, token['exp'])
+        key = self.key(raw_token)
+        with self.lock:
+            self._remove(key)
+            self.entries[key] = (token, copy.copy(user), expires_at)
+            self.by_user.setdefault(user.pk, set()).add(key)
+            while len(self.entries) > max_size:
+                self._remove(next(iter(self.entries)))
+
+    def invalidate_user(self, user_id):
+        with self.lock:
+            for key in self.by_user.pop(user_id, set()):
+                self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.by_user.clear()
+            self.pending_hits = 0
+
+    def _remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self.by_user.get(entry[1].pk)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.by_user[entry[1].pk]
+
+
+verified_tokens = VerifiedTokenCache()
@@ -8,11 +8,8 @@ from dj_rest_auth.views import (
     PasswordResetView,
 )
 
-from rest_framework_simplejwt.views import (
-    TokenObtainPairView,
-    TokenRefreshView,
-)
-from authentication.views import password_reset_confirm_redirect, page_confirm_email
+from rest_framework_simplejwt.views import TokenObtainPairView
+from authentication.views import CountingTokenRefreshView, password_reset_confirm_redirect, page_confirm_email
 from dj_rest_auth.registration.views import RegisterView
 from dj_rest_auth.views import LoginView, LogoutView
 from django.urls import include, path
@@ -36,5 +33,5 @@ urlpatterns = [
     path("password/reset/confirm/", PasswordResetConfirmView.as_view(), name="password_reset_confirm"),
 
     path('token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
-    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('token/refresh/', CountingTokenRefreshView.as_view(), name='token_refresh'),
 ]
\ No newline at end of file
@@ -7,6 +7,9 @@ from rest_framework.decorators import api_view, authentication_classes, permissi
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.views import TokenRefreshView
+
+from authentication.token_cache import count
 
 
 def email_confirm_redirect(request, key):
@@ -35,3 +38,12 @@ def page_confirm_email(request, key):
         f"{settings.FRONTEND_URL}/page-confirm-email/{key}/"
     )
 
+
+class CountingTokenRefreshView(TokenRefreshView):
+    """
+    TokenRefreshView со счётчиком обновлений и отказов (manage.py auth_stats).
+    """
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        count('refreshes' if response.status_code == status.HTTP_200_OK else 'refresh_failures')
+        return super().finalize_response(request, response, *args, **kwargs)
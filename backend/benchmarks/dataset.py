@@ -0,0 +1,187 @@
+# benchmarks/dataset.py
+"""
+Синтетические данные «боевого» объёма для бенчмарков (manage.py seed_benchmark).
+
+Значения полей берутся из фабрик tests/factories.py, но Faker вызывается только
+для небольшого набора шаблонов (TEMPLATES на модель): строки собираются из
+шаблонов и случайных внешних ключей и пишутся bulk_create пачками, без save()
+и сигналов. Поэтому миллионы строк создаются за минуты, а денормализованные
+данные (счётчики цитат, оценки книг, статистика чтения, search_vector)
+после вставки пересчитываются штатными командами — см. rebuild_derived().
+
+Размер задаётся числом записей журнала, остальные таблицы — пропорционально
+(RATIOS), отдельные можно переопределить.
+"""
+import random
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.db import connection
+
+from journal.models import ApprovalStatus, Author, Book, BookLog, Genre, Like, Quote, Share
+from tests.factories import (
+    AuthorFactory, BookFactory, BookLogFactory, GenreFactory, QuoteFactory, ShareFactory, UserFactory,
+)
+from users.models import User
+
+# строк на одну запись журнала
+RATIOS = {
+    'users': 0.02,
+    'genres': 0.0005,
+    'authors': 0.005,
+    'books': 0.05,
+    'logs': 1,
+    'quotes': 2,
+    'likes': 5,
+    'shares': 0.5,
+}
+MINIMUM = {'users': 10, 'genres': 5, 'authors': 10, 'books': 20}
+
+# сколько разных наборов значений генерировать через Faker
+TEMPLATES = 200
+
+# доля публичных записей журнала и скрытых цитат
+PUBLIC_LOGS = 0.2
+PRIVATE_QUOTES = 0.1
+# доля авторов и книг в очереди модерации
+PENDING_CATALOGUE = 0.02
+
+BENCH_PASSWORD = 'bench1234'
+
+
+def plan(size, **overrides):
+    """
+    {таблица: число строк} для size записей журнала.
+    """
+    counts = {
+        name: max(MINIMUM.get(name, 0), int(size * ratio))
+        for name, ratio in RATIOS.items()
+    }
+    counts.update({name: value for name, value in overrides.items() if value is not None})
+    return counts
+
+
+def templates(factory, **kwargs):
+    """
+    Значения обычных (не ключевых) полей TEMPLATES объектов, построенных фабрикой.
+    """
+    model = factory._meta.model
+    fields = [
+        field.attname for field in model._meta.concrete_fields
+        if not field.primary_key and not field.is_relation
+    ]
+    return [
+        {name: getattr(obj, name) for name in fields}
+        for obj in factory.build_batch(TEMPLATES, **kwargs)
+    ]
+
+
+class Generator:
+
+    def __init__(self, seed=0, batch_size=5000, stdout=None):
+        self.random = random.Random(seed)
+        self.batch_size = batch_size
+        self.stdout = stdout
+        self.ids = {}
+
+    def log(self, message):
+        if self.stdout is not None:
+            self.stdout.write(message)
+
+    def insert(self, name, model, count, make_row):
+        """
+        count строк model пачками по batch_size; id созданных строк — в self.ids[name].
+        """
+        started = time.monotonic()
+        ids = self.ids.setdefault(name, [])
+        for start in range(0, count, self.batch_size):
+            rows = [make_row(number) for number in range(start, min(start + self.batch_size, count))]
+            created = model.objects.bulk_create(rows, ignore_conflicts=model is Like)
+            # с ignore_conflicts PostgreSQL id не возвращает — на лайки никто и не ссылается
+            ids.extend(obj.pk for obj in created if obj.pk is not None)
+        self.log(f"{name}: {count} за {time.monotonic() - started:.1f} с")
+        return ids
+
+    def pick(self, name):
+        return self.random.choice(self.ids[name])
+
+    def popular(self, name):
+        """
+        Случайный id с перекосом к первым строкам: на первый 1% строк приходится
+        ~20% ссылок — у популярных книг и цитат записей в разы больше, чем у остальных.
+        """
+        ids = self.ids[name]
+        return ids[int(len(ids) * self.random.random() ** 3)]
+
+    def chance(self, probability):
+        return self.random.random() < probability
+
+    def status(self):
+        return ApprovalStatus.PENDING if self.chance(PENDING_CATALOGUE) else ApprovalStatus.APPROVED
+
+    def generate(self, counts):
+        rand = self.random
+        # хэш один на всех: make_password на миллион пользователей — часы
+        password = make_password(BENCH_PASSWORD)
+        prefix = f'bench{User.objects.count()}_'
+
+        user_values = templates(UserFactory, password=BENCH_PASSWORD)
+        self.insert('users', User, counts['users'], lambda n: User(**{
+            **rand.choice(user_values), 'username': f'{prefix}{n}', 'password': password,
+        }))
+
+        genre_values = templates(GenreFactory, created_by=None)
+        self.insert('genres', Genre, counts['genres'], lambda n: Genre(
+            **rand.choice(genre_values), created_by_id=self.pick('users'),
+        ))
+
+        author_values = templates(AuthorFactory, created_by=None)
+        self.insert('authors', Author, counts['authors'], lambda n: Author(
+            **{**rand.choice(author_values), 'status': self.status()}, created_by_id=self.pick('users'),
+        ))
+
+        book_values = templates(BookFactory, author=None, genre=None, created_by=None)
+        self.insert('books', Book, counts['books'], lambda n: Book(
+            **{**rand.choice(book_values), 'status': self.status()},
+            author_id=self.pick('authors'), genre_id=self.pick('genres'), created_by_id=self.pick('users'),
+        ))
+
+        log_values = templates(BookLogFactory, owner=None, book=None)
+        self.insert('logs', BookLog, counts['logs'], lambda n: BookLog(
+            **{**rand.choice(log_values), 'privat': not self.chance(PUBLIC_LOGS)},
+            owner_id=self.popular('users'), book_id=self.popular('books'),
+        ))
+
+        quote_values = templates(QuoteFactory, book=None, book_log=None)
+        self.insert('quotes', Quote, counts['quotes'], lambda n: Quote(
+            **{**rand.choice(quote_values), 'privat': self.chance(PRIVATE_QUOTES)},
+            book_id=self.popular('books'), book_log_id=self.pick('logs'),
+        ))
+
+        # (user, quote) уникальны: повторы отбрасывает ignore_conflicts
+        self.insert('likes', Like, counts['likes'], lambda n: Like(
+            user_id=self.pick('users'), quote_id=self.popular('quotes'),
+        ))
+
+        share_values = templates(ShareFactory, user=None, quote=None)
+        self.insert('shares', Share, counts['shares'], lambda n: Share(
+            **rand.choice(share_values), user_id=self.pick('users'), quote_id=self.popular('quotes'),
+        ))
+
+
+def rebuild_derived(stdout=None):
+    """
+    Денормализованные данные, которые при обычной записи обновляют сигналы.
+    """
+    for command in ('recount_quote_counters', 'recount_book_ratings', 'rebuild_reading_stats', 'rebuild_search_index'):
+        call_command(command, stdout=stdout)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def table_sizes():
+    return {
+        model._meta.label: model.objects.count()
+        for model in (User, Genre, Author, Book, BookLog, Quote, Like, Share)
+    }
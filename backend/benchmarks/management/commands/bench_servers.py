@@ -0,0 +1,49 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.runner import BenchmarkError
+from benchmarks.servers import CONNECTION_MODES, SERVERS, run
+
+
+class Command(BaseCommand):
+    help = "Сравнивает пропускную способность WSGI (gunicorn) и ASGI (uvicorn) при одинаковом числе воркеров"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--server', action='append', choices=SERVERS, help="Только эти серверы (можно повторять)",
+        )
+        parser.add_argument(
+            '--db-mode', action='append', choices=list(CONNECTION_MODES),
+            help="Прогнать каждый сервер в этих режимах соединений с БД (можно повторять)",
+        )
+        parser.add_argument('--workers', type=int, default=2)
+        parser.add_argument('--concurrency', type=int, default=32, help="Одновременных клиентов")
+        parser.add_argument('--requests', type=int, default=2000, help="Запросов на эндпоинт")
+        parser.add_argument('--warmup', type=int, default=100)
+        parser.add_argument('--output', help="Файл результата (по умолчанию servers-<коммит>.json)")
+
+    def handle(self, *args, **options):
+        if min(options['workers'], options['concurrency'], options['requests']) < 1:
+            raise CommandError("--workers, --concurrency и --requests должны быть больше нуля")
+
+        self.stdout.write(f"{'сервер':<18} {'эндпоинт':<20} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'ошибок':>7}")
+
+        def progress(server, name, result):
+            self.stdout.write(
+                f"{server:<18} {name:<20} {result['requests_per_s']:>8} {result.get('p50_ms', '-'):>8} "
+                f"{result.get('p95_ms', '-'):>8} {result.get('p99_ms', '-'):>8} {result['errors']:>7}"
+            )
+
+        try:
+            report = run(
+                options['server'] or SERVERS, options['workers'], options['concurrency'],
+                options['requests'], options['warmup'], options['db_mode'] or (), progress,
+            )
+        except BenchmarkError as error:
+            raise CommandError(str(error))
+
+        output = options['output'] or f"servers-{(report['meta']['commit'] or 'local')[:12]}.json"
+        with open(output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Результат: {output}"))
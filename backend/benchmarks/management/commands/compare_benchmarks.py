@@ -0,0 +1,40 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.runner import compare
+
+
+class Command(BaseCommand):
+    help = "Сравнивает два результата run_benchmark (например, до и после коммита)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('base', help="JSON базового прогона")
+        parser.add_argument('new', help="JSON нового прогона")
+        parser.add_argument(
+            '--threshold', type=float,
+            help="Завершиться с ошибкой, если p95 выросло больше чем на столько процентов или стало больше SQL",
+        )
+
+    def handle(self, *args, **options):
+        reports = []
+        for path in (options['base'], options['new']):
+            with open(path, encoding='utf-8') as file:
+                reports.append(json.load(file))
+        base, new = reports
+
+        self.stdout.write(f"{base['meta']['commit']} -> {new['meta']['commit']}")
+        regressions = []
+        for name, metric, old, current, change in compare(base, new):
+            line = f"{name:<22} {metric:<15} {old:>10} {current:>10} {change:>+8.1f}%"
+            threshold = options['threshold']
+            worse = threshold is not None and (
+                (metric == 'p95_ms' and change > threshold) or (metric == 'queries_max' and current > old)
+            )
+            if worse:
+                regressions.append(line)
+                line = self.style.ERROR(line)
+            self.stdout.write(line)
+
+        if regressions:
+            raise CommandError(f"Регрессий: {len(regressions)}")
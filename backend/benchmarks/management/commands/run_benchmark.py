@@ -0,0 +1,46 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.runner import SCENARIOS, BenchmarkError, run
+
+
+class Command(BaseCommand):
+    help = "Прогоняет сценарии бенчмарка API и сохраняет p50/p95/p99, число запросов и память в JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scenario', action='append', choices=[scenario.name for scenario in SCENARIOS],
+            help="Только эти сценарии (можно повторять)",
+        )
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument('--warmup', type=int, default=20)
+        parser.add_argument('--cold', action='store_true', help="Очищать кэш перед каждым запросом")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help="Файл результата (по умолчанию benchmark-<коммит>.json)")
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError("--iterations должно быть больше нуля")
+        names = options['scenario']
+        scenarios = [scenario for scenario in SCENARIOS if not names or scenario.name in names]
+
+        self.stdout.write(f"{'сценарий':<22} {'p50':>8} {'p95':>8} {'p99':>8} {'SQL':>5} {'память, КБ':>11}")
+
+        def progress(name, result):
+            self.stdout.write(
+                f"{name:<22} {result['p50_ms']:>8} {result['p95_ms']:>8} {result['p99_ms']:>8} "
+                f"{result['queries_max']:>5} {result['peak_memory_kb']:>11}"
+            )
+
+        try:
+            report = run(
+                scenarios, options['iterations'], options['warmup'], options['cold'], options['seed'], progress,
+            )
+        except BenchmarkError as error:
+            raise CommandError(str(error))
+
+        output = options['output'] or f"benchmark-{(report['meta']['commit'] or 'local')[:12]}.json"
+        with open(output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Результат: {output}"))
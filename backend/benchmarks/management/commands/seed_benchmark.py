@@ -0,0 +1,41 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.dataset import RATIOS, Generator, plan, rebuild_derived, table_sizes
+
+
+class Command(BaseCommand):
+    help = "Заполняет отдельную БД синтетическими данными для бенчмарков (см. benchmarks/dataset.py)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--size', type=int, default=100_000,
+            help="Сколько записей журнала создать; остальные таблицы — пропорционально",
+        )
+        for name in RATIOS:
+            parser.add_argument(f'--{name}', type=int, help=f"Переопределить число строк: {name}")
+        parser.add_argument('--seed', type=int, default=0, help="Зерно генератора случайных чисел")
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--skip-derived', action='store_true',
+            help="Не пересчитывать счётчики, оценки, статистику и поисковый индекс",
+        )
+
+    def handle(self, *args, **options):
+        if not getattr(settings, 'BENCHMARK_DATABASE', False):
+            raise CommandError(
+                "Только для одноразовой БД: запустите с DJANGO_SETTINGS_MODULE=BookLog.settings.bench"
+            )
+
+        counts = plan(options['size'], **{name: options[name] for name in RATIOS})
+        self.stdout.write("Создаём: " + ", ".join(f"{name} {count}" for name, count in counts.items()))
+
+        started = time.monotonic()
+        Generator(options['seed'], options['batch_size'], self.stdout).generate(counts)
+        if not options['skip_derived']:
+            rebuild_derived(self.stdout)
+
+        sizes = ", ".join(f"{label} {count}" for label, count in table_sizes().items())
+        self.stdout.write(self.style.SUCCESS(f"Готово за {time.monotonic() - started:.0f} с. В БД: {sizes}"))
@@ -0,0 +1,249 @@
+# benchmarks/runner.py
+"""
+Сценарии бенчмарка /api/journal/* и /api/users/* и их прогон (manage.py run_benchmark).
+
+Каждый сценарий — GET через тестовый клиент DRF, т.е. полный путь запроса
+(middleware, аутентификация, вьюсет, сериализатор, БД), но без HTTP-сервера.
+На каждую итерацию берутся случайные id из выборки существующих строк, так что
+запросы не упираются в одну и ту же горячую строку.
+
+На сценарий в отчёт попадают p50/p95/p99 времени ответа, число SQL-запросов
+и пиковая память Python (tracemalloc, отдельным запросом — под tracemalloc всё
+медленнее, в замер времени он не входит). Результат — JSON, два таких файла
+сравнивает compare() (manage.py compare_benchmarks).
+"""
+import math
+import platform
+import random
+import resource
+import subprocess
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable
+
+import django
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from benchmarks.dataset import table_sizes
+from journal.models import ApprovalStatus, Author, Book, BookLog, Quote
+from users.models import User
+
+# из скольких строк каждой таблицы выбирать случайные id
+SAMPLE_SIZE = 500
+PAGE = {'page_size': 50}
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+class Context:
+    """
+    Читатель, от имени которого идут запросы, и выборки id для detail-сценариев.
+    """
+
+    def __init__(self, seed=0):
+        self.random = random.Random(seed)
+        self.samples = {}
+        # самый активный читатель — худший случай для журнала и статистики
+        top = (
+            BookLog.objects.order_by().values('owner')
+            .annotate(logs=Count('id')).order_by('-logs').first()
+        )
+        if top is None:
+            raise BenchmarkError("Нет данных: сначала manage.py seed_benchmark")
+        self.reader = User.objects.get(pk=top['owner'])
+
+    def sample(self, model, **filters):
+        key = (model, tuple(sorted(filters.items())))
+        if key not in self.samples:
+            ids = list(model.objects.filter(**filters).order_by('?').values_list('pk', flat=True)[:SAMPLE_SIZE])
+            if not ids:
+                raise BenchmarkError(f"Нет строк {model._meta.label} для выборки")
+            self.samples[key] = ids
+        return self.samples[key]
+
+    def pick(self, model, **filters):
+        return self.random.choice(self.sample(model, **filters))
+
+    def prefix(self):
+        # начало фамилии случайного автора — как набирают в строке поиска
+        if 'prefixes' not in self.samples:
+            names = Author.objects.filter(status=ApprovalStatus.APPROVED).order_by('?').values_list('last_name', flat=True)
+            self.samples['prefixes'] = [name[:3] for name in names[:SAMPLE_SIZE]]
+        return self.random.choice(self.samples['prefixes'])
+
+
+def fixed(name):
+    return lambda context: reverse(name)
+
+
+def detail(name, model, **filters):
+    return lambda context: reverse(name, args=[context.pick(model, **filters)])
+
+
+def query(**params):
+    return lambda context: params
+
+
+@dataclass
+class Scenario:
+    name: str
+    url: Callable[[Context], str]
+    params: Callable[[Context], dict] = query()
+    authenticated: bool = False
+
+
+SCENARIOS = [
+    Scenario('authors-list', fixed('journal:authors-list'), query(**PAGE)),
+    Scenario('authors-detail', detail('journal:authors-detail', Author)),
+    Scenario('genres-list', fixed('journal:genres-list')),
+    Scenario('books-list', fixed('journal:books-list'), query(**PAGE)),
+    Scenario('books-top-rated', fixed('journal:books-list'), query(ordering='-avg_score', **PAGE)),
+    Scenario('books-moderation', fixed('journal:books-list'), query(status=ApprovalStatus.PENDING, **PAGE)),
+    Scenario('books-detail', detail('journal:books-detail', Book)),
+    Scenario('logs-list', fixed('journal:book_logs-list'), query(**PAGE), authenticated=True),
+    Scenario('logs-list-public', fixed('journal:book_logs-list'), query(include_public=1, **PAGE),
+             authenticated=True),
+    Scenario('logs-search', fixed('journal:book_logs-list'), query(q='people', include_public=1, **PAGE),
+             authenticated=True),
+    Scenario('logs-detail', detail('journal:book_logs-detail', BookLog, privat=False), authenticated=True),
+    Scenario('stats', fixed('journal:stats-list'), authenticated=True),
+    Scenario('quotes-list', fixed('journal:quotes-list'), query(**PAGE)),
+    Scenario('quotes-popular', fixed('journal:quotes-list'), query(ordering='-like_count', **PAGE)),
+    Scenario('quotes-recent-likers', fixed('journal:quotes-list'), query(recent_likers=5, **PAGE),
+             authenticated=True),
+    Scenario('quotes-search', fixed('journal:quotes-list'), query(q='people', **PAGE)),
+    Scenario('quotes-detail', detail('journal:quotes-detail', Quote)),
+    Scenario('quote-likes', detail('journal:quotes-likes', Quote, like_count__gt=0)),
+    Scenario('likes-list', fixed('journal:likes-list'), query(**PAGE)),
+    Scenario('shares-list', fixed('journal:shares-list'), query(**PAGE)),
+    Scenario('books-list-async', fixed('journal:async-books'), query(**PAGE)),
+    Scenario('quotes-list-async', fixed('journal:async-quotes'), query(**PAGE)),
+    Scenario('autocomplete', fixed('journal:autocomplete-list'), lambda context: {'q': context.prefix()}),
+    Scenario('user-current', fixed('users:user-current'), authenticated=True),
+]
+
+
+def percentile(values, percent):
+    """
+    Nearest-rank: значение, не превышенное percent% замеров.
+    """
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+def prepare(scenario, context):
+    # выбор id (и первые запросы за выборкой) — вне замера
+    return scenario.url(context), scenario.params(context)
+
+
+def get(client, scenario, url, params, cold=False):
+    if cold:
+        cache.clear()
+    response = client.get(url, params)
+    if response.status_code != 200:
+        raise BenchmarkError(f"{scenario.name}: GET {url} {params} -> {response.status_code}")
+    return response
+
+
+def peak_memory(client, scenario, context, cold=False):
+    url, params = prepare(scenario, context)
+    tracemalloc.start()
+    try:
+        get(client, scenario, url, params, cold)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_scenario(client, scenario, context, iterations=100, warmup=10, cold=False):
+    client.force_authenticate(user=context.reader if scenario.authenticated else None)
+    for _ in range(warmup):
+        get(client, scenario, *prepare(scenario, context), cold)
+
+    latencies, queries, sizes = [], [], []
+    for _ in range(iterations):
+        url, params = prepare(scenario, context)
+        if cold:
+            cache.clear()
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = get(client, scenario, url, params)
+            latencies.append((time.perf_counter() - started) * 1000)
+        queries.append(len(captured))
+        sizes.append(len(response.content))
+
+    return {
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+        'mean_ms': round(sum(latencies) / len(latencies), 2),
+        'max_ms': round(max(latencies), 2),
+        'queries_min': min(queries),
+        'queries_max': max(queries),
+        'response_bytes': round(sum(sizes) / len(sizes)),
+        'peak_memory_kb': round(peak_memory(client, scenario, context, cold) / 1024),
+    }
+
+
+def git_commit():
+    try:
+        result = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def run(scenarios=SCENARIOS, iterations=100, warmup=10, cold=False, seed=0, progress=None):
+    context = Context(seed)
+    client = APIClient()
+    results = {}
+    for scenario in scenarios:
+        results[scenario.name] = run_scenario(client, scenario, context, iterations, warmup, cold)
+        if progress is not None:
+            progress(scenario.name, results[scenario.name])
+
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'created_at': timezone.now().isoformat(),
+            'database': f'{connection.vendor} {connection.pg_version}',
+            'tables': table_sizes(),
+            'iterations': iterations,
+            'warmup': warmup,
+            'cold_cache': cold,
+            'seed': seed,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            # ru_maxrss в Linux — в килобайтах
+            'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        },
+        'scenarios': results,
+    }
+
+
+COMPARED = ('p50_ms', 'p95_ms', 'p99_ms', 'queries_max', 'peak_memory_kb')
+
+
+def compare(base, new):
+    """
+    [(сценарий, метрика, было, стало, изменение в %), ...] по сценариям из обоих прогонов.
+    """
+    rows = []
+    for name, before in base['scenarios'].items():
+        after = new['scenarios'].get(name)
+        if after is None:
+            continue
+        for metric in COMPARED:
+            old, current = before[metric], after[metric]
+            change = (current - old) / old * 100 if old else (0.0 if current == old else math.inf)
+            rows.append((name, metric, old, current, change))
+    return rows
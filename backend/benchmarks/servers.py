@@ -0,0 +1,236 @@
+# benchmarks/servers.py
+"""
+Пропускная способность под конкурентной нагрузкой: WSGI (gunicorn) против
+ASGI (uvicorn) с одинаковым числом воркеров (manage.py bench_servers).
+
+В отличие от runner.py здесь запросы идут по настоящему HTTP: сервер
+запускается отдельным процессом с теми же настройками (DJANGO_SETTINGS_MODULE),
+нагрузку дают concurrency потоков, у каждого своё keep-alive соединение.
+На каждом сервере прогоняются обе версии списков — синхронные вьюсеты
+и async-view из journal/api/async_views.py, — так что видно отдельно вклад
+сервера и вклад асинхронного пути.
+
+На пару (сервер, эндпоинт) в отчёт попадают запросы в секунду, p50/p95/p99
+и число ошибок (ответ не 200 или обрыв соединения).
+
+--db-mode запускает каждый сервер ещё и в нескольких режимах соединений с БД
+(CONNECTION_MODES, переменные окружения из settings/base.py): разница
+per-request и persistent/pool на лёгком запросе (quotes-first) — это цена
+открытия соединения в задержке запроса.
+"""
+import http.client
+import os
+import platform
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+import django
+from django.conf import settings
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+
+from benchmarks.dataset import table_sizes
+from benchmarks.runner import PAGE, BenchmarkError, git_commit, percentile
+
+HOST = '127.0.0.1'
+STARTUP_TIMEOUT = 30
+
+SERVERS = ('wsgi', 'asgi')
+
+# имя -> (синхронный список, асинхронный список, параметры)
+ENDPOINTS = {
+    'books-list': ('journal:books-list', 'journal:async-books', PAGE),
+    'quotes-list': ('journal:quotes-list', 'journal:async-quotes', PAGE),
+    # один короткий SQL-запрос: время ответа почти целиком — накладные расходы
+    'quotes-first': ('journal:quotes-list', 'journal:async-quotes', {'page_size': 1}),
+}
+
+# режим соединений с БД -> окружение сервера
+CONNECTION_MODES = {
+    'per-request': {'DB_CONN_MAX_AGE': '0', 'DB_POOL': 'False'},
+    'persistent': {'DB_CONN_MAX_AGE': '600', 'DB_POOL': 'False'},
+    'pool': {'DB_POOL': 'True'},
+}
+
+
+def server_command(server, port, workers):
+    if server == 'wsgi':
+        return [
+            sys.executable, '-m', 'gunicorn', 'BookLog.wsgi:application',
+            '--bind', f'{HOST}:{port}', '--workers', str(workers), '--log-level', 'warning',
+        ]
+    if server == 'asgi':
+        return [
+            sys.executable, '-m', 'uvicorn', 'BookLog.asgi:application',
+            '--host', HOST, '--port', str(port), '--workers', str(workers), '--log-level', 'warning',
+        ]
+    raise BenchmarkError(f"Неизвестный сервер: {server}")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def wait_ready(port, process, path, timeout=STARTUP_TIMEOUT):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise BenchmarkError(f"Сервер завершился при старте (код {process.returncode})")
+        try:
+            connection = http.client.HTTPConnection(HOST, port, timeout=5)
+            connection.request('GET', path)
+            connection.getresponse().read()
+            connection.close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise BenchmarkError(f"Сервер не ответил за {timeout} с")
+
+
+class Server:
+    """
+    Контекстный менеджер: запущенный gunicorn/uvicorn на свободном порту.
+    """
+
+    def __init__(self, server, workers, ready_path, env=None):
+        self.server = server
+        self.workers = workers
+        self.ready_path = ready_path
+        self.env = env or {}
+        self.port = free_port()
+        self.process = None
+
+    def __enter__(self):
+        # окружение (и DJANGO_SETTINGS_MODULE) наследуется от manage.py;
+        # BASE_DIR — пакет BookLog, сервер запускаем из каталога backend/
+        self.process = subprocess.Popen(
+            server_command(self.server, self.port, self.workers),
+            cwd=settings.BASE_DIR.parent, env={**os.environ, **self.env},
+        )
+        try:
+            wait_ready(self.port, self.process, self.ready_path)
+        except BenchmarkError:
+            self.__exit__()
+            raise
+        return self
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=STARTUP_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+
+def load(port, path, concurrency, requests):
+    """
+    requests GET-запросов к path из concurrency потоков.
+    Возвращает (задержки в мс, число ошибок, общее время в секундах).
+    """
+    latencies, errors = [], []
+    lock = threading.Lock()
+    remaining = iter(range(requests))
+
+    def worker():
+        connection = http.client.HTTPConnection(HOST, port, timeout=30)
+        mine, failed = [], 0
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    break
+            started = time.perf_counter()
+            try:
+                connection.request('GET', path)
+                response = connection.getresponse()
+                response.read()
+                ok = response.status == 200
+            except (OSError, http.client.HTTPException):
+                ok = False
+                connection.close()
+                connection = http.client.HTTPConnection(HOST, port, timeout=30)
+            if ok:
+                mine.append((time.perf_counter() - started) * 1000)
+            else:
+                failed += 1
+        connection.close()
+        with lock:
+            latencies.extend(mine)
+            errors.append(failed)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        for future in [pool.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    return latencies, sum(errors), time.perf_counter() - started
+
+
+def summarize(latencies, errors, elapsed):
+    if not latencies:
+        return {'requests_per_s': 0, 'errors': errors}
+    return {
+        'requests_per_s': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+        'max_ms': round(max(latencies), 2),
+        'errors': errors,
+    }
+
+
+def paths():
+    """
+    {'books-list': путь, 'books-list-async': путь, ...}
+    """
+    result = {}
+    for name, (sync_name, async_name, params) in ENDPOINTS.items():
+        query = urlencode(params)
+        result[name] = f'{reverse(sync_name)}?{query}'
+        result[f'{name}-async'] = f'{reverse(async_name)}?{query}'
+    return result
+
+
+def run(servers=SERVERS, workers=2, concurrency=32, requests=2000, warmup=100, modes=(), progress=None):
+    """
+    Без modes сервер наследует настройки соединений manage.py,
+    с modes — отчёт по каждой паре '<сервер>:<режим>'.
+    """
+    targets = paths()
+    runs = [(f'{server}:{mode}' if mode else server, server, CONNECTION_MODES.get(mode))
+            for server in servers for mode in (modes or [None])]
+    results = {}
+    for label, server, env in runs:
+        results[label] = {}
+        with Server(server, workers, next(iter(targets.values())), env) as running:
+            for name, path in targets.items():
+                load(running.port, path, min(concurrency, warmup) or 1, warmup)
+                results[label][name] = summarize(*load(running.port, path, concurrency, requests))
+                if progress is not None:
+                    progress(label, name, results[label][name])
+
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'created_at': timezone.now().isoformat(),
+            'database': f'{connection.vendor} {connection.pg_version}',
+            'tables': table_sizes(),
+            'settings': os.environ['DJANGO_SETTINGS_MODULE'],
+            'cache': settings.CACHES['default']['BACKEND'],
+            'db_modes': list(modes),
+            'workers': workers,
+            'concurrency': concurrency,
+            'requests': requests,
+            'warmup': warmup,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+        },
+        'servers': results,
+    }
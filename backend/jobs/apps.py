@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class JobsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'jobs'
+
+    def ready(self):
+        # регистрируем задачи (см. jobs/queue.py: @task)
+        import jobs.mail
+        from jobs.images import connect_signals
+        connect_signals()
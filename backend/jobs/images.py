@@ -0,0 +1,173 @@
+# jobs/images.py
+"""
+Уменьшенные копии загруженных картинок (обложки книг, фото авторов, аватары).
+
+При сохранении объекта с новым файлом в IMAGE_FIELDS ставится задача
+'image_variants'; воркер очереди режет картинку до VARIANT_SIZES px по большей
+стороне в WebP и JPEG и кладёт рядом с оригиналом, в подкаталог variants/
+(имя оригинала целиком — копии разных файлов не пересекаются):
+
+  book_logos/cover.png -> book_logos/variants/cover.png.64.webp, book_logos/variants/cover.png.64.jpg, ...
+
+(хранилище по содержимому, journal/storage.py, само кладёт их под хэшем в cas/).
+
+Пути записываются в <поле>_variants ({'64': {'webp': ..., 'jpg': ...}, ...});
+пока задача не выполнена, там пусто и клиенты берут оригинал.
+Для уже загруженных файлов — manage.py build_image_variants.
+Запись копий идёт через update() мимо post_save, поэтому save_variants шлёт
+variants_saved — по нему journal сбрасывает кэш каталога (и ETag).
+Поле для API — journal/api/fields.py: ImageVariantsField.
+"""
+import posixpath
+from io import BytesIO
+
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import Signal
+from PIL import Image, ImageOps
+
+from jobs.queue import enqueue, enqueue_many, task
+
+IMAGE_VARIANTS = 'image_variants'
+
+# копии записаны в <поле>_variants: sender — модель, pk, field
+variants_saved = Signal()
+
+# (модель, поле с картинкой); пути копий — в поле <поле>_variants
+IMAGE_FIELDS = [
+    ('journal.Book', 'logo'),
+    ('journal.Author', 'photo'),
+    ('users.User', 'logo'),
+]
+
+VARIANT_SIZES = (64, 256, 768)
+# расширение -> (формат Pillow, параметры сохранения)
+VARIANT_FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpg': ('JPEG', {'quality': 85, 'optimize': True, 'progressive': True}),
+}
+
+
+def variants_field(field):
+    return f'{field}_variants'
+
+
+def variant_name(name, size, ext):
+    directory, filename = posixpath.split(name)
+    return posixpath.join(directory, 'variants', f'{filename}.{size}.{ext}')
+
+
+def _encode(image, size, image_format, options):
+    copy = image.copy()
+    # по большей стороне, без увеличения маленьких картинок
+    copy.thumbnail((size, size), Image.Resampling.LANCZOS)
+    if image_format == 'JPEG' and copy.mode != 'RGB':
+        # у JPEG нет прозрачности — кладём на белый фон
+        background = Image.new('RGB', copy.size, 'white')
+        rgba = copy.convert('RGBA')
+        background.paste(rgba, mask=rgba.getchannel('A'))
+        copy = background
+    buffer = BytesIO()
+    copy.save(buffer, image_format, **options)
+    return buffer.getvalue()
+
+
+def build_variants(file):
+    """
+    Режет файл поля (FieldFile) и сохраняет копии в то же хранилище.
+    Возвращает {'<размер>': {'<расширение>': путь}}.
+    """
+    with file.open('rb'):
+        image = ImageOps.exif_transpose(Image.open(file))
+        image.load()
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info or image.mode in ('LA', 'PA') else 'RGB')
+
+    storage = file.storage
+    variants = {}
+    for size in VARIANT_SIZES:
+        for ext, (image_format, options) in VARIANT_FORMATS.items():
+            name = variant_name(file.name, size, ext)
+            # storage.save() не перезаписывает, а придумывает новое имя
+            if storage.exists(name):
+                storage.delete(name)
+            variants.setdefault(str(size), {})[ext] = storage.save(
+                name, ContentFile(_encode(image, size, image_format, options)),
+            )
+    return variants
+
+
+@task(IMAGE_VARIANTS)
+def image_variants(payload):
+    model = apps.get_model(payload['model'])
+    field = payload['field']
+    instance = model.objects.filter(pk=payload['pk']).only(field).first()
+    file = getattr(instance, field, None)
+    # объект удалён или картинку уже заменили (для новой поставлена своя задача)
+    if not file or file.name != payload['name']:
+        return
+    save_variants(model, payload['pk'], field, build_variants(file), **{field: payload['name']})
+
+
+def save_variants(model, pk, field, variants, **filters):
+    updated = model.objects.filter(pk=pk, **filters).update(**{variants_field(field): variants})
+    if updated:
+        variants_saved.send(sender=model, pk=pk, field=field)
+    return updated
+
+
+def _payload(instance, field):
+    return {
+        'model': instance._meta.label_lower,
+        'pk': instance.pk,
+        'field': field,
+        'name': getattr(instance, field).name,
+    }
+
+
+def enqueue_variants(queryset, field, batch_size=500):
+    """
+    Задачи для всех объектов queryset с картинкой в field (для backfill).
+    """
+    queryset = queryset.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True}).only('pk', field)
+    payloads, count = [], 0
+    for instance in queryset.iterator(chunk_size=batch_size):
+        payloads.append(_payload(instance, field))
+        if len(payloads) == batch_size:
+            count += len(enqueue_many(IMAGE_VARIANTS, payloads))
+            payloads = []
+    if payloads:
+        count += len(enqueue_many(IMAGE_VARIANTS, payloads))
+    return count
+
+
+def _remember_new_images(fields):
+    def receiver(sender, instance, raw=False, **kwargs):
+        instance._new_images = []
+        if raw:
+            return
+        for field in fields:
+            file = getattr(instance, field)
+            # ещё не записанный в хранилище файл — новая загрузка; старые копии уже не про неё
+            if file and not file._committed:
+                instance._new_images.append(field)
+                setattr(instance, variants_field(field), {})
+            elif not file:
+                setattr(instance, variants_field(field), {})
+    return receiver
+
+
+def _enqueue_new_images(sender, instance, raw=False, **kwargs):
+    for field in getattr(instance, '_new_images', []):
+        enqueue(IMAGE_VARIANTS, _payload(instance, field))
+
+
+def connect_signals():
+    by_model = {}
+    for label, field in IMAGE_FIELDS:
+        by_model.setdefault(apps.get_model(label), []).append(field)
+    for model, fields in by_model.items():
+        pre_save.connect(_remember_new_images(fields), sender=model, weak=False, dispatch_uid=f'image_variants_pre_{model._meta.label_lower}')
+        post_save.connect(_enqueue_new_images, sender=model, dispatch_uid=f'image_variants_post_{model._meta.label_lower}')
+
@@ -0,0 +1,104 @@
+# jobs/mail.py
+"""
+Почта через очередь задач. QueuedEmailBackend (EMAIL_BACKEND) не ходит в SMTP,
+а кладёт каждое письмо задачей 'send_email'; воркер отправляет его через
+EMAIL_DELIVERY_BACKEND. Так send_mail(), письма allauth и dj-rest-auth
+(подтверждение почты, сброс пароля) не держат воркер gunicorn на время ответа SMTP.
+"""
+import base64
+from email.mime.base import MIMEBase
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.utils.module_loading import import_string
+
+from jobs.queue import enqueue_many, task
+
+SEND_EMAIL = 'send_email'
+
+
+def _attachment(attachment):
+    if isinstance(attachment, MIMEBase):
+        filename, content, mimetype = (
+            attachment.get_filename(), attachment.get_payload(decode=True), attachment.get_content_type(),
+        )
+    else:
+        filename, content, mimetype = attachment
+    if isinstance(content, bytes):
+        return {'filename': filename, 'content': base64.b64encode(content).decode(), 'mimetype': mimetype, 'base64': True}
+    return {'filename': filename, 'content': content, 'mimetype': mimetype, 'base64': False}
+
+
+def serialize_message(message):
+    """
+    EmailMessage -> JSON для Job.payload.
+    """
+    return {
+        'subject': message.subject,
+        'body': message.body,
+        'from_email': message.from_email,
+        'to': list(message.to),
+        'cc': list(message.cc),
+        'bcc': list(message.bcc),
+        'reply_to': list(message.reply_to),
+        'headers': dict(message.extra_headers),
+        'content_subtype': message.content_subtype,
+        'alternatives': [[content, mimetype] for content, mimetype in getattr(message, 'alternatives', [])],
+        'attachments': [_attachment(attachment) for attachment in message.attachments],
+    }
+
+
+def deserialize_message(payload):
+    message = EmailMultiAlternatives(
+        subject=payload['subject'],
+        body=payload['body'],
+        from_email=payload['from_email'],
+        to=payload['to'],
+        cc=payload['cc'],
+        bcc=payload['bcc'],
+        reply_to=payload['reply_to'],
+        headers=payload['headers'],
+    )
+    message.content_subtype = payload['content_subtype']
+    for content, mimetype in payload['alternatives']:
+        message.attach_alternative(content, mimetype)
+    for attachment in payload['attachments']:
+        content = attachment['content']
+        if attachment['base64']:
+            content = base64.b64decode(content)
+        message.attach(attachment['filename'], content, attachment['mimetype'])
+    return message
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """
+    Ставит письма в очередь одним INSERT; «отправлено» = поставлено в очередь.
+    """
+
+    def send_messages(self, email_messages):
+        payloads = [serialize_message(message) for message in email_messages if message.recipients()]
+        if not payloads:
+            return 0
+        try:
+            enqueue_many(SEND_EMAIL, payloads)
+        except Exception:
+            if not self.fail_silently:
+                raise
+            return 0
+        return len(payloads)
+
+
+def delivery_connection():
+    backend = getattr(settings, 'EMAIL_DELIVERY_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
+    if issubclass(import_string(backend), QueuedEmailBackend):
+        raise ImproperlyConfigured('EMAIL_DELIVERY_BACKEND не может быть очередью — письма зациклятся')
+    return get_connection(backend, fail_silently=False)
+
+
+@task(SEND_EMAIL)
+def send_email(payload):
+    message = deserialize_message(payload)
+    message.connection = delivery_connection()
+    message.send()
@@ -0,0 +1,42 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from jobs.images import IMAGE_FIELDS, build_variants, enqueue_variants, save_variants, variants_field
+
+
+class Command(BaseCommand):
+    help = "Уменьшенные копии для уже загруженных картинок (обложки, фото авторов, аватары)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help="Пересоздать и там, где копии уже есть")
+        parser.add_argument(
+            '--sync', action='store_true',
+            help="Резать картинки прямо здесь, а не ставить задачи воркеру",
+        )
+
+    def handle(self, *args, **options):
+        for label, field in IMAGE_FIELDS:
+            model = apps.get_model(label)
+            queryset = model.objects.all()
+            if not options['all']:
+                queryset = queryset.filter(**{variants_field(field): {}})
+
+            if options['sync']:
+                count = self.build(queryset, field)
+                self.stdout.write(f"{label}.{field}: обработано {count}")
+            else:
+                count = enqueue_variants(queryset, field)
+                self.stdout.write(f"{label}.{field}: поставлено задач {count}")
+
+    def build(self, queryset, field):
+        count = 0
+        queryset = queryset.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True}).only('pk', field)
+        for instance in queryset.iterator(chunk_size=200):
+            try:
+                variants = build_variants(getattr(instance, field))
+            except (OSError, ValueError) as error:
+                self.stderr.write(f"{instance._meta.label} #{instance.pk}: {error}")
+                continue
+            save_variants(type(instance), instance.pk, field, variants)
+            count += 1
+        return count
@@ -0,0 +1,25 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from jobs.queue import queue_stats
+
+
+class Command(BaseCommand):
+    help = "Глубина очереди фоновых задач и задержки выполнения"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--minutes', type=int, default=60, help="За какой период считать выполненные задачи")
+
+    def handle(self, *args, **options):
+        stats = queue_stats(timedelta(minutes=options['minutes']))
+        self.stdout.write(
+            f"в очереди: {stats['pending']} (готовы к запуску: {stats['due']}), "
+            f"выполняются: {stats['running']}, "
+            f"старейшая готовая ждёт: {stats['oldest_due_age'] or 0} с"
+        )
+        self.stdout.write(
+            f"за {options['minutes']} мин — выполнено: {stats['done']}, с ошибкой: {stats['failed']}, "
+            f"ожидание: среднее {stats['wait_avg'] or 0} с, макс {stats['wait_max'] or 0} с, "
+            f"от постановки до отправки: {stats['total_avg'] or 0} с"
+        )
@@ -0,0 +1,46 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.queue import purge_finished, run_pending
+
+# как часто воркер чистит старые выполненные задачи
+PURGE_INTERVAL = 3600
+
+
+class Command(BaseCommand):
+    help = "Воркер очереди фоновых задач (jobs): выполняет задачи, пока не остановят"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10, help="Сколько задач забирать за раз")
+        parser.add_argument('--sleep', type=float, default=1.0, help="Пауза (сек), когда очередь пуста")
+        parser.add_argument('--once', action='store_true', help="Выполнить всё готовое и выйти")
+
+    def handle(self, *args, **options):
+        self.stopping = False
+        # SIGTERM (docker stop) — доделать текущую пачку и выйти
+        previous = signal.signal(signal.SIGTERM, self.stop)
+
+        processed = 0
+        purged_at = 0
+        try:
+            while not self.stopping:
+                if time.monotonic() - purged_at > PURGE_INTERVAL:
+                    purge_finished()
+                    purged_at = time.monotonic()
+                count = run_pending(options['batch_size'])
+                processed += count
+                if count:
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            signal.signal(signal.SIGTERM, previous)
+        self.stdout.write(f"Обработано задач: {processed}")
+
+    def stop(self, signum, frame):
+        self.stopping = True
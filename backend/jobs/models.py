@@ -0,0 +1,42 @@
+from django.db import models
+from django.utils import timezone
+
+
+class JobStatus(models.IntegerChoices):
+  PENDING = 0, 'В очереди'
+  RUNNING = 1, 'Выполняется'
+  DONE = 2, 'Выполнена'
+  FAILED = 3, 'Ошибка'
+
+
+class Job(models.Model):
+  """
+  Фоновая задача (jobs/queue.py): имя зарегистрированной функции и её аргументы.
+  Выполняет воркер `manage.py run_jobs`.
+  """
+  name = models.CharField(max_length=100, verbose_name="Задача")
+  payload = models.JSONField(default=dict, verbose_name="Аргументы")
+  status = models.IntegerField(choices=JobStatus.choices, default=JobStatus.PENDING, verbose_name="Статус")
+  attempts = models.PositiveSmallIntegerField(default=0, verbose_name="Попыток")
+  max_attempts = models.PositiveSmallIntegerField(default=5, verbose_name="Максимум попыток")
+  # не раньше — для отложенных задач и повторов с задержкой
+  run_at = models.DateTimeField(default=timezone.now, verbose_name="Выполнить после")
+  # воркер «арендует» задачу до этого момента; если он упал, задачу подхватит другой
+  locked_until = models.DateTimeField(null=True, blank=True, verbose_name="Занята до")
+  created_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата создания")
+  started_at = models.DateTimeField(null=True, blank=True, verbose_name="Начало последней попытки")
+  finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Дата завершения")
+  last_error = models.TextField(blank=True, verbose_name="Последняя ошибка")
+
+  def __str__(self):
+    return f'{self.name} #{self.pk} ({self.get_status_display()})'
+
+  class Meta:
+    indexes = [
+      # выборка воркера: только незавершённые задачи, по времени запуска
+      models.Index(
+        fields=['run_at', 'id'], name='job_runnable_idx',
+        condition=models.Q(status__in=[JobStatus.PENDING, JobStatus.RUNNING]),
+      ),
+      models.Index(fields=['status', 'finished_at'], name='job_status_finished_idx'),
+    ]
@@ -0,0 +1,176 @@
+# jobs/queue.py
+"""
+Очередь фоновых задач в PostgreSQL — без отдельного брокера.
+
+  @task('send_email')           — регистрирует функцию f(payload)
+  enqueue('send_email', {...})  — кладёт задачу в таблицу Job (в той же транзакции, что и запрос)
+  run_pending()                 — выполняет пачку готовых задач (воркер: manage.py run_jobs)
+
+Воркеры забирают задачи через SELECT ... FOR UPDATE SKIP LOCKED и «арендуют» их
+на JOBS_LEASE_SECONDS: несколько воркеров не берут одну задачу, а задача упавшего
+воркера вернётся в работу, когда аренда истечёт. После ошибки задача повторяется
+через JOBS_RETRY_BASE_SECONDS * 2^(попытка - 1) (не больше JOBS_RETRY_MAX_SECONDS),
+после max_attempts попыток остаётся в статусе FAILED.
+"""
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, Count, F, Max, Min, Q
+from django.utils import timezone
+
+from jobs.models import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+# имя задачи -> функция(payload)
+TASKS = {}
+
+
+def task(name):
+    def register(func):
+        TASKS[name] = func
+        return func
+    return register
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def enqueue(name, payload=None, run_at=None, max_attempts=None):
+    return enqueue_many(name, [payload or {}], run_at=run_at, max_attempts=max_attempts)[0]
+
+
+def enqueue_many(name, payloads, run_at=None, max_attempts=None):
+    """
+    Одна задача name на каждый payload — одним INSERT.
+    """
+    if name not in TASKS:
+        raise LookupError(f'Неизвестная задача: {name}')
+    run_at = run_at or timezone.now()
+    max_attempts = max_attempts or _setting('JOBS_MAX_ATTEMPTS', 5)
+    return Job.objects.bulk_create([
+        Job(name=name, payload=payload, run_at=run_at, max_attempts=max_attempts)
+        for payload in payloads
+    ])
+
+
+def retry_delay(attempts):
+    base = _setting('JOBS_RETRY_BASE_SECONDS', 30)
+    cap = _setting('JOBS_RETRY_MAX_SECONDS', 3600)
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), cap))
+
+
+def runnable(now):
+    # ждущие своего времени и брошенные воркерами (аренда истекла)
+    return Q(status=JobStatus.PENDING, run_at__lte=now) | Q(status=JobStatus.RUNNING, locked_until__lt=now)
+
+
+def claim(batch_size=10):
+    """
+    Забирает до batch_size готовых задач и помечает их RUNNING с арендой.
+    """
+    now = timezone.now()
+    lease = now + timedelta(seconds=_setting('JOBS_LEASE_SECONDS', 300))
+    with transaction.atomic():
+        jobs = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(runnable(now))
+            .order_by('run_at', 'id')[:batch_size]
+        )
+        if not jobs:
+            return []
+        Job.objects.filter(pk__in=[job.pk for job in jobs]).update(
+            status=JobStatus.RUNNING, attempts=F('attempts') + 1, started_at=now, locked_until=lease,
+        )
+    for job in jobs:
+        job.status, job.attempts, job.started_at, job.locked_until = JobStatus.RUNNING, job.attempts + 1, now, lease
+    return jobs
+
+
+def execute(job):
+    """
+    Выполняет захваченную задачу и записывает результат. True — успех.
+    """
+    try:
+        if job.attempts > job.max_attempts:
+            # попытки кончились, а воркер так и не отчитался (упал во время выполнения)
+            raise RuntimeError('Аренда истекла на последней попытке')
+        func = TASKS.get(job.name)
+        if func is None:
+            raise LookupError(f'Неизвестная задача: {job.name}')
+        func(job.payload)
+    except Exception:
+        _failed(job, traceback.format_exc())
+        return False
+
+    Job.objects.filter(pk=job.pk).update(
+        status=JobStatus.DONE, finished_at=timezone.now(), locked_until=None, last_error='',
+    )
+    return True
+
+
+def _failed(job, error):
+    now = timezone.now()
+    if job.attempts >= job.max_attempts:
+        changes = {'status': JobStatus.FAILED, 'finished_at': now}
+        logger.error('Задача %s #%s не выполнена после %s попыток:\n%s', job.name, job.pk, job.attempts, error)
+    else:
+        changes = {'status': JobStatus.PENDING, 'run_at': now + retry_delay(job.attempts)}
+        logger.warning('Задача %s #%s, попытка %s: ошибка, повтор позже:\n%s', job.name, job.pk, job.attempts, error)
+    Job.objects.filter(pk=job.pk).update(locked_until=None, last_error=error, **changes)
+
+
+def run_pending(batch_size=10):
+    """
+    Одна пачка: захватить и выполнить. Возвращает число обработанных задач.
+    """
+    jobs = claim(batch_size)
+    for job in jobs:
+        execute(job)
+    return len(jobs)
+
+
+def purge_finished(older_than=None):
+    """
+    Удаляет выполненные задачи старше older_than (по умолчанию JOBS_KEEP_DONE_DAYS).
+    FAILED остаются для разбора.
+    """
+    older_than = older_than or timedelta(days=_setting('JOBS_KEEP_DONE_DAYS', 7))
+    deleted, _ = Job.objects.filter(status=JobStatus.DONE, finished_at__lt=timezone.now() - older_than).delete()
+    return deleted
+
+
+def _seconds(value):
+    return round(value.total_seconds(), 3) if value is not None else None
+
+
+def queue_stats(window=timedelta(hours=1)):
+    """
+    Глубина очереди и задержки: сейчас и по задачам, завершённым за window.
+      wait  — от момента, когда задача стала готова (run_at), до начала попытки
+      total — от постановки в очередь до успешного выполнения (включая повторы)
+    """
+    now = timezone.now()
+    finished = Q(finished_at__gte=now - window)
+    done = Q(status=JobStatus.DONE) & finished
+    due = Q(status=JobStatus.PENDING, run_at__lte=now)
+    stats = Job.objects.aggregate(
+        pending=Count('id', filter=Q(status=JobStatus.PENDING)),
+        due=Count('id', filter=due),
+        running=Count('id', filter=Q(status=JobStatus.RUNNING)),
+        done=Count('id', filter=done),
+        failed=Count('id', filter=Q(status=JobStatus.FAILED) & finished),
+        oldest_due=Min('run_at', filter=due),
+        wait_avg=Avg(F('started_at') - F('run_at'), filter=done),
+        wait_max=Max(F('started_at') - F('run_at'), filter=done),
+        total_avg=Avg(F('finished_at') - F('created_at'), filter=done),
+    )
+    oldest_due = stats.pop('oldest_due')
+    stats['oldest_due_age'] = _seconds(now - oldest_due) if oldest_due else None
+    for name in ('wait_avg', 'wait_max', 'total_avg'):
+        stats[name] = _seconds(stats[name])
+    return stats
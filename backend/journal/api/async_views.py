@@ -0,0 +1,127 @@
+# journal/api/async_views.py
+"""
+Асинхронное чтение каталога и публичных цитат:
+
+  GET /api/journal/async/authors/  /async/genres/  /async/books/  /async/quotes/
+      [?page_size=50][&before=<id>][&status=1]
+
+Под ASGI (uvicorn BookLog.asgi:application, см. README) такой запрос ждёт БД
+и кэш, не занимая воркер: пока один медленный список читается, тот же процесс
+обслуживает другие. Под WSGI эти view тоже работают, но синхронно.
+
+Строки читаются асинхронным ORM (async for), весь граф связей — одним запросом
+через select_related: сериализаторы те же, что у вьюсетов, и ленивое обращение
+к БД из них под ASGI упало бы с SynchronousOnlyOperation. Поэтому здесь только
+анонимное чтение: без аутентификации, liked_by_me всегда false.
+
+Страница — keyset по id (новые сначала): next содержит ?before=<последний id>.
+Ответы каталога кэшируются с теми же версиями, что у CatalogueCacheMixin,
+и сбрасываются той же invalidate_catalogue.
+"""
+from django.db.models import BooleanField, Value
+from django.http import JsonResponse
+from django.views import View
+from rest_framework.request import Request
+
+from journal.api.cache import acached_data
+from journal.api.pagination import KeysetPagination
+from journal.api.serializers import AuthorSerializer, BookSerializer, GenreSerializer, QuoteSerializer
+from journal.models import Author, Book, Genre, Quote
+
+BEFORE_PARAM = 'before'
+
+
+class BadRequest(Exception):
+    pass
+
+
+class AsyncListView(View):
+    queryset = None
+    serializer_class = None
+    # точные фильтры из query string (как filterset_fields у вьюсетов)
+    filter_fields = ()
+    # метка кэша каталога; None — ответы не кэшируются
+    cache_label = None
+
+    def get_queryset(self):
+        return self.queryset.all()
+
+    def page_params(self, request):
+        try:
+            before = request.query_params.get(BEFORE_PARAM)
+            before = int(before) if before is not None else None
+            filters = {
+                name: int(request.query_params[name])
+                for name in self.filter_fields if name in request.query_params
+            }
+        except ValueError:
+            raise BadRequest("Ожидается целое число.")
+        return KeysetPagination().get_page_size(request), before, filters
+
+    async def get(self, request, *args, **kwargs):
+        request = Request(request)
+        try:
+            page_size, before, filters = self.page_params(request)
+        except BadRequest as error:
+            return JsonResponse({'detail': str(error)}, status=400)
+
+        async def build():
+            return await self.page(request, page_size, before, filters)
+
+        if self.cache_label is None:
+            return JsonResponse(await build())
+        data, hit = await acached_data(request, self.cache_label, 'list', build)
+        return JsonResponse(data, headers={'X-Cache': 'HIT' if hit else 'MISS'})
+
+    async def page(self, request, page_size, before, filters):
+        queryset = self.get_queryset().filter(**filters).order_by('-id')
+        if before is not None:
+            queryset = queryset.filter(pk__lt=before)
+        rows = [obj async for obj in queryset[:page_size + 1]]
+
+        next_url = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            params = request.query_params.copy()
+            params[BEFORE_PARAM] = rows[-1].pk
+            next_url = request.build_absolute_uri(f'{request.path}?{params.urlencode()}')
+
+        results = self.serializer_class(rows, many=True, context={'request': request}).data
+        return {'next': next_url, 'results': results}
+
+
+class AsyncAuthorList(AsyncListView):
+    queryset = Author.objects.all()
+    serializer_class = AuthorSerializer
+    filter_fields = ('status',)
+    cache_label = 'author'
+
+
+class AsyncGenreList(AsyncListView):
+    queryset = Genre.objects.all()
+    serializer_class = GenreSerializer
+    filter_fields = ('status',)
+    cache_label = 'genre'
+
+
+class AsyncBookList(AsyncListView):
+    queryset = Book.objects.select_related('author', 'genre')
+    serializer_class = BookSerializer
+    filter_fields = ('status', 'author', 'genre')
+    cache_label = 'book'
+
+
+class AsyncQuoteList(AsyncListView):
+    """
+    Только публичные цитаты; запись журнала приватного дневника отдаётся как
+    null (VisibleBookLogSerializer — запрос здесь всегда анонимный).
+    """
+    queryset = Quote.objects.filter(privat=False).select_related(
+        'book', 'book__author', 'book__genre',
+        'book_log', 'book_log__book', 'book_log__book__author', 'book_log__book__genre',
+    )
+    serializer_class = QuoteSerializer
+    filter_fields = ('book',)
+
+    def get_queryset(self):
+        return super().get_queryset().annotate(liked_by_me=Value(False, output_field=BooleanField()))
@@ -0,0 +1,88 @@
+# journal/api/bulk.py
+from django.db import transaction
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.parsers import JSONParser
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.response import Response
+
+from journal.api.parsers import NDJSONParser
+from journal.signals import bulk_created
+
+
+class BulkCreateMixin:
+    """
+    POST /<resource>/bulk/ — импорт массива (JSON) или потока (NDJSON) объектов.
+
+    Каждый элемент валидируется обычным сериализатором ViewSet'а, связанные объекты
+    по PK загружаются заранее одним запросом на поле (context['prefetched']),
+    валидные строки пишутся bulk_create пачками по bulk_batch_size, каждая пачка
+    в своей транзакции (вместе с обработчиками сигнала bulk_created).
+    Ошибки возвращаются по индексам элементов.
+    """
+    bulk_batch_size = 1000
+    bulk_max_items = 10000
+
+    @action(detail=False, methods=['post'], url_path='bulk', parser_classes=[JSONParser, NDJSONParser])
+    def bulk(self, request):
+        items = request.data
+        if not isinstance(items, list):
+            return Response(
+                {'detail': 'Ожидается JSON-массив или NDJSON.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > self.bulk_max_items:
+            return Response(
+                {'detail': f'Не больше {self.bulk_max_items} элементов за запрос.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        serializer_class = self.get_serializer_class()
+        context = self.get_serializer_context()
+        context['prefetched'] = self.prefetch_bulk_relations(serializer_class(context=context), items)
+
+        model = self.get_queryset().model
+        extra = self.get_bulk_save_kwargs()
+        objects, errors = [], []
+        for index, item in enumerate(items):
+            serializer = serializer_class(data=item, context=context)
+            if serializer.is_valid():
+                objects.append(model(**serializer.validated_data, **extra))
+            else:
+                errors.append({'index': index, 'errors': serializer.errors})
+
+        for start in range(0, len(objects), self.bulk_batch_size):
+            with transaction.atomic():
+                self.perform_bulk_create(objects[start:start + self.bulk_batch_size])
+
+        return Response(
+            {'created': len(objects), 'ids': [obj.pk for obj in objects], 'errors': errors},
+            status=status.HTTP_201_CREATED if objects or not errors else status.HTTP_400_BAD_REQUEST,
+        )
+
+    def get_bulk_save_kwargs(self):
+        """
+        Поля, которые при обычном create проставляет perform_create (владелец и т.п.).
+        """
+        return {}
+
+    def perform_bulk_create(self, batch):
+        model = type(batch[0])
+        model.objects.bulk_create(batch)
+        bulk_created.send(sender=model, objs=batch)
+
+    def prefetch_bulk_relations(self, serializer, items):
+        """
+        {field_name: {pk: obj}} для всех записываемых PK-полей сериализатора.
+        """
+        prefetched = {}
+        for name, field in serializer.fields.items():
+            if field.read_only or not isinstance(field, PrimaryKeyRelatedField):
+                continue
+            ids = {
+                item[name] for item in items
+                if isinstance(item, dict) and isinstance(item.get(name), (int, str))
+            }
+            ids = {int(pk) for pk in ids if str(pk).isdigit()}
+            prefetched[name] = field.get_queryset().in_bulk(ids)
+        return prefetched
@@ -0,0 +1,220 @@
+# journal/api/cache.py
+"""
+Кэш ответов публичного каталога (Author / Genre / Book).
+
+Ключ ответа собирается из версий:
+  catalogue:<model>:all:v   — версия всей модели (сбрасывается при изменении зависимостей)
+  catalogue:<model>:list:v  — версия списков (любое изменение строки модели)
+  catalogue:<model>:<pk>:v  — версия конкретного объекта
+Инвалидация — это INCR нужной версии, старые ключи просто доживают TTL.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from rest_framework import status
+from rest_framework.response import Response
+
+# изменение ключевой модели сбрасывает весь кэш зависимых:
+# BookSerializer вкладывает Genre, а удаление автора/жанра каскадно удаляет книги
+DEPENDENTS = {
+    'author': ['book'],
+    'genre': ['book'],
+}
+
+STATS_KEYS = {
+    'hits': 'catalogue:stats:hits',
+    'misses': 'catalogue:stats:misses',
+}
+
+
+def get_cache():
+    return caches[getattr(settings, 'CATALOGUE_CACHE_ALIAS', 'default')]
+
+
+def is_shared():
+    """
+    locmem у каждого процесса свой: сброс после записи доходит только до
+    воркера, который её обработал, а manage.py catalogue_cache видит пустой кэш.
+    """
+    return not isinstance(get_cache(), LocMemCache)
+
+
+def object_scope(view, kwargs):
+    """
+    scope объекта из URL: pk строкой в том виде, в каком его получает
+    invalidate_catalogue ('007' -> '7'); None, если это не число.
+    """
+    try:
+        return str(int(kwargs[view.lookup_url_kwarg or view.lookup_field]))
+    except (TypeError, ValueError):
+        return None
+
+
+def _version_key(label, scope):
+    return f'catalogue:{label}:{scope}:v'
+
+
+def _versions(cache, keys):
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        # стартуем не с 0: если ключ версии вытеснен из кэша,
+        # старые ответы с маленькой версией не должны «воскреснуть»
+        for key in missing:
+            cache.add(key, time.time_ns(), None)
+        found.update(cache.get_many(missing))
+    return [found.get(key, 0) for key in keys]
+
+
+async def _aversions(cache, keys):
+    found = await cache.aget_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        for key in missing:
+            await cache.aadd(key, time.time_ns(), None)
+        found.update(await cache.aget_many(missing))
+    return [found.get(key, 0) for key in keys]
+
+
+def _bump(cache, key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), None)
+
+
+def _count(cache, name):
+    key = STATS_KEYS[name]
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+async def _acount(cache, name):
+    key = STATS_KEYS[name]
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        if not await cache.aadd(key, 1, None):
+            await cache.aincr(key)
+
+
+def cache_stats():
+    cache = get_cache()
+    values = cache.get_many(STATS_KEYS.values())
+    return {name: values.get(key, 0) for name, key in STATS_KEYS.items()}
+
+
+def reset_cache_stats():
+    get_cache().delete_many(STATS_KEYS.values())
+
+
+def catalogue_versions(label, scope):
+    """
+    Текущие версии (вся модель, scope) — scope это 'list' или pk объекта.
+    Меняются при любой записи, поэтому годятся и как валидатор для ETag.
+    """
+    return _versions(get_cache(), [
+        _version_key(label, 'all'),
+        _version_key(label, scope),
+    ])
+
+
+async def acatalogue_versions(label, scope):
+    """
+    catalogue_versions для асинхронных view (journal/api/async_views.py).
+    """
+    return await _aversions(get_cache(), [
+        _version_key(label, 'all'),
+        _version_key(label, scope),
+    ])
+
+
+def response_key(request, label, scope, versions):
+    raw = f'{request.get_host()}|{request.get_full_path()}'
+    digest = hashlib.md5(raw.encode()).hexdigest()
+    return f'catalogue:{label}:{scope}:' + ':'.join(map(str, versions)) + f':{digest}'
+
+
+async def acached_data(request, label, scope, build):
+    """
+    Асинхронный аналог CatalogueCacheMixin.cached_response для journal/api/async_views.py:
+    build() — корутина, собирающая данные ответа. Возвращает (данные, попадание в кэш).
+    """
+    cache = get_cache()
+    key = response_key(request, label, scope, await acatalogue_versions(label, scope))
+    data = await cache.aget(key)
+    if data is not None:
+        await _acount(cache, 'hits')
+        return data, True
+
+    await _acount(cache, 'misses')
+    data = await build()
+    await cache.aset(key, data, getattr(settings, 'CATALOGUE_CACHE_TIMEOUT', 300))
+    return data, False
+
+
+def invalidate_catalogue(label, pk=None):
+    """
+    Сбрасывает кэш после записи: списки модели, сам объект (если pk задан)
+    и целиком зависимые модели.
+    """
+    cache = get_cache()
+    _bump(cache, _version_key(label, 'list'))
+    if pk is not None:
+        _bump(cache, _version_key(label, pk))
+    for dependent in DEPENDENTS.get(label, []):
+        _bump(cache, _version_key(dependent, 'all'))
+
+
+def invalidate_all():
+    cache = get_cache()
+    for label in ('author', 'genre', 'book'):
+        _bump(cache, _version_key(label, 'all'))
+
+
+class CatalogueCacheMixin:
+    """
+    Кэширует сериализованные ответы list/retrieve.
+    Ответ каталога не зависит от пользователя, поэтому ключ — только
+    хост (ImageField отдаёт абсолютные URL) + путь с query-параметрами.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response('list', super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        scope = object_scope(self, kwargs)
+        if scope is None:
+            # не-числовой pk в кэш не кладём: объекта с таким pk всё равно нет
+            return super().retrieve(request, *args, **kwargs)
+        return self.cached_response(scope, super().retrieve, request, *args, **kwargs)
+
+    def get_cache_label(self):
+        return self.queryset.model._meta.model_name
+
+    def get_cache_key(self, request, scope):
+        label = self.get_cache_label()
+        return response_key(request, label, scope, catalogue_versions(label, scope))
+
+    def cached_response(self, scope, handler, request, *args, **kwargs):
+        cache = get_cache()
+        key = self.get_cache_key(request, scope)
+        data = cache.get(key)
+        if data is not None:
+            _count(cache, 'hits')
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        _count(cache, 'misses')
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, getattr(settings, 'CATALOGUE_CACHE_TIMEOUT', 300))
+        response['X-Cache'] = 'MISS'
+        return response
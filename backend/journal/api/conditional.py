@@ -0,0 +1,96 @@
+# journal/api/conditional.py
+"""
+Условные GET-запросы (ETag / Last-Modified -> 304 Not Modified).
+Валидаторы считаются дешёвым запросом к БД или по версиям кэша каталога,
+тело ответа при совпадении не сериализуется вовсе.
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from journal.api.cache import catalogue_versions, object_scope
+
+
+def make_etag(*parts):
+    raw = '|'.join(str(part) for part in parts)
+    return quote_etag(hashlib.md5(raw.encode()).hexdigest())
+
+
+class ConditionalGetMixin:
+    """
+    Подклассы реализуют get_validators(request, scope) -> (etag, last_modified),
+    где scope — 'list' или pk объекта. Любой из валидаторов может быть None.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response('list', super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        scope = object_scope(self, kwargs)
+        if scope is None:
+            return super().retrieve(request, *args, **kwargs)
+        return self.conditional_response(scope, super().retrieve, request, *args, **kwargs)
+
+    def get_validators(self, request, scope):
+        raise NotImplementedError
+
+    def conditional_response(self, scope, handler, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request, scope)
+        not_modified = get_conditional_response(
+            request, etag=etag,
+            last_modified=int(last_modified.timestamp()) if last_modified else None,
+        )
+        if not_modified is not None:
+            if etag:
+                not_modified['ETag'] = etag
+            return not_modified
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            if etag:
+                response['ETag'] = etag
+            if last_modified:
+                response['Last-Modified'] = http_date(last_modified.timestamp())
+        # хранить можно, но перед использованием — всегда перепроверять
+        patch_cache_control(response, no_cache=True)
+        return response
+
+
+class VersionConditionalMixin(ConditionalGetMixin):
+    """
+    Каталог: валидатор — версии из journal/api/cache.py (без запроса к БД).
+    """
+
+    def get_validators(self, request, scope):
+        label = self.queryset.model._meta.model_name
+        versions = catalogue_versions(label, scope)
+        return make_etag(label, scope, *versions, request.get_host(), request.get_full_path()), None
+
+
+class UpdatedAtConditionalMixin(ConditionalGetMixin):
+    """
+    Модели с updated_at: для списка — MAX(updated_at) и COUNT(*) по отфильтрованному
+    queryset (COUNT ловит удаления), для объекта — его updated_at.
+    Last-Modified отдаём только для объекта: по одной дате удаление из списка не заметить.
+    В ETag входят пользователь (выдача зависит от того, кто спрашивает)
+    и версия каталога книг — книга вложена в ответ, но не трогает updated_at.
+    """
+
+    def get_validators(self, request, scope):
+        qs = self.filter_queryset(self.get_queryset()).order_by()
+        books = catalogue_versions('book', 'list')
+        if scope == 'list':
+            stats = qs.aggregate(last=Max('updated_at'), total=Count('pk'))
+            etag = make_etag(request.user.pk, request.get_full_path(), *books, stats['total'], stats['last'])
+            return etag, None
+
+        try:
+            updated_at = qs.filter(pk=scope).values_list('updated_at', flat=True).first()
+        except (TypeError, ValueError):
+            updated_at = None
+        if updated_at is None:
+            # объекта нет — пусть обработчик вернёт 404
+            return None, None
+        return make_etag(request.user.pk, request.get_full_path(), *books, updated_at), updated_at
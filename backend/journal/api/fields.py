@@ -0,0 +1,20 @@
+# journal/api/fields.py
+from django.core.files.storage import default_storage
+from rest_framework import serializers
+
+
+class ImageVariantsField(serializers.ReadOnlyField):
+    """
+    Уменьшенные копии картинки (jobs/images.py):
+    {'64': {'webp': url, 'jpg': url}, ...} — абсолютные URL, как у ImageField(use_url=True).
+    """
+
+    def to_representation(self, value):
+        request = self.context.get('request')
+        result = {}
+        for size, formats in (value or {}).items():
+            result[size] = {}
+            for ext, name in formats.items():
+                url = default_storage.url(name)
+                result[size][ext] = request.build_absolute_uri(url) if request is not None else url
+        return result
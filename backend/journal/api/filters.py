@@ -1,13 +1,52 @@
 # journal/api/filters.py
+from datetime import datetime, time, timedelta
+
 import django_filters
+from django.utils import timezone
+from rest_framework.filters import BaseFilterBackend
+
 from journal.models import Quote
+from journal.search import searched
+
+
+def start_of_day(value):
+    return timezone.make_aware(datetime.combine(value, time.min))
+
 
 class QuoteFilter(django_filters.FilterSet):
-    date_from = django_filters.DateFilter(field_name='created_at', lookup_expr='gte')
-    date_to   = django_filters.DateFilter(field_name='created_at', lookup_expr='lte')
+    # границы дня считаем в текущей таймзоне и сравниваем с created_at как есть:
+    # created_at__date обернул бы колонку в приведение типа, и индексы бы не работали
+    date_from = django_filters.DateFilter(method='filter_date_from')
+    date_to   = django_filters.DateFilter(method='filter_date_to')
     author    = django_filters.NumberFilter(field_name='book__author__id')
     genre     = django_filters.NumberFilter(field_name='book__genre__id')
+    privat    = django_filters.BooleanFilter(field_name='privat')
 
     class Meta:
         model  = Quote
-        fields = ['author', 'genre', 'date_from', 'date_to']
+        fields = ['author', 'genre', 'privat', 'date_from', 'date_to']
+
+    def filter_date_from(self, queryset, name, value):
+        return queryset.filter(created_at__gte=start_of_day(value))
+
+    def filter_date_to(self, queryset, name, value):
+        # включительно: всё до начала следующего дня
+        return queryset.filter(created_at__lt=start_of_day(value + timedelta(days=1)))
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """
+    ?q=<текст> — полнотекстовый поиск (websearch-синтаксис: "фраза", -исключить, or).
+    Результаты упорядочены по рангу, KeysetPagination листает их по (-search_rank, -id).
+    """
+    search_param = 'q'
+
+    @classmethod
+    def get_search_text(cls, request):
+        return request.query_params.get(cls.search_param, '').strip()
+
+    def filter_queryset(self, request, queryset, view):
+        text = self.get_search_text(request)
+        if not text:
+            return queryset
+        return searched(queryset, text).order_by('-search_rank', '-id')
@@ -0,0 +1,71 @@
+# journal/api/pagination.py
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Keyset (cursor) пагинация по индексированному полю.
+    Страница отдаётся через WHERE id < :cursor ORDER BY id DESC LIMIT n,
+    поэтому стоимость запроса не зависит от номера страницы и размера таблицы.
+
+    Пагинация включается, если клиент передал ?cursor= или ?page_size=.
+    При JOURNAL_PAGINATION_REQUIRED = True она включена всегда
+    (клиенты, ждущие «голый» список, получат {next, previous, results}).
+    """
+    ordering = '-id'
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+
+    def get_page_size(self, request):
+        default = getattr(settings, 'JOURNAL_PAGE_SIZE', 50)
+        cap = getattr(settings, 'JOURNAL_MAX_PAGE_SIZE', 500)
+        try:
+            requested = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return min(default, cap)
+        if requested <= 0:
+            return min(default, cap)
+        return min(requested, cap)
+
+    def get_ordering(self, request, queryset, view):
+        # при полнотекстовом поиске листаем в порядке релевантности
+        if 'search_rank' in queryset.query.annotations:
+            return ('-search_rank', '-id')
+        return super().get_ordering(request, queryset, view)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+    def is_requested(self, request):
+        if getattr(settings, 'JOURNAL_PAGINATION_REQUIRED', False):
+            return True
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+
+class MomentKeysetPagination(KeysetPagination):
+    """
+    Для Share: лента по времени, используем уже существующий индекс на moment.
+    """
+    ordering = ('-moment', '-id')
+
+
+class UpdatedKeysetPagination(KeysetPagination):
+    """
+    Для BookLog: журнал листается от последних изменений,
+    курсор идёт по индексу (owner, -updated_at).
+    """
+    ordering = ('-updated_at', '-id')
+
+
+class SubresourcePagination(KeysetPagination):
+    """
+    Для вложенных списков (/quotes/{id}/likes/ и т.п.): пагинация включена всегда,
+    т.к. у популярной цитаты могут быть десятки тысяч записей.
+    """
+
+    def is_requested(self, request):
+        return True
@@ -1,57 +1,144 @@
 from rest_framework import serializers
 
-from users.api.serializers import UserSerializer
+from users.api.serializers import UserSerializer, UserShortSerializer
+from journal.api.fields import ImageVariantsField
+from journal.api.sparse import SparseFieldsMixin
 from journal.models import Author, Book, BookLog, Genre, Like, Quote, Share, BookTypes
 # serializers.py
 
-class AuthorSerializer(serializers.ModelSerializer):
+
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+  """
+  PK-поле, которое при bulk-импорте берёт объект из context['prefetched'][field_name]
+  (см. journal/api/bulk.py) вместо отдельного SELECT на каждый элемент.
+  """
+
+  def to_internal_value(self, data):
+    prefetched = self.context.get('prefetched', {}).get(self.field_name)
+    if prefetched is None:
+      return super().to_internal_value(data)
+    if isinstance(data, bool):
+      self.fail('incorrect_type', data_type=type(data).__name__)
+    try:
+      return prefetched[int(data)]
+    except KeyError:
+      self.fail('does_not_exist', pk_value=data)
+    except (TypeError, ValueError):
+      self.fail('incorrect_type', data_type=type(data).__name__)
+
+
+class SearchResultMixin:
+  """
+  При поиске (?q=) добавляет к объекту его ранг и подсвеченный фрагмент.
+  """
+
+  def to_representation(self, instance):
+    data = super().to_representation(instance)
+    if hasattr(instance, 'search_rank'):
+      data['search_rank'] = instance.search_rank
+      data['search_snippet'] = instance.search_snippet
+    return data
+
+
+class OwnBookLogField(PrefetchedPrimaryKeyRelatedField):
+  """
+  Цитату можно привязать только к своей записи журнала.
+  """
+
+  def get_queryset(self):
+    request = self.context.get('request')
+    if request is None or not request.user.is_authenticated:
+      return BookLog.objects.none()
+    return BookLog.objects.filter(owner=request.user)
+
+
+class AuthorSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     photo = serializers.ImageField(use_url=True, allow_null=True, required=False)
+    # уменьшенные копии фото (jobs/images.py)
+    photo_variants = ImageVariantsField()
 
     class Meta:
         model = Author
         fields = [
             'id',
             'first_name', 'last_name', 'patronymic',
-            'birthday', 'death', 'country', 'photo',
+            'birthday', 'death', 'country', 'photo', 'photo_variants',
             'status',                   # ← добавили
         ]
         read_only_fields = ['id', 'status']
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(SparseFieldsMixin, serializers.ModelSerializer):
   
   class Meta:
     model = Genre
     fields = ['id', 'title', 'description']
     read_only_fields = ['id']
 
-class BookSerializer(serializers.ModelSerializer):
+class BookSerializer(SparseFieldsMixin, serializers.ModelSerializer):
   logo = serializers.ImageField(use_url=True, allow_null=True, required=False)
+  # уменьшенные копии обложки (jobs/images.py) — для списков вместо оригинала
+  logo_variants = ImageVariantsField()
   genre = GenreSerializer(read_only=True)
   type_text = serializers.SerializerMethodField()
+  # сводка оценок читателей (journal/ratings.py)
+  avg_score = serializers.SerializerMethodField()
 
   class Meta:
     model = Book
-    fields = ['id', 'title', 'author', 'genre', 'logo', 'symbols', 'type_text', 'type']
-    read_only_fields = ['id']
+    fields = ['id', 'title', 'author', 'genre', 'logo', 'logo_variants', 'symbols', 'type_text', 'type',
+              'avg_score', 'ratings_count', 'score_histogram']
+    read_only_fields = ['id', 'ratings_count', 'score_histogram']
 
   def get_type_text(self, obj):
     return BookTypes(obj.type).label
+
+  def get_avg_score(self, obj):
+    # в БД 0 означает «оценок нет»
+    return round(obj.avg_score, 2) if obj.ratings_count else None
   
-class BookLogSerializer(serializers.ModelSerializer):
+class BookLogSerializer(SearchResultMixin, SparseFieldsMixin, serializers.ModelSerializer):
   book = BookSerializer(read_only=True)
+  book_id = PrefetchedPrimaryKeyRelatedField(source='book', queryset=Book.objects.all(), write_only=True)
   
   class Meta:
     model = BookLog
-    fields = ['id', 'book', 'start', 'end', 'topic', 'score', 'three_sentences', 
+    fields = ['id', 'owner', 'book', 'book_id', 'start', 'end', 'topic', 'score', 'three_sentences', 
               'new_knowledge', 'transformed_me', 'impressions', 'ideas', 'heroes', 
-              'begin', 'key_events', 'most_important_event', 'result', 'created_at', 
-              'updated_at']
-    read_only_fields = ['id']
+              'begin', 'key_events', 'most_important_event', 'result', 'privat',
+              'created_at', 'updated_at']
+    read_only_fields = ['id', 'owner']
+
+
+class BookLogSummarySerializer(SearchResultMixin, SparseFieldsMixin, serializers.ModelSerializer):
+  """
+  Строка обзора журнала (list): без длинных текстов — их отдаёт только retrieve,
+  а SparseQuerysetMixin не читает их из БД.
+  """
+  book = BookSerializer(read_only=True)
+
+  class Meta:
+    model = BookLog
+    fields = ['id', 'owner', 'book', 'start', 'end', 'score', 'privat', 'created_at', 'updated_at']
+    read_only_fields = fields
+
+
+class VisibleBookLogSerializer(BookLogSerializer):
+  """
+  Запись журнала, вложенная в чужой ресурс (цитату): приватную видит только
+  владелец — как в BookLogViewSet.retrieve, остальным отдаём null.
+  """
+
+  def to_representation(self, instance):
+    request = self.context.get('request')
+    user = getattr(request, 'user', None)
+    if instance.privat and (user is None or instance.owner_id != user.pk):
+      return None
+    return super().to_representation(instance)
 
 
 class LikeSerializer(serializers.ModelSerializer):
   user = UserSerializer(read_only=True)
-  quote = serializers.PrimaryKeyRelatedField(read_only=True)
+  quote = serializers.PrimaryKeyRelatedField(queryset=Quote.objects.all())
   
   class Meta:
     model = Like
@@ -61,7 +148,7 @@ class LikeSerializer(serializers.ModelSerializer):
 
 class ShareSerializer(serializers.ModelSerializer):
   user = UserSerializer(read_only=True)
-  quote = serializers.PrimaryKeyRelatedField(read_only=True)
+  quote = serializers.PrimaryKeyRelatedField(queryset=Quote.objects.all())
   
   class Meta:
     model = Share
@@ -69,16 +156,53 @@ class ShareSerializer(serializers.ModelSerializer):
     read_only_fields = ['id']
 
 
-class QuoteSerializer(serializers.ModelSerializer):
-  book = BookSerializer(read_only=True)
-  book_log = BookLogSerializer(read_only=True)
+class PublicLikeSerializer(LikeSerializer):
+  """
+  Лайк в публичном списке /quotes/{id}/likes/: лайкнувший без email.
+  """
+  user = UserShortSerializer(read_only=True)
+
 
-  likes  = LikeSerializer(source='like_records',  many=True, read_only=True)
-  shared = ShareSerializer(source='share_records', many=True, read_only=True)
+class PublicShareSerializer(ShareSerializer):
+  """
+  Репост в публичном списке /quotes/{id}/shares/: пользователь без email.
+  """
+  user = UserShortSerializer(read_only=True)
 
 
+class QuoteSerializer(SearchResultMixin, SparseFieldsMixin, serializers.ModelSerializer):
+  """
+  Компактное представление цитаты: вместо полного списка лайков/репостов
+  отдаём счётчики, флаг liked_by_me и (опционально) N последних лайкнувших.
+  Полный список лайков — /quotes/{id}/likes/ (с пагинацией).
+  Счётчики — денормализованные поля Quote.like_count / share_count.
+  Тексты записи журнала тяжёлые: ?expand=book / ?fields=... (см. journal/api/sparse.py).
+  """
+  book = BookSerializer(read_only=True)
+  # приватная запись журнала — только владельцу
+  book_log = VisibleBookLogSerializer(read_only=True)
+  book_id = PrefetchedPrimaryKeyRelatedField(source='book', queryset=Book.objects.all(), write_only=True)
+  book_log_id = OwnBookLogField(source='book_log', write_only=True, required=False, allow_null=True)
+
+  likes_count = serializers.IntegerField(source='like_count', read_only=True)
+  shares_count = serializers.IntegerField(source='share_count', read_only=True)
+  liked_by_me = serializers.SerializerMethodField()
+  recent_likers = serializers.SerializerMethodField()
+
   class Meta:
     model = Quote
-    fields = ['id', 'book', 'note', 'likes', 'shared', 'privat', 'book_log']
-    read_only_fields = ['id']
-
+    fields = ['id', 'book', 'book_id', 'note', 'likes_count', 'shares_count', 'liked_by_me',
+              'recent_likers', 'privat', 'book_log', 'book_log_id', 'created_at']
+    read_only_fields = ['id', 'created_at']
+
+  def get_liked_by_me(self, obj):
+    if hasattr(obj, 'liked_by_me'):
+      return obj.liked_by_me
+    request = self.context.get('request')
+    if request is None or not request.user.is_authenticated:
+      return False
+    return obj.like_records.filter(user=request.user).exists()
+
+  def get_recent_likers(self, obj):
+    likes = getattr(obj, 'recent_likes', [])
+    return UserShortSerializer([like.user for like in likes], many=True, context=self.context).data
@@ -0,0 +1,133 @@
+# journal/api/sparse.py
+"""
+Разреженные ответы для GET-запросов:
+
+  ?fields=id,note,book.title  — только перечисленные поля (через точку — во вложенных)
+  ?expand=book,book_log.book  — какие вложенные объекты разворачивать, остальные
+                                отдаются их id; без ?expand= разворачивается всё, как раньше
+
+SparseQuerysetMixin подстраивает queryset под получившийся сериализатор:
+JOIN (select_related) — только ради развёрнутых объектов, а TEXT-колонки,
+которых нет в ответе, уходят в defer() и не читаются из БД.
+"""
+from django.contrib.postgres.search import SearchVectorField
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+# «тяжёлые» колонки: читаем, только если они нужны ответу
+DEFERRABLE_FIELDS = (models.TextField, SearchVectorField)
+
+
+def parse_paths(value):
+    """
+    'id,book.title,book.genre' -> {'id': {}, 'book': {'title': {}, 'genre': {}}}
+    """
+    tree = {}
+    for path in value.split(','):
+        node = tree
+        for part in filter(None, (part.strip() for part in path.split('.'))):
+            node = node.setdefault(part, {})
+    return tree
+
+
+def requested_paths(request):
+    if request is None or request.method not in SAFE_METHODS:
+        return None, None
+    params = request.query_params
+    fields = parse_paths(params[FIELDS_PARAM]) if params.get(FIELDS_PARAM) else None
+    expand = parse_paths(params[EXPAND_PARAM]) if EXPAND_PARAM in params else None
+    return fields, expand
+
+
+class SparseFieldsMixin:
+    """
+    Корневой сериализатор берёт ?fields= / ?expand= из запроса в context,
+    вложенным родитель передаёт их ветку через sparse_fields / expand.
+    """
+
+    def __init__(self, *args, sparse_fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if sparse_fields is None and expand is None:
+            sparse_fields, expand = requested_paths(self.context.get('request'))
+        if sparse_fields is not None or expand is not None:
+            self.apply_sparse(sparse_fields, expand)
+
+    def apply_sparse(self, sparse_fields, expand):
+        for name in list(self.fields):
+            field = self.fields[name]
+            if sparse_fields is not None and name not in sparse_fields:
+                self.fields.pop(name)
+                continue
+            if not isinstance(field, serializers.Serializer):
+                continue
+            if expand is not None and name not in expand:
+                source = {} if field.source == name else {'source': field.source}
+                self.fields[name] = serializers.PrimaryKeyRelatedField(read_only=True, **source)
+                continue
+            # 'book' без вложенных путей — все поля книги
+            sub_fields = (sparse_fields.get(name) or None) if sparse_fields is not None else None
+            sub_expand = expand.get(name) if expand is not None else None
+            if isinstance(field, SparseFieldsMixin) and (sub_fields is not None or sub_expand is not None):
+                self.fields[name] = type(field)(
+                    *field._args, sparse_fields=sub_fields, expand=sub_expand, **field._kwargs
+                )
+
+
+def serializer_plan(serializer, model, prefix=''):
+    """
+    (select_related, defer) для модели, которую отдаёт serializer.
+    None — если сериализатор ходит в данные, о которых план ничего не знает.
+    """
+    select, deferred, used = [], [], set()
+    for name, field in serializer.fields.items():
+        if field.write_only or field.source == '*':
+            continue
+        attr = field.source_attrs[0]
+        used.add(attr)
+        if not isinstance(field, serializers.Serializer):
+            continue
+        try:
+            relation = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        if not (relation.many_to_one or relation.one_to_one):
+            return None
+        nested = serializer_plan(field, relation.related_model, f'{prefix}{attr}__')
+        if nested is None:
+            return None
+        select += [f'{prefix}{attr}', *nested[0]]
+        deferred += nested[1]
+
+    deferred += [
+        f'{prefix}{field.name}'
+        for field in model._meta.concrete_fields
+        if isinstance(field, DEFERRABLE_FIELDS) and field.name not in used
+    ]
+    return select, deferred
+
+
+class SparseQuerysetMixin:
+    """
+    Для GET: select_related и defer() строятся по сериализатору запроса
+    (см. serializer_plan) вместо фиксированных в queryset ViewSet'а.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method not in SAFE_METHODS:
+            return queryset
+        plan = serializer_plan(self.get_serializer(), queryset.model)
+        if plan is None:
+            return queryset
+        select, deferred = plan
+        queryset = queryset.select_related(None)
+        if select:
+            queryset = queryset.select_related(*select)
+        if deferred:
+            queryset = queryset.defer(*deferred)
+        return queryset
@@ -1,7 +1,8 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
-from journal.api.views import  AuthorViewSet, GenreViewSet, BookLogViewSet, BookViewSet, QuoteViewSet, LikeViewSet, ShareViewSet
+from journal.api.async_views import AsyncAuthorList, AsyncBookList, AsyncGenreList, AsyncQuoteList
+from journal.api.views import  AuthorViewSet, GenreViewSet, BookLogViewSet, BookViewSet, QuoteViewSet, LikeViewSet, ShareViewSet, AutocompleteViewSet, ReadingStatsViewSet
 
 router = DefaultRouter()
 router.register(r'authors', AuthorViewSet, basename='authors')
@@ -11,9 +12,16 @@ router.register(r'logs',    BookLogViewSet, basename='book_logs')
 router.register(r'quotes',  QuoteViewSet, basename='quotes')
 router.register(r'likes',   LikeViewSet, basename='likes')
 router.register(r'shares',  ShareViewSet, basename='shares')
+router.register(r'autocomplete', AutocompleteViewSet, basename='autocomplete')
+router.register(r'stats',   ReadingStatsViewSet, basename='stats')
 
 
 urlpatterns = [
+  # асинхронное чтение для ASGI (journal/api/async_views.py)
+  path('async/authors/', AsyncAuthorList.as_view(), name='async-authors'),
+  path('async/genres/',  AsyncGenreList.as_view(), name='async-genres'),
+  path('async/books/',   AsyncBookList.as_view(), name='async-books'),
+  path('async/quotes/',  AsyncQuoteList.as_view(), name='async-quotes'),
   path('', include(router.urls)),
 ]
 
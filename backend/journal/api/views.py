@@ -1,9 +1,20 @@
+from django.core.handlers.asgi import ASGIRequest
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef, Prefetch, Q, Value, BooleanField
+from django.http import HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-from rest_framework.permissions import BasePermission, AllowAny
+from rest_framework.settings import api_settings
+from rest_framework.permissions import AllowAny
+from rest_framework.renderers import BaseRenderer, JSONRenderer
 
-from BookLog.permissions import is_self
+from BookLog.permissions import (
+    ActionBasedPermissionsMixin, DenyAnonymous, IsAdmin, IsJournalist, IsReader, IsStaff,
+    filters_queryset, is_self, owned_by_user,
+)
 from users.models import UserTypes
 from journal.models import (
     Author, Genre, Book, BookLog, Quote, Like, Share,
@@ -11,108 +22,68 @@ from journal.models import (
 )
 from journal.api.serializers import (
     AuthorSerializer, GenreSerializer, BookSerializer,
-    BookLogSerializer, QuoteSerializer, LikeSerializer,
-    ShareSerializer
+    BookLogSerializer, BookLogSummarySerializer, QuoteSerializer, LikeSerializer,
+    ShareSerializer, PublicLikeSerializer, PublicShareSerializer
+)
+from journal.api.bulk import BulkCreateMixin
+from journal.api.cache import CatalogueCacheMixin, invalidate_catalogue
+from journal.api.conditional import UpdatedAtConditionalMixin, VersionConditionalMixin
+from journal.api.filters import FullTextSearchFilter, QuoteFilter
+from journal.api.sparse import SparseQuerysetMixin
+from journal.counters import change_counter
+from journal.export import EXPORT_FORMATS, aiter_export, iter_export
+from journal.stats import user_stats
+from journal.autocomplete import AUTOCOMPLETE_SOURCES, MIN_QUERY_LENGTH, autocomplete
+from journal.api.pagination import (
+    KeysetPagination, MomentKeysetPagination, SubresourcePagination, UpdatedKeysetPagination
 )
-from journal.api.filters import QuoteFilter
-
-
-# 1) «ИЛИ»-permission: если любой из списка даёт True — разрешаем
-class OrPermission(BasePermission):
-    def __init__(self, perm_classes):
-        self.perms = [cls() for cls in perm_classes]
-
-    def has_permission(self, request, view):
-        return any(p.has_permission(request, view) for p in self.perms)
-
-    def has_object_permission(self, request, view, obj):
-        return any(p.has_object_permission(request, view, obj) for p in self.perms)
-
-
-# 2) Простые классы по ролям
-class IsJournalist(BasePermission):
-    def has_permission(self, request, view):
-        return (
-            request.user
-            and request.user.is_authenticated
-            and int(request.user.user_type) == int(UserTypes.JOURNALIST.value)
-        )
-
-class IsReader(BasePermission):
-    def has_permission(self, request, view):
-        return(
-            request.user
-            and request.user.is_authenticated
-            and (int(request.user.user_type) == int(UserTypes.READER.value))
-        )
-
-class IsStaff(BasePermission):
-    def has_permission(self, request, view):
-        return (
-            request.user
-            and request.user.is_authenticated
-            and int(request.user.user_type) == int(UserTypes.STAFF.value)
-        )
-
 
-class IsAdmin(BasePermission):
-    def has_permission(self, request, view):
-        return (
-            request.user
-            and request.user.is_authenticated
-            and int(request.user.user_type) == int(UserTypes.ADMIN.value)
-        )
 
+# Рендерер-заглушка для действий, которые сами отдают StreamingHttpResponse:
+# content negotiation не должна отклонять Accept: text/csv и т.п.
+# (ошибки при этом по-прежнему рендерит JSONRenderer, стоящий первым)
+class PassthroughRenderer(BaseRenderer):
+    media_type = '*/*'
+    format = None
 
-# 3) Запретить только анонимов (возвращает 403, а не 401)
-class DenyAnonymous(BasePermission):
-    def has_permission(self, request, view):
-        return not request.user.is_anonymous
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return data
 
 
-# 4) Mixin для per‐action permissions
-class ActionBasedPermissionsMixin:
+class ModeratedMixin:
     """
-    Определяем в подклассах словарь:
-        permission_map = {
-          'action_name': [PermClass1, PermClass2, …],
-          …
-        }
-    Если для action даётся несколько классов — они объединяются через OR (OrPermission).
-    Если action нет в map — берётся [AllowAny] (то есть метод публичный).
+    Создание/редактирование через модерацию.
+    Каждая запись сбрасывает кэш каталога (см. journal/api/cache.py).
     """
-    permission_map = {}
 
-    def get_permissions(self):
-        perms = self.permission_map.get(self.action)
-        if perms is None:
-            return [AllowAny()]
-
-        if not isinstance(perms, (list, tuple)):
-            perms = [perms]
-
-        if len(perms) == 1:
-            return [perms[0]()]
-        return [OrPermission(perms)]
-
-class ModeratedMixin:
     def perform_create(self, serializer):
-        serializer.save(
+        obj = serializer.save(
             created_by=self.request.user,
             status=ApprovalStatus.PENDING,
         )
+        self.invalidate_cache(obj.pk)
 
     def perform_update(self, serializer):
         extra = {}
         if self.request.user.user_type == UserTypes.JOURNALIST.value:
             extra['status'] = ApprovalStatus.PENDING
-        serializer.save(**extra)
+        obj = serializer.save(**extra)
+        self.invalidate_cache(obj.pk)
+
+    def perform_destroy(self, instance):
+        pk = instance.pk
+        instance.delete()
+        self.invalidate_cache(pk)
+
+    def invalidate_cache(self, pk):
+        invalidate_catalogue(self.queryset.model._meta.model_name, pk)
 
     @action(detail=True, methods=['post'])
     def approve(self, request, pk=None):
         obj = self.get_object()
         obj.status = ApprovalStatus.APPROVED
         obj.save(update_fields=['status'])
+        self.invalidate_cache(obj.pk)
         return Response(self.get_serializer(obj).data, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=['post'])
@@ -120,13 +91,17 @@ class ModeratedMixin:
         obj = self.get_object()
         obj.status = ApprovalStatus.REJECTED
         obj.save(update_fields=['status'])
+        self.invalidate_cache(obj.pk)
         return Response(self.get_serializer(obj).data, status=status.HTTP_200_OK)
 
 # ——— AuthorViewSet ——————————————————————————————————————————————————
 
-class AuthorViewSet(ActionBasedPermissionsMixin, ModeratedMixin, viewsets.ModelViewSet):
+class AuthorViewSet(VersionConditionalMixin, CatalogueCacheMixin, ActionBasedPermissionsMixin, ModeratedMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     queryset = Author.objects.all()
     serializer_class = AuthorSerializer
+    pagination_class = KeysetPagination
+    # ?status=0 — очередь модерации (частичный индекс *_pending_idx)
+    filterset_fields = ['status']
 
     permission_map = {
         'create':         [IsJournalist, IsStaff,    IsAdmin],
@@ -142,9 +117,12 @@ class AuthorViewSet(ActionBasedPermissionsMixin, ModeratedMixin, viewsets.ModelV
 
 # ——— GenreViewSet ——————————————————————————————————————————————————
 
-class GenreViewSet(ActionBasedPermissionsMixin, ModeratedMixin, viewsets.ModelViewSet):
+class GenreViewSet(VersionConditionalMixin, CatalogueCacheMixin, ActionBasedPermissionsMixin, ModeratedMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    pagination_class = KeysetPagination
+    # ?status=0 — очередь модерации (частичный индекс *_pending_idx)
+    filterset_fields = ['status']
 
     permission_map = {
         'create':         [IsJournalist, IsStaff, IsAdmin],
@@ -153,14 +131,21 @@ class GenreViewSet(ActionBasedPermissionsMixin, ModeratedMixin, viewsets.ModelVi
         'update':         [IsJournalist, IsStaff, IsAdmin],
         'partial_update': [IsJournalist, IsStaff, IsAdmin],
         'destroy':        [IsStaff,     IsAdmin],
+        'approve':        [IsStaff,     IsAdmin],
+        'reject':         [IsStaff,     IsAdmin],
     }
 
 
 # ——— BookViewSet ——————————————————————————————————————————————————
 
-class BookViewSet(ActionBasedPermissionsMixin, ModeratedMixin, viewsets.ModelViewSet):
+class BookViewSet(VersionConditionalMixin, CatalogueCacheMixin, ActionBasedPermissionsMixin, ModeratedMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     queryset = Book.objects.select_related('author', 'genre').all()
     serializer_class = BookSerializer
+    pagination_class = KeysetPagination
+    # ?status=0 — очередь модерации (частичный индекс *_pending_idx)
+    filterset_fields = ['status']
+    # ?ordering=-avg_score / -ratings_count — по индексам book_avg_score_idx / book_ratings_count_idx
+    ordering_fields = ['id', 'title', 'symbols', 'type', 'avg_score', 'ratings_count']
 
     permission_map = {
         'create':         [IsJournalist, IsStaff, IsAdmin],
@@ -175,46 +160,188 @@ class BookViewSet(ActionBasedPermissionsMixin, ModeratedMixin, viewsets.ModelVie
 
 # ——— BookLogViewSet ——————————————————————————————————————————————————
 
-class BookLogViewSet(ActionBasedPermissionsMixin, viewsets.ModelViewSet):
+def include_public(request):
+    return request.query_params.get('include_public') in ('1', 'true', 'True')
+
+
+def own_or_public_logs(request, view, queryset):
+    condition = owned_by_user(request, view, queryset)
+    if include_public(request):
+        condition |= Q(privat=False)
+    return condition
+
+
+@filters_queryset(own_or_public_logs)
+def is_own_log(request, view, obj=None):
+    """
+    Список журнала: свои записи, с ?include_public=1 — ещё и чужие публичные.
+    """
+    if obj is not None and include_public(request) and not obj.privat:
+        return True
+    return is_self(request, view, obj)
+
+
+class BookLogViewSet(UpdatedAtConditionalMixin, BulkCreateMixin, ActionBasedPermissionsMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     queryset = BookLog.objects.select_related(
         'book', 'book__author', 'book__genre'
     )
     serializer_class = BookLogSerializer
+    pagination_class = UpdatedKeysetPagination
+    filter_backends = [*api_settings.DEFAULT_FILTER_BACKENDS, FullTextSearchFilter]
 
     permission_map = {
         'create':         [IsJournalist, IsStaff, IsAdmin],
-        'list':           DenyAnonymous,  # только залогиненным
+        'bulk':           [IsJournalist, IsStaff, IsAdmin],
+        'export':         DenyAnonymous,
+        'list':           is_own_log,  # только залогиненным, условие — в SQL (filter_queryset)
         'retrieve':       DenyAnonymous,
         'update':         [IsJournalist, IsStaff, IsAdmin],
         'partial_update': [IsJournalist, IsStaff, IsAdmin],
         'destroy':        [IsJournalist, IsStaff, IsAdmin],
     }
 
+    def get_queryset(self):
+        """
+        Журнал пользователя — диапазон по индексу (owner, -updated_at).
+        list: строки отбирает is_own_log из permission_map;
+        retrieve: свои или публичные;
+        изменение: только свои (модераторам и админам — любые).
+        """
+        qs = super().get_queryset().order_by('-updated_at', '-id')
+        user = self.request.user
+
+        if self.action == 'list':
+            return qs
+
+        if self.action == 'retrieve':
+            return qs.filter(Q(owner=user) | Q(privat=False))
+
+        if user.user_type in (UserTypes.STAFF.value, UserTypes.ADMIN.value):
+            return qs
+        return qs.filter(owner=user)
+
+    def get_serializer_class(self):
+        # обзор журнала — без длинных текстов; полная запись — retrieve
+        if self.action == 'list':
+            return BookLogSummarySerializer
+        return super().get_serializer_class()
+
+    def perform_create(self, serializer):
+        serializer.save(owner=self.request.user)
+
+    def get_bulk_save_kwargs(self):
+        return {'owner': self.request.user}
+
+    @action(detail=False, methods=['get'], renderer_classes=[JSONRenderer, PassthroughRenderer])
+    def export(self, request):
+        """
+        GET /logs/export/?export_format=ndjson|csv — весь журнал текущего пользователя потоком.
+        """
+        export_format = request.query_params.get('export_format', 'ndjson')
+        if export_format not in EXPORT_FORMATS:
+            return HttpResponse(
+                f"Неизвестный формат: {export_format}",
+                status=status.HTTP_400_BAD_REQUEST,
+                content_type='text/plain; charset=utf-8',
+            )
+
+        # под ASGI Django потоково отдаёт только асинхронный итератор
+        if isinstance(request._request, ASGIRequest):
+            content = aiter_export(request.user, export_format)
+        else:
+            content = iter_export(request.user, export_format)
+        response = StreamingHttpResponse(
+            content,
+            content_type=f'{EXPORT_FORMATS[export_format]}; charset=utf-8',
+        )
+        response['Content-Disposition'] = f'attachment; filename="booklog.{export_format}"'
+        return response
+
 
 # ——— QuoteViewSet ——————————————————————————————————————————————————
 
-class QuoteViewSet(ActionBasedPermissionsMixin, viewsets.ModelViewSet):
+class QuoteViewSet(BulkCreateMixin, ActionBasedPermissionsMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     queryset = Quote.objects.select_related(
         'book', 'book__author', 'book__genre', 'book_log'
-    ).prefetch_related('like_records__user', 'share_records__user')
+    )
     serializer_class = QuoteSerializer
+    pagination_class = KeysetPagination
+    # своего поля владельца у цитаты нет — она принадлежит владельцу записи журнала (is_self)
+    owner_lookup = 'book_log__owner'
     filterset_class = QuoteFilter
+    filter_backends = [*api_settings.DEFAULT_FILTER_BACKENDS, FullTextSearchFilter]
+    # сортировка по популярности идёт по индексам quote_like_count_idx / quote_share_count_idx
+    ordering_fields = ['id', 'like_count', 'share_count']
+    # ?recent_likers=N — сколько последних лайкнувших вложить в каждую цитату
+    max_recent_likers = 10
 
     permission_map = {
         'create':         [IsJournalist, IsReader, IsStaff, IsAdmin],
+        'bulk':           [IsJournalist, IsReader, IsStaff, IsAdmin],
         'list':           AllowAny,
         'retrieve':       AllowAny,
+        'likes':          AllowAny,
+        'shares':         AllowAny,
         'update':         [is_self, IsStaff, IsAdmin],
         'partial_update': [is_self, IsStaff, IsAdmin],
         'destroy':        [is_self, IsStaff, IsAdmin],
     }
 
+    def get_queryset(self):
+        qs = super().get_queryset()
+        user = self.request.user
+        if user.is_authenticated:
+            qs = qs.annotate(liked_by_me=Exists(
+                Like.objects.filter(quote=OuterRef('pk'), user=user)
+            ))
+        else:
+            qs = qs.annotate(liked_by_me=Value(False, output_field=BooleanField()))
+
+        limit = self.get_recent_likers_limit()
+        if limit:
+            qs = qs.prefetch_related(Prefetch(
+                'like_records',
+                queryset=Like.objects.select_related('user').order_by('-moment', '-id')[:limit],
+                to_attr='recent_likes',
+            ))
+        return qs
+
+    def get_recent_likers_limit(self):
+        try:
+            limit = int(self.request.query_params.get('recent_likers', 0))
+        except ValueError:
+            return 0
+        return max(0, min(limit, self.max_recent_likers))
+
+    def _paginated_records(self, queryset, serializer_class):
+        paginator = SubresourcePagination()
+        page = paginator.paginate_queryset(queryset, self.request, view=self)
+        serializer = serializer_class(page, many=True, context=self.get_serializer_context())
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=['get'])
+    def likes(self, request, pk=None):
+        quote = get_object_or_404(Quote.objects.only('id'), pk=pk)
+        return self._paginated_records(
+            Like.objects.filter(quote=quote).select_related('user'),
+            PublicLikeSerializer,
+        )
+
+    @action(detail=True, methods=['get'])
+    def shares(self, request, pk=None):
+        quote = get_object_or_404(Quote.objects.only('id'), pk=pk)
+        return self._paginated_records(
+            Share.objects.filter(quote=quote).select_related('user'),
+            PublicShareSerializer,
+        )
+
 
 # ——— LikeViewSet ——————————————————————————————————————————————————
 
 class LikeViewSet(ActionBasedPermissionsMixin, viewsets.ModelViewSet):
     queryset = Like.objects.select_related('user', 'quote')
     serializer_class = LikeSerializer
+    pagination_class = KeysetPagination
 
     permission_map = {
         'create':         [IsJournalist,  IsReader, IsStaff, IsAdmin],
@@ -224,7 +351,19 @@ class LikeViewSet(ActionBasedPermissionsMixin, viewsets.ModelViewSet):
     }
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        try:
+            with transaction.atomic():
+                like = serializer.save(user=self.request.user)
+                change_counter(like.quote_id, 'like_count', +1)
+        except IntegrityError:
+            raise ValidationError({'quote': 'Цитата уже понравилась этому пользователю.'})
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            # параллельный DELETE той же записи уже мог её удалить — счётчик не трогаем
+            deleted, _ = instance.delete()
+            if deleted:
+                change_counter(instance.quote_id, 'like_count', -1)
 
 
 # ——— ShareViewSet ——————————————————————————————————————————————————
@@ -232,6 +371,7 @@ class LikeViewSet(ActionBasedPermissionsMixin, viewsets.ModelViewSet):
 class ShareViewSet(ActionBasedPermissionsMixin, viewsets.ModelViewSet):
     queryset = Share.objects.select_related('user', 'quote')
     serializer_class = ShareSerializer
+    pagination_class = MomentKeysetPagination
 
     permission_map = {
         'create':         [IsJournalist,  IsReader, IsStaff, IsAdmin],
@@ -241,4 +381,68 @@ class ShareViewSet(ActionBasedPermissionsMixin, viewsets.ModelViewSet):
     }
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        with transaction.atomic():
+            share = serializer.save(user=self.request.user)
+            change_counter(share.quote_id, 'share_count', +1)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            # параллельный DELETE той же записи уже мог её удалить — счётчик не трогаем
+            deleted, _ = instance.delete()
+            if deleted:
+                change_counter(instance.quote_id, 'share_count', -1)
+
+
+# ——— AutocompleteViewSet ——————————————————————————————————————————————
+
+class AutocompleteViewSet(ActionBasedPermissionsMixin, viewsets.ViewSet):
+    """
+    GET /autocomplete/?q=толст[&type=authors,books][&limit=10]
+    Подсказки по одобренному каталогу, см. journal/autocomplete.py.
+    """
+    default_limit = 10
+    max_limit = 20
+
+    permission_map = {
+        'list': AllowAny,
+    }
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            raise ValidationError({'limit': 'Ожидается целое число.'})
+        return max(1, min(limit, self.max_limit))
+
+    def get_sources(self):
+        requested = self.request.query_params.get('type')
+        if not requested:
+            return list(AUTOCOMPLETE_SOURCES)
+        sources = [source.strip() for source in requested.split(',') if source.strip()]
+        unknown = [source for source in sources if source not in AUTOCOMPLETE_SOURCES]
+        if unknown:
+            raise ValidationError({'type': f'Неизвестные типы: {", ".join(unknown)}.'})
+        return sources
+
+    def list(self, request):
+        text = request.query_params.get('q', '').strip()
+        sources = self.get_sources()
+        limit = self.get_limit()
+        if len(text) < MIN_QUERY_LENGTH:
+            return Response({source: [] for source in sources})
+        return Response({source: autocomplete(source, text, limit) for source in sources})
+
+
+# ——— ReadingStatsViewSet ——————————————————————————————————————————————
+
+class ReadingStatsViewSet(ActionBasedPermissionsMixin, viewsets.ViewSet):
+    """
+    GET /stats/ — статистика чтения текущего пользователя из ReadingStats
+    (см. journal/stats.py): итоги, помесячно, по жанрам и авторам.
+    """
+    permission_map = {
+        'list': DenyAnonymous,
+    }
+
+    def list(self, request):
+        return Response(user_stats(request.user))
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class JournalConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'journal'
+
+    def ready(self):
+        # регистрируем обработчики сигналов (поисковый индекс и т.п.)
+        import journal.signals
+        # статистика соединений с БД по воркерам (manage.py db_connections)
+        from BookLog.db import connect_signals
+        connect_signals()
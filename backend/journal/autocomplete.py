@@ -0,0 +1,46 @@
+# journal/autocomplete.py
+"""
+Автодополнение по каталогу (Author / Book / Genre) на pg_trgm.
+
+Условие `поле %> запрос` (word_similarity не ниже pg_trgm.word_similarity_threshold,
+по умолчанию 0.6) обслуживается GIN-индексами *_trgm_idx, так что из таблицы
+читаются только кандидаты; их сортируем по сходству и отдаём первые limit
+в виде «плоских» словарей без сериализатора.
+"""
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import Q
+from django.db.models.functions import Greatest
+
+from journal.models import ApprovalStatus, Author, Book, Genre
+
+# ключ ответа -> (модель, поля для сравнения, поля ответа)
+AUTOCOMPLETE_SOURCES = {
+    'authors': (Author, ['last_name', 'first_name', 'patronymic'], ['id', 'last_name', 'first_name', 'patronymic']),
+    'books': (Book, ['title'], ['id', 'title', 'author']),
+    'genres': (Genre, ['title'], ['id', 'title']),
+}
+
+# короче — почти одни «граничные» триграммы, совпадёт полкаталога
+MIN_QUERY_LENGTH = 2
+
+
+def similarity_expression(text, fields):
+    parts = [TrigramWordSimilarity(text, field) for field in fields]
+    # GREATEST в PostgreSQL пропускает NULL (пустое отчество)
+    return parts[0] if len(parts) == 1 else Greatest(*parts)
+
+
+def autocomplete(source, text, limit):
+    """
+    Топ-limit одобренных записей, похожих на text, по убыванию сходства.
+    """
+    model, fields, values = AUTOCOMPLETE_SOURCES[source]
+    condition = Q()
+    for field in fields:
+        condition |= Q(**{f'{field}__trigram_word_similar': text})
+    return list(
+        model.objects.filter(condition, status=ApprovalStatus.APPROVED)
+        .annotate(similarity=similarity_expression(text, fields))
+        .order_by('-similarity', 'id')
+        .values(*values, 'similarity')[:limit]
+    )
@@ -0,0 +1,61 @@
+# journal/counters.py
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from journal.models import Like, Quote, Share
+
+# поле-счётчик на Quote -> модель, строки которой оно считает
+COUNTERS = {
+    'like_count': Like,
+    'share_count': Share,
+}
+
+
+def change_counter(quote_id, field, delta):
+    """
+    Атомарно сдвигает счётчик цитаты: UPDATE ... SET field = field + delta.
+    Вызывать внутри той же транзакции, что и INSERT/DELETE лайка/репоста.
+    Уменьшение не уводит счётчик ниже нуля (на случай уже накопленного дрейфа).
+    """
+    qs = Quote.objects.filter(pk=quote_id)
+    if delta < 0:
+        qs = qs.filter(**{f'{field}__gte': -delta})
+    qs.update(**{field: F(field) + delta})
+
+
+def actual_count(model):
+    """
+    Реальное количество строк model для цитаты — коррелированный подзапрос.
+    """
+    return Coalesce(
+        Subquery(
+            model.objects.filter(quote=OuterRef('pk'))
+            .order_by()
+            .values('quote')
+            .annotate(c=Count('*'))
+            .values('c')
+        ),
+        0,
+    )
+
+
+def drifted_quotes():
+    """
+    Цитаты, у которых сохранённые счётчики не совпадают с реальными.
+    """
+    annotations = {f'actual_{field}': actual_count(model) for field, model in COUNTERS.items()}
+    mismatch = Q()
+    for field in COUNTERS:
+        mismatch |= ~Q(**{field: F(f'actual_{field}')})
+    return Quote.objects.annotate(**annotations).filter(mismatch)
+
+
+def repair_counters():
+    """
+    Пересчитывает счётчики одним UPDATE только для разошедшихся строк.
+    Возвращает количество исправленных цитат.
+    """
+    ids = drifted_quotes().values('pk')
+    return Quote.objects.filter(pk__in=ids).update(**{
+        field: actual_count(model) for field, model in COUNTERS.items()
+    })
@@ -0,0 +1,116 @@
+# journal/export.py
+"""
+Потоковая выгрузка журнала пользователя (BookLog + цитаты) в NDJSON или CSV.
+Строки читаются из БД пачками через iterator(chunk_size=...), поэтому
+память не зависит от размера журнала, а первые байты уходят сразу.
+
+Под ASGI синхронный итератор Django собрал бы в памяти целиком, поэтому там
+отдаётся aiter_export — те же строки, вытянутые пачками через sync_to_async.
+"""
+import csv
+import json
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+
+from journal.models import BookLog, Quote
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+LOG_FIELDS = [
+    'id', 'start', 'end', 'topic', 'score', 'three_sentences', 'new_knowledge',
+    'transformed_me', 'impressions', 'ideas', 'heroes', 'begin', 'key_events',
+    'most_important_event', 'result', 'privat', 'created_at', 'updated_at',
+]
+CSV_COLUMNS = ['id', 'book_id', 'book_title', 'author'] + LOG_FIELDS[1:] + ['quotes']
+
+
+def journal_queryset(user):
+    return (
+        BookLog.objects.filter(owner=user)
+        .select_related('book', 'book__author')
+        .prefetch_related(Prefetch(
+            'quotes',
+            queryset=Quote.objects.only('id', 'note', 'privat', 'book_log_id').order_by('id'),
+        ))
+        .order_by('id')
+    )
+
+
+def iter_journal_rows(user, chunk_size=500):
+    """
+    Словари по одному на запись журнала. prefetch_related вместе с iterator
+    подгружает цитаты для каждой пачки из chunk_size записей отдельно.
+    """
+    for log in journal_queryset(user).iterator(chunk_size=chunk_size):
+        row = {field: getattr(log, field) for field in LOG_FIELDS}
+        row['book_id'] = log.book_id
+        row['book_title'] = log.book.title
+        row['author'] = str(log.book.author)
+        row['quotes'] = [
+            {'id': quote.id, 'note': quote.note, 'privat': quote.privat}
+            for quote in log.quotes.all()
+        ]
+        yield row
+
+
+def iter_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+class _Echo:
+    """
+    «Файл» для csv.writer, который сразу возвращает записанную строку.
+    """
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_COLUMNS)
+    for row in rows:
+        quotes = '\n'.join(quote['note'] for quote in row['quotes'])
+        yield writer.writerow([
+            quotes if column == 'quotes' else _csv_value(row[column])
+            for column in CSV_COLUMNS
+        ])
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def iter_export(user, export_format, chunk_size=500):
+    rows = iter_journal_rows(user, chunk_size=chunk_size)
+    if export_format == 'csv':
+        return iter_csv(rows)
+    return iter_ndjson(rows)
+
+
+async def aiter_export(user, export_format, chunk_size=500, lines_per_chunk=100):
+    """
+    iter_export для ASGI. Серверный курсор iterator() живёт в потоке
+    синхронного кода запроса (sync_to_async с thread_sensitive), в цикл
+    событий уходят готовые куски по lines_per_chunk строк.
+    """
+    lines = iter_export(user, export_format, chunk_size=chunk_size)
+    next_chunk = sync_to_async(lambda: ''.join(islice(lines, lines_per_chunk)))
+    try:
+        while chunk := await next_chunk():
+            yield chunk
+    finally:
+        # клиент отключился раньше конца — закрываем курсор в том же потоке
+        await sync_to_async(lines.close)()
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from journal.api.cache import cache_stats, invalidate_all, is_shared, reset_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Статистика попаданий кэша каталога, сброс кэша и счётчиков"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clear', action='store_true', help="Сбросить кэш каталога")
+        parser.add_argument('--reset-stats', action='store_true', help="Обнулить счётчики hit/miss")
+
+    def handle(self, *args, **options):
+        if not is_shared():
+            self.stderr.write(self.style.WARNING(
+                "Кэш Django локальный для процесса (не задан REDIS_URL): сброс и счётчики касаются только этой команды"
+            ))
+        if options['clear']:
+            invalidate_all()
+            self.stdout.write(self.style.SUCCESS("Кэш каталога сброшен"))
+        if options['reset_stats']:
+            reset_cache_stats()
+
+        stats = cache_stats()
+        total = stats['hits'] + stats['misses']
+        ratio = stats['hits'] / total * 100 if total else 0
+        self.stdout.write(f"hits: {stats['hits']}, misses: {stats['misses']}, hit ratio: {ratio:.1f}%")
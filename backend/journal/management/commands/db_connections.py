@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from BookLog.db import measure_connect, worker_reports, worker_stats
+
+
+class Command(BaseCommand):
+    help = "Режим соединений с БД, цена нового соединения и статистика переиспользования по воркерам"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help="Сколько раз замерить открытие соединения")
+
+    def handle(self, *args, **options):
+        settings_dict = connection.settings_dict
+        pool = settings_dict['OPTIONS'].get('pool')
+        if pool:
+            mode = f"пул psycopg {pool}"
+        elif settings_dict['CONN_MAX_AGE']:
+            mode = f"постоянные соединения, CONN_MAX_AGE={settings_dict['CONN_MAX_AGE']}"
+        else:
+            mode = "новое соединение на каждый запрос"
+        self.stdout.write(f"режим: {mode}; health checks: {settings_dict['CONN_HEALTH_CHECKS']}")
+
+        timing = measure_connect(options['repeat'])
+        self.stdout.write(f"открытие соединения: {timing['connect_ms']} мс, SELECT 1: {timing['query_ms']} мс")
+
+        reports = worker_reports() or [worker_stats()]
+        self.stdout.write(f"{'pid':>8} {'запросов':>9} {'соединений':>11} {'reuse':>6}  пул")
+        for stats in reports:
+            reuse = '-' if stats['reuse'] is None else f"{stats['reuse']:.0%}"
+            pool = stats['pool']
+            pool = '-' if pool is None else f"{pool.get('pool_size')}/{pool.get('pool_max')} ({pool.get('pool_available')} свободно)"
+            self.stdout.write(f"{stats['pid']:>8} {stats['requests']:>9} {stats['connects']:>11} {reuse:>6}  {pool}")
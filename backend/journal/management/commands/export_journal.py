@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from journal.export import EXPORT_FORMATS, iter_export
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = "Потоковая выгрузка журнала пользователя (записи + цитаты) в NDJSON или CSV"
+
+    def add_arguments(self, parser):
+        parser.add_argument('user', help="username или id пользователя")
+        parser.add_argument('--format', dest='export_format', choices=sorted(EXPORT_FORMATS), default='ndjson')
+        parser.add_argument('--output', '-o', help="Файл для записи (по умолчанию stdout)")
+        parser.add_argument('--chunk-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        lookup = options['user']
+        try:
+            if lookup.isdigit():
+                user = User.objects.get(pk=int(lookup))
+            else:
+                user = User.objects.get(username=lookup)
+        except User.DoesNotExist:
+            raise CommandError(f"Пользователь {lookup} не найден")
+
+        chunks = iter_export(user, options['export_format'], chunk_size=options['chunk_size'])
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as out:
+                out.writelines(chunks)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
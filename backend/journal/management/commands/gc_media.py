@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from journal.storage import collect_garbage, import_legacy_media
+
+
+class Command(BaseCommand):
+    help = "Удаляет файлы хранилища по содержимому (cas/), на которые больше нет ссылок"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Только посчитать, ничего не удаляя")
+        parser.add_argument(
+            '--grace-hours', type=float, default=24,
+            help="Не трогать файлы моложе этого возраста (загрузки, ещё не сохранённые в БД)",
+        )
+        parser.add_argument(
+            '--import-legacy', action='store_true',
+            help="Сначала перенести в cas/ файлы, загруженные до хранилища по содержимому",
+        )
+
+    def handle(self, *args, **options):
+        if options['import_legacy'] and not options['dry_run']:
+            moved, updated = import_legacy_media()
+            self.stdout.write(f"Перенесено файлов: {moved}, обновлено записей: {updated}")
+
+        count, size = collect_garbage(options['grace_hours'] * 3600, dry_run=options['dry_run'])
+        verb = "Можно удалить" if options['dry_run'] else "Удалено"
+        self.stdout.write(self.style.SUCCESS(f"{verb} файлов: {count} ({size / 1024 / 1024:.1f} МБ)"))
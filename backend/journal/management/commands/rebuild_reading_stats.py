@@ -0,0 +1,35 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from journal.models import BookLog, ReadingStats
+from journal.stats import rebuild_stats
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает статистику чтения (ReadingStats) с нуля — для всех или указанных пользователей"
+
+    def add_arguments(self, parser):
+        parser.add_argument('usernames', nargs='*', help="Логины; без них — все пользователи")
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help="Сколько пользователей пересчитывать в одной транзакции",
+        )
+
+    def handle(self, *args, **options):
+        if options['usernames']:
+            users = get_user_model().objects.filter(username__in=options['usernames'])
+            user_ids = sorted(users.values_list('pk', flat=True))
+            if len(user_ids) != len(set(options['usernames'])):
+                raise CommandError("Не все пользователи найдены")
+        else:
+            # и владельцы записей, и те, у кого осталась устаревшая статистика
+            user_ids = sorted(
+                set(BookLog.objects.values_list('owner_id', flat=True).distinct())
+                | set(ReadingStats.objects.values_list('user_id', flat=True).distinct())
+            )
+
+        batch_size = options['batch_size']
+        rows = 0
+        for start in range(0, len(user_ids), batch_size):
+            rows += rebuild_stats(user_ids[start:start + batch_size])
+        self.stdout.write(self.style.SUCCESS(f"Пользователей: {len(user_ids)}, строк статистики: {rows}"))
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Max, Min
+
+from journal.models import BookLog, Quote
+from journal.search import update_search_vector
+
+MODELS = {
+    'booklog': BookLog,
+    'quote': Quote,
+}
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает search_vector у записей журнала и цитат (пачками по диапазону id)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', choices=sorted(MODELS), help="Только одна модель")
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        names = [options['model']] if options['model'] else sorted(MODELS)
+        batch_size = options['batch_size']
+
+        for name in names:
+            model = MODELS[name]
+            bounds = model.objects.aggregate(low=Min('pk'), high=Max('pk'))
+            if bounds['low'] is None:
+                self.stdout.write(f"{name}: пусто")
+                continue
+
+            updated = 0
+            for start in range(bounds['low'], bounds['high'] + 1, batch_size):
+                updated += update_search_vector(
+                    model.objects.filter(pk__gte=start, pk__lt=start + batch_size)
+                )
+            self.stdout.write(self.style.SUCCESS(f"{name}: обновлено {updated}"))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from journal.api.cache import invalidate_all
+from journal.ratings import drifted_books, repair_ratings
+
+
+class Command(BaseCommand):
+    help = "Сверяет сводку оценок книг (avg_score, ratings_count, score_histogram) с журналами и чинит расхождения"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Только показать количество разошедшихся книг, ничего не меняя",
+        )
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            drift = len(drifted_books())
+            self.stdout.write(f"Книг с расхождением сводки оценок: {drift}")
+            return
+
+        fixed = repair_ratings()
+        if fixed:
+            # сводка есть и в карточке книги, и во вложенных книгах автора/жанра
+            invalidate_all()
+        self.stdout.write(self.style.SUCCESS(f"Исправлено книг: {fixed}"))
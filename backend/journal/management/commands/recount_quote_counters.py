@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from journal.counters import drifted_quotes, repair_counters
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает Quote.like_count / Quote.share_count и чинит расхождения"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Только показать количество разошедшихся цитат, ничего не меняя",
+        )
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            drift = drifted_quotes().count()
+            self.stdout.write(f"Цитат с расхождением счётчиков: {drift}")
+            return
+
+        fixed = repair_counters()
+        self.stdout.write(self.style.SUCCESS(f"Исправлено цитат: {fixed}"))
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:12
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_counters(apps, schema_editor):
+    Quote = apps.get_model('journal', 'Quote')
+    Like = apps.get_model('journal', 'Like')
+    Share = apps.get_model('journal', 'Share')
+
+    def count_of(model):
+        return Coalesce(Subquery(
+            model.objects.filter(quote=OuterRef('pk'))
+            .order_by().values('quote').annotate(c=Count('*')).values('c')
+        ), 0)
+
+    Quote.objects.update(like_count=count_of(Like), share_count=count_of(Share))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0004_booklog_privat'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quote',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Количество лайков'),
+        ),
+        migrations.AddField(
+            model_name='quote',
+            name='share_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Количество репостов'),
+        ),
+        migrations.AddIndex(
+            model_name='quote',
+            index=models.Index(fields=['-like_count', '-id'], name='quote_like_count_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quote',
+            index=models.Index(fields=['-share_count', '-id'], name='quote_share_count_idx'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0005_quote_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='author',
+            index=models.Index(fields=['status', 'id'], name='author_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='author',
+            index=models.Index(condition=models.Q(('status', 0)), fields=['id'], name='author_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['status', 'id'], name='book_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(condition=models.Q(('status', 0)), fields=['id'], name='book_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['author', 'status'], name='book_author_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['genre', 'status'], name='book_genre_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booklog',
+            index=models.Index(fields=['privat', '-updated_at'], name='booklog_privat_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booklog',
+            index=models.Index(fields=['-updated_at'], name='booklog_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='genre',
+            index=models.Index(fields=['status', 'id'], name='genre_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='genre',
+            index=models.Index(condition=models.Q(('status', 0)), fields=['id'], name='genre_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quote',
+            index=models.Index(fields=['privat', 'id'], name='quote_privat_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:05
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_owner(apps, schema_editor):
+    # До появления поля владелец нигде не хранился; ближайший признак —
+    # пользователь, который завёл книгу (записи и книги ведут журналисты).
+    BookLog = apps.get_model('journal', 'BookLog')
+    Book = apps.get_model('journal', 'Book')
+    BookLog.objects.filter(owner__isnull=True).update(
+        owner=models.Subquery(
+            Book.objects.filter(pk=models.OuterRef('book_id')).values('created_by_id')[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0006_moderation_and_feed_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booklog',
+            name='owner',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='book_logs', to=settings.AUTH_USER_MODEL, verbose_name='Владелец'),
+        ),
+        migrations.RunPython(fill_owner, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='booklog',
+            name='owner',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='book_logs', to=settings.AUTH_USER_MODEL, verbose_name='Владелец'),
+        ),
+        migrations.AddIndex(
+            model_name='booklog',
+            index=models.Index(fields=['owner', '-updated_at'], name='booklog_owner_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:20
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.utils import timezone
+
+
+def fill_created_at(apps, schema_editor):
+    # Цитата появляется вместе с записью журнала или позже — дата записи
+    # ближайшая известная; цитатам без записи ставим время миграции.
+    Quote = apps.get_model('journal', 'Quote')
+    BookLog = apps.get_model('journal', 'BookLog')
+    Quote.objects.filter(created_at__isnull=True, book_log__isnull=False).update(
+        created_at=models.Subquery(
+            BookLog.objects.filter(pk=models.OuterRef('book_log_id')).values('created_at')[:1]
+        )
+    )
+    Quote.objects.filter(created_at__isnull=True).update(created_at=timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0009_trigram_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quote',
+            name='created_at',
+            field=models.DateTimeField(null=True, verbose_name='Дата создания'),
+        ),
+        migrations.RunPython(fill_created_at, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='quote',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, verbose_name='Дата создания'),
+        ),
+        migrations.AddIndex(
+            model_name='quote',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['created_at'], name='quote_created_brin_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quote',
+            index=models.Index(fields=['book', 'created_at'], name='quote_book_created_idx'),
+        ),
+        migrations.AlterField(
+            model_name='quote',
+            name='book',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='quotes', to='journal.book', verbose_name='Книга'),
+        ),
+    ]
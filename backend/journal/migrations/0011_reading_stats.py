@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:52
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_stats(apps, schema_editor):
+    # тот же расчёт вклада записей, что у rebuild_stats(), но на исторических моделях
+    from journal.stats import LOG_FIELDS, collect
+
+    BookLog = apps.get_model('journal', 'BookLog')
+    ReadingStats = apps.get_model('journal', 'ReadingStats')
+    deltas = collect(BookLog.objects.order_by().values(*LOG_FIELDS).iterator(chunk_size=2000))
+    ReadingStats.objects.bulk_create(
+        [
+            ReadingStats(user_id=user_id, dimension=dimension, key=key, **counters)
+            for (user_id, dimension, key), counters in deltas.items()
+        ],
+        batch_size=2000,
+    )
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0010_quote_created_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReadingStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('month', 'Месяц'), ('genre', 'Жанр'), ('author', 'Автор')], max_length=10, verbose_name='Разрез')),
+                ('key', models.IntegerField(verbose_name='Значение разреза')),
+                ('books', models.PositiveIntegerField(default=0, verbose_name='Прочитано книг')),
+                ('score_sum', models.PositiveIntegerField(default=0, verbose_name='Сумма оценок')),
+                ('symbols', models.PositiveBigIntegerField(default=0, verbose_name='Прочитано символов')),
+                ('timed_books', models.PositiveIntegerField(default=0, verbose_name='Книг с датами чтения')),
+                ('timed_symbols', models.PositiveBigIntegerField(default=0, verbose_name='Символов в книгах с датами')),
+                ('reading_days', models.PositiveIntegerField(default=0, verbose_name='Дней чтения')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reading_stats', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'dimension', 'key'), name='reading_stats_unique')],
+            },
+        ),
+        migrations.RunPython(fill_stats, migrations.RunPython.noop),
+    ]
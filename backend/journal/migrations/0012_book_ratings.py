@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:12
+
+import django.contrib.postgres.fields
+import journal.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_ratings(apps, schema_editor):
+    # один сгруппированный запрос по журналу; книги без оценок остаются с нулями
+    Book = apps.get_model('journal', 'Book')
+    BookLog = apps.get_model('journal', 'BookLog')
+    scores = range(1, 11)
+    rows = BookLog.objects.order_by().values('book_id').annotate(
+        ratings_count=models.Count('id'),
+        score_sum=models.Sum('score'),
+        **{f'score_{score}': models.Count('id', filter=models.Q(score=score)) for score in scores},
+    )
+    books = [
+        Book(
+            pk=row['book_id'],
+            ratings_count=row['ratings_count'],
+            score_sum=row['score_sum'],
+            avg_score=row['score_sum'] / row['ratings_count'],
+            score_histogram=[row[f'score_{score}'] for score in scores],
+        )
+        for row in rows
+    ]
+    Book.objects.bulk_update(books, ['ratings_count', 'score_sum', 'avg_score', 'score_histogram'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0011_reading_stats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='avg_score',
+            field=models.FloatField(default=0, verbose_name='Средняя оценка'),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='ratings_count',
+            field=models.IntegerField(default=0, verbose_name='Количество оценок'),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='score_histogram',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), default=journal.models.empty_histogram, size=10, verbose_name='Распределение оценок'),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='score_sum',
+            field=models.IntegerField(default=0, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(fill_ratings, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['-avg_score', '-id'], name='book_avg_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['-ratings_count', '-id'], name='book_ratings_count_idx'),
+        ),
+    ]
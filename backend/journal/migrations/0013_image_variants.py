@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0012_book_ratings'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='author',
+            name='photo_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Копии фотографии'),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='logo_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Копии обложки'),
+        ),
+    ]
@@ -1,3 +1,6 @@
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import BrinIndex, GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from BookLog import settings
@@ -17,6 +20,8 @@ class Author(models.Model):
   death = models.DateField(verbose_name="Дата смерти", null=True, blank=True)
   country = models.CharField(max_length=150, verbose_name="Страна", blank=True, null=True)
   photo = models.ImageField(verbose_name="Фотография", upload_to="author_photos/", blank=True, null=True)
+  # уменьшенные копии photo (jobs/images.py)
+  photo_variants = models.JSONField(default=dict, blank=True, editable=False, verbose_name="Копии фотографии")
   status = models.IntegerField(choices=ApprovalStatus.choices, verbose_name="Статус одобрения")
   biography = models.TextField(verbose_name="Биография", blank=True, null=True)
   created_by = models.ForeignKey(User, on_delete=models.CASCADE, verbose_name="Добавлено пользователем")
@@ -32,6 +37,16 @@ class Author(models.Model):
   def __str__(self):
     return f'{self.last_name} {self.first_name}'  # или любое поле, которое удобно показывать
 
+  class Meta:
+    indexes = [
+      models.Index(fields=['status', 'id'], name='author_status_idx'),
+      models.Index(fields=['id'], name='author_pending_idx', condition=models.Q(status=ApprovalStatus.PENDING)),
+      # автодополнение (journal/autocomplete.py), нужно расширение pg_trgm
+      GinIndex(fields=['last_name'], name='author_last_name_trgm_idx', opclasses=['gin_trgm_ops']),
+      GinIndex(fields=['first_name'], name='author_first_name_trgm_idx', opclasses=['gin_trgm_ops']),
+      GinIndex(fields=['patronymic'], name='author_patronymic_trgm_idx', opclasses=['gin_trgm_ops']),
+    ]
+
 
 class Genre(models.Model):
   title = models.CharField(max_length=200, verbose_name="Название")
@@ -41,26 +56,72 @@ class Genre(models.Model):
 
   def __str__(self):
     return self.title
+
+  class Meta:
+    indexes = [
+      models.Index(fields=['status', 'id'], name='genre_status_idx'),
+      models.Index(fields=['id'], name='genre_pending_idx', condition=models.Q(status=ApprovalStatus.PENDING)),
+      GinIndex(fields=['title'], name='genre_title_trgm_idx', opclasses=['gin_trgm_ops']),
+    ]
   
 class BookTypes(models.IntegerChoices):
   FICTION = 0, "Художественная"
   NON_FICTION = 1, "Нон-фикшн (не художественная)"
 
+# возможные оценки BookLog.score, score_histogram[score - 1] — сколько раз книгу так оценили
+SCORES = range(1, 11)
+
+def empty_histogram():
+  return [0] * len(SCORES)
+
+# сводка оценок (journal/ratings.py): меняется только UPDATE'ами через F()
+RATING_FIELDS = ['ratings_count', 'score_sum', 'avg_score', 'score_histogram']
+
 class Book(models.Model):
   title = models.CharField(max_length=200, verbose_name="Название")
   author = models.ForeignKey(Author, on_delete=models.CASCADE, verbose_name="Автор", related_name="books")
   genre = models.ForeignKey(Genre, on_delete=models.CASCADE, verbose_name="Жанр", related_name="books")
   logo = models.ImageField(verbose_name="Обложка", upload_to="book_logos/", blank=True, null=True)
+  # уменьшенные копии logo (jobs/images.py)
+  logo_variants = models.JSONField(default=dict, blank=True, editable=False, verbose_name="Копии обложки")
   symbols = models.IntegerField(verbose_name="Количество символов", null=True, blank=True)
   type = models.IntegerField(choices=BookTypes.choices, verbose_name="Тип")
   status = models.IntegerField(choices=ApprovalStatus.choices, verbose_name="Статус одобрения")
   created_by = models.ForeignKey(User, on_delete=models.CASCADE, verbose_name="Добавлено пользователем")
   description = models.CharField(max_length=200, verbose_name="Описание", null=True, blank=True)
+  ratings_count = models.IntegerField(default=0, verbose_name="Количество оценок")
+  score_sum = models.IntegerField(default=0, verbose_name="Сумма оценок")
+  # 0 — оценок нет (NULL при сортировке по убыванию оказался бы первым)
+  avg_score = models.FloatField(default=0, verbose_name="Средняя оценка")
+  score_histogram = ArrayField(models.IntegerField(), size=len(SCORES), default=empty_histogram, verbose_name="Распределение оценок")
 
   def __str__(self):
     return f'{self.title} - {self.author}'
 
+  def save(self, *args, **kwargs):
+    # обычное сохранение книги не перезаписывает сводку оценок:
+    # иначе затёрлись бы изменения, сделанные журналами после загрузки объекта
+    if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+      kwargs['update_fields'] = [
+        field.name for field in self._meta.concrete_fields
+        if not field.primary_key and field.name not in RATING_FIELDS
+      ]
+    super().save(*args, **kwargs)
+
+  class Meta:
+    indexes = [
+      models.Index(fields=['status', 'id'], name='book_status_idx'),
+      models.Index(fields=['id'], name='book_pending_idx', condition=models.Q(status=ApprovalStatus.PENDING)),
+      models.Index(fields=['author', 'status'], name='book_author_status_idx'),
+      models.Index(fields=['genre', 'status'], name='book_genre_status_idx'),
+      GinIndex(fields=['title'], name='book_title_trgm_idx', opclasses=['gin_trgm_ops']),
+      # ?ordering=-avg_score / -ratings_count
+      models.Index(fields=['-avg_score', '-id'], name='book_avg_score_idx'),
+      models.Index(fields=['-ratings_count', '-id'], name='book_ratings_count_idx'),
+    ]
+
 class BookLog(models.Model):
+  owner = models.ForeignKey(User, on_delete=models.CASCADE, verbose_name="Владелец", related_name="book_logs")
   book = models.ForeignKey(Book, on_delete=models.CASCADE, verbose_name="Книга", related_name="book_logs")
   start = models.DateField(verbose_name="Начало чтения", null=True, blank=True)
   end = models.DateField(verbose_name="Конец чтения", null=True, blank=True)
@@ -79,21 +140,52 @@ class BookLog(models.Model):
   created_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата создания")
   updated_at = models.DateTimeField(auto_now=True, verbose_name="Дата обновления")
   privat = models.BooleanField(default=False, verbose_name="Приватность")
+  # см. journal/search.py
+  search_vector = SearchVectorField(null=True, editable=False)
 
   def __str__(self):
     return f'{self.book} - {self.updated_at}'
 
+  class Meta:
+    indexes = [
+      models.Index(fields=['owner', '-updated_at'], name='booklog_owner_updated_idx'),
+      models.Index(fields=['privat', '-updated_at'], name='booklog_privat_updated_idx'),
+      models.Index(fields=['-updated_at'], name='booklog_updated_idx'),
+      GinIndex(fields=['search_vector'], name='booklog_search_idx'),
+    ]
+
 class Quote(models.Model):
-  book = models.ForeignKey(Book, on_delete=models.CASCADE, verbose_name="Книга", related_name="quotes")
+  # отдельный индекс по book не нужен: его заменяет quote_book_created_idx (book, created_at)
+  book = models.ForeignKey(Book, on_delete=models.CASCADE, verbose_name="Книга", related_name="quotes", db_index=False)
   note = models.TextField(verbose_name="Цитата")
   likes = models.ManyToManyField(settings.AUTH_USER_MODEL, through='Like', related_name='liked_quotes', verbose_name="Понравилось")
   shared = models.ManyToManyField(settings.AUTH_USER_MODEL, through='Share', related_name='shared_quotes', verbose_name="Поделились")
   privat = models.BooleanField(default=False, verbose_name="Приватность")
   book_log = models.ForeignKey(BookLog, on_delete=models.CASCADE, verbose_name="Запись читателького журнала", null=True, blank=True, related_name="quotes")
+  # Денормализованные счётчики: обновляются в LikeViewSet/ShareViewSet через F(),
+  # расхождения чинит manage.py recount_quote_counters
+  like_count = models.PositiveIntegerField(default=0, verbose_name="Количество лайков")
+  share_count = models.PositiveIntegerField(default=0, verbose_name="Количество репостов")
+  created_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата создания")
+  # см. journal/search.py
+  search_vector = SearchVectorField(null=True, editable=False)
 
   def __str__(self):
     return f'{self.note}'
 
+  class Meta:
+    indexes = [
+      models.Index(fields=['-like_count', '-id'], name='quote_like_count_idx'),
+      models.Index(fields=['-share_count', '-id'], name='quote_share_count_idx'),
+      models.Index(fields=['privat', 'id'], name='quote_privat_idx'),
+      GinIndex(fields=['search_vector'], name='quote_search_idx'),
+      # цитаты в основном дописываются, created_at растёт вместе с физическим порядком строк:
+      # BRIN на весь диапазон дат занимает считаные страницы
+      BrinIndex(fields=['created_at'], name='quote_created_brin_idx'),
+      # «цитаты за период по книге / автору» — диапазон внутри book_id
+      models.Index(fields=['book', 'created_at'], name='quote_book_created_idx'),
+    ]
+
 class Like(models.Model):
   user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, verbose_name="Пользователь", related_name="likes")
   quote = models.ForeignKey(Quote, on_delete=models.CASCADE, verbose_name="Цитата", related_name="like_records")
@@ -118,3 +210,35 @@ class Share(models.Model):
   class Meta:
     ordering = ['-moment']
     indexes = [models.Index(fields=['moment'])]
+
+
+class ReadingStats(models.Model):
+  """
+  Предрасчитанная статистика чтения (journal/stats.py): по строке на пользователя
+  и значение разреза — месяц (key = ГГГГММ), жанр или автор (key = id).
+  Обновляется сигналами при изменении BookLog, полный пересчёт — rebuild_reading_stats.
+  """
+
+  class Dimension(models.TextChoices):
+    MONTH = 'month', 'Месяц'
+    GENRE = 'genre', 'Жанр'
+    AUTHOR = 'author', 'Автор'
+
+  user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, verbose_name="Пользователь", related_name="reading_stats")
+  dimension = models.CharField(max_length=10, choices=Dimension.choices, verbose_name="Разрез")
+  key = models.IntegerField(verbose_name="Значение разреза")
+  books = models.PositiveIntegerField(default=0, verbose_name="Прочитано книг")
+  score_sum = models.PositiveIntegerField(default=0, verbose_name="Сумма оценок")
+  symbols = models.PositiveBigIntegerField(default=0, verbose_name="Прочитано символов")
+  # книги, у которых известны и начало, и конец чтения — для скорости
+  timed_books = models.PositiveIntegerField(default=0, verbose_name="Книг с датами чтения")
+  timed_symbols = models.PositiveBigIntegerField(default=0, verbose_name="Символов в книгах с датами")
+  reading_days = models.PositiveIntegerField(default=0, verbose_name="Дней чтения")
+
+  def __str__(self):
+    return f'{self.user} - {self.dimension} {self.key}'
+
+  class Meta:
+    constraints = [
+      models.UniqueConstraint(fields=['user', 'dimension', 'key'], name='reading_stats_unique'),
+    ]
@@ -0,0 +1,137 @@
+# journal/ratings.py
+"""
+Сводка оценок книги по всем читателям: Book.ratings_count, score_sum,
+avg_score и score_histogram (score_histogram[i] — сколько записей журнала
+с оценкой i + 1).
+
+Как и счётчики цитат (journal/counters.py), поля денормализованы: сигналы BookLog
+(journal/signals.py) сдвигают их одним UPDATE через F() на каждую затронутую
+книгу, и список книг сортируется по avg_score по индексу, без AVG() по журналу.
+Расхождения находит и чинит manage.py recount_book_ratings.
+"""
+import math
+from collections import Counter, defaultdict
+
+from django.contrib.postgres.fields import ArrayField
+from django.db.models import Count, F, FloatField, Func, IntegerField, Q, Sum, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
+
+from journal.models import RATING_FIELDS, SCORES, Book, BookLog, empty_histogram
+
+
+class AddArrays(Func):
+    """
+    Поэлементная сумма двух int[] одной длины — прибавляет гистограмму-дельту
+    прямо в UPDATE, без чтения строки.
+    """
+    template = 'ARRAY(SELECT t.a + t.b FROM unnest(%(expressions)s) WITH ORDINALITY AS t(a, b, i) ORDER BY t.i)'
+    output_field = ArrayField(IntegerField())
+
+
+def rating_deltas(rows, sign=1):
+    """
+    {book_id: Counter(ratings_count=, score_sum=, <оценка>=)} — вклад записей
+    журнала (строки journal.stats.log_rows) в сводки их книг.
+    """
+    deltas = defaultdict(Counter)
+    for row in rows:
+        deltas[row['book_id']].update({
+            'ratings_count': sign,
+            'score_sum': sign * row['score'],
+            row['score']: sign,
+        })
+    return deltas
+
+
+def apply_rating_deltas(*parts):
+    """
+    Складывает вклады (например, «минус старая оценка» и «плюс новая») и сдвигает
+    сводки книг. Возвращает id книг, у которых сводка изменилась.
+    """
+    deltas = defaultdict(Counter)
+    for part in parts:
+        for book_id, counters in part.items():
+            deltas[book_id].update(counters)
+
+    changed = []
+    for book_id, delta in deltas.items():
+        count, total = delta['ratings_count'], delta['score_sum']
+        histogram = [delta[score] for score in SCORES]
+        if not (count or total or any(histogram)):
+            continue
+        # в правой части SET PostgreSQL видит значения строки до UPDATE
+        changes = {
+            'ratings_count': F('ratings_count') + count,
+            'score_sum': F('score_sum') + total,
+            'avg_score': Coalesce(
+                Cast(F('score_sum') + total, FloatField()) / NullIf(F('ratings_count') + count, 0),
+                0.0,
+                output_field=FloatField(),
+            ),
+        }
+        if any(histogram):
+            changes['score_histogram'] = AddArrays(
+                F('score_histogram'), Cast(Value(histogram), ArrayField(IntegerField())),
+            )
+        Book.objects.filter(pk=book_id).update(**changes)
+        changed.append(book_id)
+    return changed
+
+
+def summary(ratings_count=0, score_sum=0, histogram=None):
+    return {
+        'ratings_count': ratings_count,
+        'score_sum': score_sum,
+        'avg_score': score_sum / ratings_count if ratings_count else 0.0,
+        'score_histogram': histogram or empty_histogram(),
+    }
+
+
+def actual_ratings():
+    """
+    {book_id: сводка} по реальным записям журнала — один сгруппированный запрос.
+    """
+    rows = BookLog.objects.order_by().values('book_id').annotate(
+        ratings_count=Count('id'),
+        score_sum=Sum('score'),
+        **{f'score_{score}': Count('id', filter=Q(score=score)) for score in SCORES},
+    )
+    return {
+        row['book_id']: summary(
+            row['ratings_count'], row['score_sum'], [row[f'score_{score}'] for score in SCORES],
+        )
+        for row in rows
+    }
+
+
+def _matches(stored, actual):
+    return all(
+        math.isclose(stored[name], actual[name]) if name == 'avg_score' else stored[name] == actual[name]
+        for name in RATING_FIELDS
+    )
+
+
+def drifted_books():
+    """
+    {book_id: правильная сводка} для книг, где сохранённая сводка разошлась с журналом.
+    """
+    actual = actual_ratings()
+    drifted = {}
+    for stored in Book.objects.values('id', *RATING_FIELDS).iterator(chunk_size=2000):
+        expected = actual.get(stored['id']) or summary()
+        if not _matches(stored, expected):
+            drifted[stored['id']] = expected
+    return drifted
+
+
+def repair_ratings(batch_size=1000):
+    """
+    Перезаписывает сводку разошедшихся книг. Возвращает количество исправленных.
+    """
+    drifted = drifted_books()
+    Book.objects.bulk_update(
+        [Book(pk=book_id, **values) for book_id, values in drifted.items()],
+        RATING_FIELDS,
+        batch_size=batch_size,
+    )
+    return len(drifted)
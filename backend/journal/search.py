@@ -0,0 +1,78 @@
+# journal/search.py
+"""
+Полнотекстовый поиск по BookLog и Quote (PostgreSQL tsvector + GIN).
+
+search_vector собирается из полей с весами в двух конфигурациях — russian и english,
+так что находятся и русские словоформы, и английские цитаты/термины.
+Колонка обновляется одним UPDATE после сохранения (journal/signals.py),
+для уже существующих строк — manage.py rebuild_search_index.
+"""
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+from django.db.models import F, FloatField, TextField, Value
+from django.db.models.functions import Cast, Coalesce, Concat
+
+from journal.models import BookLog, Quote
+
+SEARCH_CONFIGS = ('russian', 'english')
+
+# модель -> {вес: [поля]}
+SEARCH_FIELDS = {
+    BookLog: {
+        'A': ['topic', 'three_sentences'],
+        'B': ['ideas', 'key_events', 'most_important_event', 'result'],
+        'C': ['impressions', 'new_knowledge', 'transformed_me', 'heroes', 'begin'],
+    },
+    Quote: {
+        'A': ['note'],
+    },
+}
+
+
+def search_vector_expression(model):
+    vector = None
+    for config in SEARCH_CONFIGS:
+        for weight, fields in SEARCH_FIELDS[model].items():
+            part = SearchVector(*fields, config=config, weight=weight)
+            vector = part if vector is None else vector + part
+    return vector
+
+
+def update_search_vector(queryset):
+    """
+    Пересчитывает search_vector для строк queryset одним UPDATE.
+    """
+    return queryset.update(search_vector=search_vector_expression(queryset.model))
+
+
+def build_search_query(text):
+    query = None
+    for config in SEARCH_CONFIGS:
+        part = SearchQuery(text, config=config, search_type='websearch')
+        query = part if query is None else query | part
+    return query
+
+
+def searched(queryset, text):
+    """
+    Фильтр по индексу + ранг и подсвеченный фрагмент текста.
+    """
+    model = queryset.model
+    query = build_search_query(text)
+    fields = [field for group in SEARCH_FIELDS[model].values() for field in group]
+    document = Concat(
+        *[
+            part
+            for field in fields
+            for part in (Coalesce(F(field), Value(''), output_field=TextField()), Value(' \n '))
+        ],
+        output_field=TextField(),
+    )
+    return queryset.filter(search_vector=query).annotate(
+        # ts_rank отдаёт real; double precision нужен, чтобы значение без потерь
+        # прошло через курсор пагинации и обратно в WHERE search_rank < ...
+        search_rank=Cast(SearchRank(F('search_vector'), query), FloatField()),
+        search_snippet=SearchHeadline(
+            document, query, config=SEARCH_CONFIGS[0],
+            start_sel='<b>', stop_sel='</b>', max_fragments=2,
+        ),
+    )
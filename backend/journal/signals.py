@@ -0,0 +1,87 @@
+# journal/signals.py
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import Signal, receiver
+
+from jobs.images import variants_saved
+from journal.api.cache import invalidate_catalogue
+from journal.models import Author, Book, BookLog, Quote
+from journal.ratings import apply_rating_deltas, rating_deltas
+from journal.search import update_search_vector
+from journal.stats import apply_deltas, collect, instance_row, log_rows, rebuild_stats
+
+# bulk_create не шлёт post_save — BulkCreateMixin отправляет этот сигнал
+# для каждой записанной пачки: sender — модель, objs — созданные объекты с pk
+bulk_created = Signal()
+
+
+@receiver(post_save, sender=BookLog)
+@receiver(post_save, sender=Quote)
+def refresh_search_vector(sender, instance, **kwargs):
+    update_search_vector(sender.objects.filter(pk=instance.pk))
+
+
+@receiver(bulk_created, sender=BookLog)
+@receiver(bulk_created, sender=Quote)
+def refresh_search_vector_bulk(sender, objs, **kwargs):
+    update_search_vector(sender.objects.filter(pk__in=[obj.pk for obj in objs]))
+
+
+# ——— статистика чтения (journal/stats.py) и сводка оценок книг (journal/ratings.py) ———
+# вклад записи до изменения читаем из БД перед save/delete, после — вычитаем старый и прибавляем новый
+
+def apply_log_changes(before, after):
+    apply_deltas(collect(before, sign=-1), collect(after))
+    books = apply_rating_deltas(rating_deltas(before, sign=-1), rating_deltas(after))
+    # сводка оценок входит в ответы каталога книг
+    for book_id in books:
+        invalidate_catalogue('book', book_id)
+
+
+@receiver(pre_save, sender=BookLog)
+@receiver(pre_delete, sender=BookLog)
+def remember_stats_contribution(sender, instance, raw=False, **kwargs):
+    instance._stats_before = [] if raw or instance.pk is None else log_rows(BookLog.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=BookLog)
+def update_reading_stats(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    apply_log_changes(getattr(instance, '_stats_before', []), log_rows(BookLog.objects.filter(pk=instance.pk)))
+
+
+@receiver(post_delete, sender=BookLog)
+def subtract_reading_stats(sender, instance, **kwargs):
+    apply_log_changes(getattr(instance, '_stats_before', []), [])
+
+
+@receiver(bulk_created, sender=BookLog)
+def update_reading_stats_bulk(sender, objs, **kwargs):
+    apply_log_changes([], [instance_row(obj) for obj in objs])
+
+
+BOOK_STATS_FIELDS = ['genre_id', 'author_id', 'symbols']
+
+
+@receiver(pre_save, sender=Book)
+def remember_book_stats_fields(sender, instance, raw=False, **kwargs):
+    instance._stats_before = None
+    if not raw and instance.pk is not None:
+        instance._stats_before = Book.objects.filter(pk=instance.pk).values(*BOOK_STATS_FIELDS).first()
+
+
+@receiver(post_save, sender=Book)
+def rebuild_stats_for_book(sender, instance, created, raw=False, **kwargs):
+    # смена жанра/автора/объёма книги — редкость (модерация), пересчитываем её читателей целиком
+    before = getattr(instance, '_stats_before', None)
+    if created or raw or before is None:
+        return
+    if any(before[name] != getattr(instance, name) for name in BOOK_STATS_FIELDS):
+        rebuild_stats(BookLog.objects.filter(book=instance).values_list('owner_id', flat=True).distinct())
+
+
+# копии обложек и фото (jobs/images.py) пишутся через update() — кэш каталога сбрасываем сами
+@receiver(variants_saved, sender=Book)
+@receiver(variants_saved, sender=Author)
+def invalidate_catalogue_images(sender, pk, **kwargs):
+    invalidate_catalogue(sender._meta.model_name, pk)
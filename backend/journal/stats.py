@@ -0,0 +1,220 @@
+# journal/stats.py
+"""
+Статистика чтения пользователя из предрасчитанной таблицы ReadingStats.
+
+Каждая запись журнала вносит одинаковый вклад (книга, оценка, символы, дни чтения)
+в три строки: своего месяца, жанра и автора книги. Сигналы (journal/signals.py)
+прибавляют/вычитают вклад при сохранении и удалении, так что /stats/ читает
+десятки строк независимо от размера журнала. Полный пересчёт — rebuild_stats().
+"""
+from collections import Counter, defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from journal.models import Author, BookLog, Genre, ReadingStats
+
+Dimension = ReadingStats.Dimension
+
+# что нужно знать о записи журнала, чтобы посчитать её вклад
+# (book_id — для сводки оценок книги, journal/ratings.py)
+LOG_FIELDS = [
+    'owner_id', 'book_id', 'score', 'start', 'end', 'created_at',
+    'book__genre_id', 'book__author_id', 'book__symbols',
+]
+COUNTERS = ['books', 'score_sum', 'symbols', 'timed_books', 'timed_symbols', 'reading_days']
+
+
+def log_rows(queryset):
+    return list(queryset.values(*LOG_FIELDS))
+
+
+def instance_row(log):
+    """
+    То же, что log_rows, но из объекта в памяти (для bulk-импорта: книги
+    уже загружены при валидации, значения приведены сериализатором).
+    """
+    return {
+        'owner_id': log.owner_id, 'book_id': log.book_id, 'score': log.score, 'start': log.start, 'end': log.end,
+        'created_at': log.created_at, 'book__genre_id': log.book.genre_id,
+        'book__author_id': log.book.author_id, 'book__symbols': log.book.symbols,
+    }
+
+
+def month_key(row):
+    # месяц, когда книга дочитана; если дат нет — когда заведена запись
+    day = row['end'] or row['start'] or timezone.localdate(row['created_at'])
+    return day.year * 100 + day.month
+
+
+def contributions(row):
+    """
+    [((user_id, dimension, key), Counter), ...] — вклад одной записи журнала.
+    """
+    symbols = row['book__symbols'] or 0
+    counters = Counter(books=1, score_sum=row['score'], symbols=symbols)
+    if row['start'] and row['end'] and row['end'] >= row['start']:
+        counters.update(
+            timed_books=1,
+            timed_symbols=symbols,
+            reading_days=(row['end'] - row['start']).days + 1,
+        )
+    user_id = row['owner_id']
+    return [
+        ((user_id, Dimension.MONTH, month_key(row)), counters),
+        ((user_id, Dimension.GENRE, row['book__genre_id']), counters),
+        ((user_id, Dimension.AUTHOR, row['book__author_id']), counters),
+    ]
+
+
+def collect(rows, sign=1):
+    deltas = defaultdict(Counter)
+    for row in rows:
+        for key, counters in contributions(row):
+            for name, value in counters.items():
+                deltas[key][name] += sign * value
+    return deltas
+
+
+def apply_deltas(*parts):
+    """
+    Складывает вклады (например, «минус старое состояние» и «плюс новое»)
+    и применяет ненулевые разницы к ReadingStats: существующие строки — UPDATE
+    через F(), новые — одним bulk_create. Запросов столько, сколько затронуто
+    существующих строк, а не записей журнала.
+    """
+    deltas = defaultdict(Counter)
+    for part in parts:
+        for key, counters in part.items():
+            deltas[key].update(counters)
+    changes = {key: {name: value for name, value in counters.items() if value} for key, counters in deltas.items()}
+    changes = {key: values for key, values in changes.items() if values}
+    if not changes:
+        return
+
+    # обычно уже внутри транзакции сохранения — отдельная точка сохранения не нужна
+    with transaction.atomic(savepoint=False):
+        existing = set(
+            ReadingStats.objects.filter(
+                user_id__in={key[0] for key in changes},
+                dimension__in={key[1] for key in changes},
+                key__in={key[2] for key in changes},
+            ).values_list('user_id', 'dimension', 'key')
+        )
+        for key in existing & changes.keys():
+            _rows(key).update(**_increments(changes[key]))
+        if any(changes[key].get('books', 0) < 0 for key in existing & changes.keys()):
+            ReadingStats.objects.filter(user_id__in={key[0] for key in changes}, books=0).delete()
+
+        # вычитать из отсутствующей строки нечего (удалена вместе с пользователем
+        # или статистика ещё не строилась) — поправит rebuild_stats()
+        new = [key for key in changes.keys() - existing if changes[key].get('books', 0) > 0]
+        if not new:
+            return
+        try:
+            with transaction.atomic():
+                ReadingStats.objects.bulk_create([
+                    ReadingStats(user_id=user_id, dimension=dimension, key=value, **changes[(user_id, dimension, value)])
+                    for user_id, dimension, value in new
+                ])
+        except IntegrityError:
+            # часть строк успел создать параллельный запрос — по одной
+            for key in new:
+                _upsert(key, changes[key])
+
+
+def _rows(key):
+    user_id, dimension, value = key
+    return ReadingStats.objects.filter(user_id=user_id, dimension=dimension, key=value)
+
+
+def _increments(changes):
+    return {name: F(name) + value for name, value in changes.items()}
+
+
+def _upsert(key, changes):
+    if _rows(key).update(**_increments(changes)):
+        return
+    user_id, dimension, value = key
+    try:
+        with transaction.atomic():
+            ReadingStats.objects.create(user_id=user_id, dimension=dimension, key=value, **changes)
+    except IntegrityError:
+        _rows(key).update(**_increments(changes))
+
+
+def rebuild_stats(user_ids=None, chunk_size=2000):
+    """
+    Пересчитывает ReadingStats с нуля — для всех или для перечисленных пользователей.
+    """
+    logs = BookLog.objects.order_by()
+    stats = ReadingStats.objects.all()
+    if user_ids is not None:
+        user_ids = list(user_ids)
+        logs = logs.filter(owner_id__in=user_ids)
+        stats = stats.filter(user_id__in=user_ids)
+
+    deltas = collect(logs.values(*LOG_FIELDS).iterator(chunk_size=chunk_size))
+    with transaction.atomic():
+        stats.delete()
+        ReadingStats.objects.bulk_create(
+            [
+                ReadingStats(user_id=user_id, dimension=dimension, key=key, **counters)
+                for (user_id, dimension, key), counters in deltas.items()
+            ],
+            batch_size=chunk_size,
+        )
+    return len(deltas)
+
+
+def _summary(row):
+    data = {
+        'books': row.books,
+        'avg_score': round(row.score_sum / row.books, 2),
+        'symbols': row.symbols,
+        'avg_days': None,
+        'symbols_per_day': None,
+    }
+    if row.timed_books:
+        data['avg_days'] = round(row.reading_days / row.timed_books, 1)
+        data['symbols_per_day'] = round(row.timed_symbols / row.reading_days)
+    return data
+
+
+def _by_books(row):
+    return -row.books, row.key
+
+
+def user_stats(user):
+    """
+    Данные для /stats/: итоги, помесячно, по жанрам и по авторам.
+    """
+    rows = list(ReadingStats.objects.filter(user=user))
+    by_dimension = defaultdict(list)
+    for row in rows:
+        by_dimension[row.dimension].append(row)
+
+    months = sorted(by_dimension[Dimension.MONTH], key=lambda row: row.key)
+    total = ReadingStats(**{name: sum(getattr(row, name) for row in months) for name in COUNTERS})
+
+    genres = Genre.objects.only('title').in_bulk([row.key for row in by_dimension[Dimension.GENRE]])
+    authors = Author.objects.only('first_name', 'last_name').in_bulk(
+        [row.key for row in by_dimension[Dimension.AUTHOR]]
+    )
+
+    return {
+        'total': _summary(total) if total.books else None,
+        'months': [
+            {'month': f'{row.key // 100:04d}-{row.key % 100:02d}', **_summary(row)}
+            for row in months
+        ],
+        'genres': [
+            {'id': row.key, 'title': str(genres.get(row.key, '')), **_summary(row)}
+            for row in sorted(by_dimension[Dimension.GENRE], key=_by_books)
+        ],
+        'authors': [
+            {'id': row.key, 'name': str(authors.get(row.key, '')), **_summary(row)}
+            for row in sorted(by_dimension[Dimension.AUTHOR], key=_by_books)
+        ],
+    }
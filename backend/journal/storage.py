@@ -0,0 +1,200 @@
+# journal/storage.py
+"""
+Хранилище медиа по содержимому (STORAGES['default']).
+
+Загруженный файл сохраняется под SHA-256 своего содержимого:
+
+  book_logos/cover.png -> cas/3a/7b/3a7b…e1.png
+
+Одинаковые обложки и фото, загруженные разными пользователями, лежат на диске
+один раз, а имя файла никогда не меняет смысл — его можно кэшировать навсегда
+(journal.views.serve_blob отдаёт Cache-Control: immutable).
+
+Один файл может использоваться многими записями, поэтому delete() такие файлы
+не трогает: неиспользуемые удаляет сборщик мусора (collect_garbage, manage.py
+gc_media), который считает ссылки на каждый файл по всем FileField и копиям
+картинок (jobs/images.py).
+"""
+import hashlib
+import os
+import posixpath
+import time
+from collections import Counter
+
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db.models import FileField, Q, TextField
+from django.db.models.functions import Cast
+
+BLOB_PREFIX = 'cas'
+
+
+def is_blob(name):
+    return bool(name) and name.startswith(f'{BLOB_PREFIX}/')
+
+
+class ContentAddressedStorage(FileSystemStorage):
+
+    def __init__(self, *args, **kwargs):
+        # файл с тем же именем — это тот же файл; гонка двух одинаковых загрузок безопасна
+        kwargs.setdefault('allow_overwrite', True)
+        super().__init__(*args, **kwargs)
+
+    def blob_name(self, name, content):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        digest = digest.hexdigest()
+        ext = os.path.splitext(name)[1].lower()
+        return posixpath.join(BLOB_PREFIX, digest[:2], digest[2:4], digest + ext)
+
+    def get_available_name(self, name, max_length=None):
+        # итоговое имя определяет содержимое (_save), подбирать свободное не нужно
+        return name
+
+    def _save(self, name, content):
+        name = self.blob_name(name, content)
+        if self.exists(name):
+            # повторная загрузка — для сборщика мусора файл снова свежий
+            # (иначе старый блоб без ссылок он мог бы удалить до коммита новой записи)
+            os.utime(self.path(name))
+            return name
+        content.seek(0)
+        return super()._save(name, content)
+
+    def delete(self, name):
+        if is_blob(name):
+            return
+        super().delete(name)
+
+    def delete_blob(self, name):
+        super().delete(name)
+
+
+def media_fields():
+    """
+    [(модель, FileField-поля, JSON-поля с путями копий картинок), ...]
+    """
+    from jobs.images import IMAGE_FIELDS, variants_field
+
+    variants = {}
+    for label, field in IMAGE_FIELDS:
+        variants.setdefault(apps.get_model(label), []).append(variants_field(field))
+    result = []
+    for model in apps.get_models():
+        files = [field.name for field in model._meta.concrete_fields if isinstance(field, FileField)]
+        if files or model in variants:
+            result.append((model, files, variants.get(model, [])))
+    return result
+
+
+def _variant_names(value):
+    for formats in (value or {}).values():
+        yield from formats.values()
+
+
+def blob_references():
+    """
+    Counter {имя файла в хранилище: сколько раз на него ссылаются}.
+    """
+    counts = Counter()
+    for model, files, variants in media_fields():
+        for row in model._default_manager.values_list(*files, *variants).iterator(chunk_size=2000):
+            counts.update(name for name in row[:len(files)] if is_blob(name))
+            for value in row[len(files):]:
+                counts.update(name for name in _variant_names(value) if is_blob(name))
+    return counts
+
+
+def is_referenced(name):
+    """
+    Ссылается ли сейчас хоть одна запись на файл (точечная проверка перед удалением).
+    """
+    # копии картинок лежат в JSON: ищем имя как строку JSON в его тексте
+    quoted = f'"{name}"'
+    for model, files, variants in media_fields():
+        condition = Q()
+        for field in files:
+            condition |= Q(**{field: name})
+        for field in variants:
+            condition |= Q(**{f'{field}_text__contains': quoted})
+        queryset = model._default_manager.annotate(**{
+            f'{field}_text': Cast(field, TextField()) for field in variants
+        })
+        if queryset.filter(condition).exists():
+            return True
+    return False
+
+
+def stored_blobs(storage=default_storage):
+    root = storage.path(BLOB_PREFIX)
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(directory, filename)
+            yield posixpath.join(BLOB_PREFIX, os.path.relpath(path, root).replace(os.sep, '/')), path
+
+
+def collect_garbage(grace_seconds=24 * 3600, dry_run=False, storage=default_storage):
+    """
+    Удаляет файлы без ссылок. Свежие (моложе grace_seconds) не трогает: запись,
+    которая на них сошлётся, может быть ещё не закоммичена или ждать копий в очереди.
+    Снимок ссылок за время обхода устаревает, поэтому прямо перед удалением
+    возраст файла и ссылки на него проверяются ещё раз.
+    Возвращает (количество, байт).
+    """
+    references = blob_references()
+    deadline = time.time() - grace_seconds
+    count = size = 0
+    for name, path in stored_blobs(storage):
+        if references[name]:
+            continue
+        stat = os.stat(path)
+        if stat.st_mtime > deadline:
+            continue
+        if not dry_run:
+            if os.stat(path).st_mtime > deadline or is_referenced(name):
+                continue
+            storage.delete_blob(name)
+        count += 1
+        size += stat.st_size
+    return count, size
+
+
+def import_legacy_media(storage=default_storage):
+    """
+    Переносит файлы, загруженные до хранилища по содержимому, в cas/ и
+    переписывает ссылки на них. Возвращает (перенесено файлов, обновлено записей).
+    """
+    moved = {}
+
+    def to_blob(name):
+        if not name or is_blob(name):
+            return name
+        if name not in moved:
+            if storage.exists(name):
+                with storage.open(name) as file:
+                    moved[name] = storage.save(name, file)
+            else:
+                moved[name] = name
+        return moved[name]
+
+    updated = 0
+    for model, files, variants in media_fields():
+        for row in model._default_manager.values('pk', *files, *variants).iterator(chunk_size=2000):
+            changes = {field: to_blob(row[field]) for field in files if to_blob(row[field]) != row[field]}
+            for field in variants:
+                value = {
+                    size: {ext: to_blob(name) for ext, name in formats.items()}
+                    for size, formats in (row[field] or {}).items()
+                }
+                if value != (row[field] or {}):
+                    changes[field] = value
+            if changes:
+                # update(): без сигналов — это не новая загрузка, копии пересоздавать не нужно
+                model._default_manager.filter(pk=row['pk']).update(**changes)
+                updated += 1
+
+    for name, blob in moved.items():
+        if blob != name:
+            storage.delete(name)
+    return sum(blob != name for name, blob in moved.items()), updated
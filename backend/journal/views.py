@@ -1,3 +1,18 @@
-from django.shortcuts import render
+from django.conf import settings
+from django.views.static import serve
 
-# Create your views here.
+from journal.storage import BLOB_PREFIX
+
+# имя файла в cas/ — хэш содержимого, по одному адресу всегда одни и те же байты
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+def serve_blob(request, path):
+    """
+    Файл из хранилища по содержимому (journal/storage.py) с вечным кэшем
+    для браузеров и CDN. Только при DEBUG: в проде /media/cas/ отдаёт nginx
+    с тем же заголовком (nginx/booklog.conf).
+    """
+    response = serve(request, f'{BLOB_PREFIX}/{path}', document_root=settings.MEDIA_ROOT)
+    response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    return response
@@ -1,12 +1,30 @@
 # tests/conftest.py
 import pytest
+from django.core.cache import cache
 from rest_framework.test import APIClient
 from users.models import User, UserTypes
 import pytest
 
+from authentication.token_cache import verified_tokens
 from tests.factories import AuthorFactory, UserFactory  # <— OK, 'tests' лежит в корне
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # кэш каталога живёт в locmem между тестами, а БД откатывается — чистим
+    cache.clear()
+    verified_tokens.clear()
+    yield
+    cache.clear()
+    verified_tokens.clear()
+
+
+@pytest.fixture(autouse=True)
+def fast_password_hasher(settings):
+    # PBKDF2 с сотнями тысяч итераций — секунды на каждую сотню UserFactory
+    settings.PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
 @pytest.fixture
 def author(db):
     return AuthorFactory()
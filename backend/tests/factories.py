@@ -64,6 +64,7 @@ class BookLogFactory(DjangoModelFactory):
     class Meta:
         model = BookLog
 
+    owner = factory.SubFactory(UserFactory)
     book = factory.SubFactory(BookFactory)
     start = Faker("date")
     end = Faker("date")
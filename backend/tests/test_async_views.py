@@ -0,0 +1,61 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from journal.api.cache import invalidate_catalogue
+from tests.factories import BookFactory, BookLogFactory, QuoteFactory
+
+
+@pytest.mark.django_db
+class TestAsyncViews:
+
+    def test_keyset_pages_cover_all_rows(self, client):
+        books = BookFactory.create_batch(5)
+
+        response = client.get(reverse('journal:async-books'), {'page_size': 2})
+        seen = [book['id'] for book in response.json()['results']]
+        while response.json()['next']:
+            response = client.get(response.json()['next'])
+            seen += [book['id'] for book in response.json()['results']]
+
+        assert seen == sorted((book.pk for book in books), reverse=True)
+
+    def test_quotes_are_public_only(self, client):
+        public = QuoteFactory(privat=False)
+        QuoteFactory(privat=True)
+
+        data = client.get(reverse('journal:async-quotes')).json()
+
+        assert [quote['id'] for quote in data['results']] == [public.pk]
+        assert data['results'][0]['liked_by_me'] is False
+
+    def test_private_log_of_public_quote_is_hidden(self, client):
+        book_log = BookLogFactory(privat=True, topic='секретная тема')
+        quote = QuoteFactory(privat=False, book_log=book_log, book=book_log.book)
+
+        data = client.get(reverse('journal:async-quotes')).json()
+
+        assert [item['id'] for item in data['results']] == [quote.pk]
+        assert data['results'][0]['book_log'] is None
+        assert 'секретная' not in str(data)
+
+    def test_catalogue_is_cached_until_invalidated(self, client):
+        book = BookFactory()
+        url = reverse('journal:async-books')
+
+        assert client.get(url)['X-Cache'] == 'MISS'
+        assert client.get(url)['X-Cache'] == 'HIT'
+        invalidate_catalogue('book', book.pk)
+        assert client.get(url)['X-Cache'] == 'MISS'
+
+    def test_matches_sync_serialization(self, client):
+        book = BookFactory()
+
+        async_book = client.get(reverse('journal:async-books')).json()['results'][0]
+        sync_book = client.get(reverse('journal:books-detail', args=[book.pk])).json()
+
+        assert async_book == sync_book
+
+    def test_bad_param_is_rejected(self, client):
+        response = client.get(reverse('journal:async-books'), {'before': 'x'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,61 @@
+import pytest
+from django.urls import reverse
+
+from journal.models import ApprovalStatus
+from tests.factories import AuthorFactory, BookFactory, GenreFactory
+
+
+@pytest.mark.django_db
+class TestAutocomplete:
+
+    url = reverse('journal:autocomplete-list')
+
+    def test_authors_by_prefix_and_typo(self, api_client):
+        tolstoy = AuthorFactory(last_name='Толстой', first_name='Лев', patronymic=None)
+        dostoevsky = AuthorFactory(last_name='Достоевский', first_name='Фёдор')
+        AuthorFactory(last_name='Толкин', first_name='Джон')
+
+        by_prefix = api_client.get(self.url, {'q': 'толст', 'type': 'authors'}).json()
+        by_typo = api_client.get(self.url, {'q': 'Достаевский', 'type': 'authors'}).json()
+
+        assert [item['id'] for item in by_prefix['authors']] == [tolstoy.pk]
+        assert by_prefix['authors'][0]['patronymic'] is None
+        assert [item['id'] for item in by_typo['authors']] == [dostoevsky.pk]
+
+    def test_books_ranked_by_similarity(self, api_client):
+        partial = BookFactory(title='Мировая история')
+        exact = BookFactory(title='Война и мир')
+        BookFactory(title='Сад')
+
+        data = api_client.get(self.url, {'q': 'мир', 'type': 'books'}).json()
+
+        assert [item['id'] for item in data['books']] == [exact.pk, partial.pk]
+        assert set(data['books'][0]) == {'id', 'title', 'author', 'similarity'}
+        assert data['books'][0]['author'] == exact.author_id
+
+    def test_only_approved(self, api_client):
+        GenreFactory(title='Фантастика', status=ApprovalStatus.PENDING)
+        approved = GenreFactory(title='Фантастика')
+
+        data = api_client.get(self.url, {'q': 'фантаст'}).json()
+
+        assert set(data) == {'authors', 'books', 'genres'}
+        assert [item['id'] for item in data['genres']] == [approved.pk]
+
+    def test_limit_is_capped(self, api_client):
+        for n in range(3):
+            GenreFactory(title=f'Поэзия {n}')
+
+        data = api_client.get(self.url, {'q': 'поэзия', 'type': 'genres', 'limit': 2}).json()
+
+        assert len(data['genres']) == 2
+
+    def test_short_query_returns_nothing(self, api_client, django_assert_num_queries):
+        GenreFactory(title='Я')
+        with django_assert_num_queries(0):
+            response = api_client.get(self.url, {'q': 'я', 'type': 'genres'})
+        assert response.json() == {'genres': []}
+
+    @pytest.mark.parametrize('params', [{'q': 'мир', 'type': 'users'}, {'q': 'мир', 'limit': 'x'}])
+    def test_bad_params(self, api_client, params):
+        assert api_client.get(self.url, params).status_code == 400
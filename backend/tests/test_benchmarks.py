@@ -0,0 +1,100 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from benchmarks.dataset import Generator, plan, rebuild_derived
+from benchmarks.runner import SCENARIOS, compare, percentile, run
+from benchmarks.servers import load, paths, summarize
+from journal.counters import drifted_quotes
+from journal.models import Book, BookLog, Like, Quote
+from journal.ratings import drifted_books
+
+
+@pytest.fixture
+def dataset(db):
+    counts = plan(200)
+    Generator(seed=1, batch_size=64).generate(counts)
+    rebuild_derived()
+    return counts
+
+
+@pytest.mark.django_db
+class TestBenchmarks:
+
+    def test_generator_creates_consistent_rows(self, dataset):
+        assert BookLog.objects.count() == dataset['logs']
+        assert Quote.objects.count() == dataset['quotes']
+        assert 0 < Like.objects.count() <= dataset['likes']
+        # денормализованные поля пересчитаны после bulk_create
+        assert not drifted_quotes().exists()
+        assert not drifted_books()
+        assert Book.objects.filter(ratings_count__gt=0).exists()
+
+    def test_run_reports_latency_queries_and_memory(self, dataset):
+        scenarios = [scenario for scenario in SCENARIOS if scenario.name in ('books-detail', 'logs-list')]
+
+        report = run(scenarios, iterations=5, warmup=1)
+
+        assert report['meta']['tables']['journal.BookLog'] == dataset['logs']
+        result = report['scenarios']['logs-list']
+        assert result['p50_ms'] <= result['p95_ms'] <= result['p99_ms'] <= result['max_ms']
+        assert result['queries_max'] >= 1
+        assert result['peak_memory_kb'] > 0
+        json.dumps(report)
+
+    def test_percentile_is_nearest_rank(self):
+        values = list(range(1, 101))
+        assert (percentile(values, 50), percentile(values, 95), percentile(values, 99)) == (50, 95, 99)
+        assert percentile([7], 99) == 7
+
+    def test_compare_flags_regressions(self, tmp_path):
+        result = {'p50_ms': 10, 'p95_ms': 20, 'p99_ms': 30, 'queries_max': 3, 'peak_memory_kb': 100}
+        base = {'meta': {'commit': 'a'}, 'scenarios': {'books-list': result}}
+        new = {'meta': {'commit': 'b'}, 'scenarios': {'books-list': {**result, 'p95_ms': 30}}}
+
+        changes = {metric: change for _, metric, _, _, change in compare(base, new)}
+        assert changes['p95_ms'] == 50 and changes['p50_ms'] == 0
+
+        (tmp_path / 'base.json').write_text(json.dumps(base))
+        (tmp_path / 'new.json').write_text(json.dumps(new))
+        call_command('compare_benchmarks', tmp_path / 'base.json', tmp_path / 'new.json', '--threshold', 60)
+        with pytest.raises(CommandError):
+            call_command('compare_benchmarks', tmp_path / 'base.json', tmp_path / 'new.json', '--threshold', 10)
+
+    def test_seed_refuses_regular_database(self):
+        with pytest.raises(CommandError):
+            call_command('seed_benchmark', '--size', 10)
+
+    def test_load_counts_throughput_and_errors(self):
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                code = 200 if self.path == '/ok' else 500
+                self.send_response(code)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            ok = summarize(*load(server.server_port, '/ok', concurrency=4, requests=40))
+            failed = summarize(*load(server.server_port, '/fail', concurrency=2, requests=6))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert ok['errors'] == 0 and ok['requests_per_s'] > 0
+        assert ok['p50_ms'] <= ok['p95_ms'] <= ok['p99_ms'] <= ok['max_ms']
+        assert failed == {'requests_per_s': 0, 'errors': 6}
+
+    def test_servers_compare_sync_and_async_lists(self):
+        assert paths()['books-list-async'] == '/api/journal/async/books/?page_size=50'
+        assert paths()['quotes-first'] == '/api/journal/quotes/?page_size=1'
+        assert {'books-list', 'books-list-async', 'quotes-list', 'quotes-list-async'} <= set(paths())
@@ -0,0 +1,111 @@
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from journal.models import Book
+from journal.ratings import drifted_books
+from users.models import UserTypes
+from tests.factories import BookFactory, BookLogFactory, UserFactory
+
+
+def ratings(book):
+    book = Book.objects.get(pk=book.pk)
+    return book.ratings_count, book.score_sum, book.avg_score, book.score_histogram
+
+
+def histogram(**counts):
+    return [counts.get(f's{score}', 0) for score in range(1, 11)]
+
+
+@pytest.mark.django_db
+class TestBookRatings:
+
+    def test_summary_follows_logs(self):
+        book = BookFactory()
+        first = BookLogFactory(book=book, score=8)
+        BookLogFactory(book=book, score=5)
+        assert ratings(book) == (2, 13, 6.5, histogram(s5=1, s8=1))
+
+        first.score = 10
+        first.save()
+        assert ratings(book) == (2, 15, 7.5, histogram(s5=1, s10=1))
+
+        other = BookFactory()
+        first.book = other
+        first.save()
+        assert ratings(book) == (1, 5, 5.0, histogram(s5=1))
+        assert ratings(other) == (1, 10, 10.0, histogram(s10=1))
+
+        first.delete()
+        assert ratings(other) == (0, 0, 0.0, histogram())
+        assert not drifted_books()
+
+    def test_book_save_keeps_summary(self):
+        book = BookFactory()
+        stale = Book.objects.get(pk=book.pk)
+        BookLogFactory(book=book, score=9)
+
+        stale.title = 'Новое название'
+        stale.save()
+
+        assert ratings(book) == (1, 9, 9.0, histogram(s9=1))
+
+    def test_bulk_import_is_counted(self, api_client):
+        user = UserFactory(user_type=UserTypes.JOURNALIST)
+        api_client.force_authenticate(user=user)
+        book = BookFactory()
+        api_client.post(
+            reverse('journal:book_logs-bulk'),
+            [{'book_id': book.pk, 'score': 7}, {'book_id': book.pk, 'score': 9}],
+            format='json',
+        )
+        assert ratings(book) == (2, 16, 8.0, histogram(s7=1, s9=1))
+
+    def test_api_exposes_and_orders_by_rating(self, api_client):
+        unrated, low, high = BookFactory(), BookFactory(), BookFactory()
+        BookLogFactory(book=low, score=3)
+        BookLogFactory(book=high, score=9)
+        BookLogFactory(book=high, score=8)
+
+        data = api_client.get(reverse('journal:books-list'), {'ordering': '-avg_score'}).json()
+
+        assert [item['id'] for item in data] == [high.pk, low.pk, unrated.pk]
+        assert data[0]['avg_score'] == 8.5
+        assert data[0]['ratings_count'] == 2
+        assert data[0]['score_histogram'] == histogram(s8=1, s9=1)
+        assert data[2]['avg_score'] is None
+
+    def test_new_rating_invalidates_cached_book(self, api_client):
+        book = BookFactory()
+        url = reverse('journal:books-detail', args=[book.pk])
+        api_client.get(url)
+
+        BookLogFactory(book=book, score=6)
+        response = api_client.get(url)
+
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['avg_score'] == 6.0
+
+    def test_recount_command_repairs_drift(self):
+        book = BookFactory()
+        BookLogFactory(book=book, score=4)
+        Book.objects.filter(pk=book.pk).update(ratings_count=7, avg_score=1.0)
+
+        call_command('recount_book_ratings', '--dry-run')
+        assert ratings(book)[0] == 7
+
+        call_command('recount_book_ratings')
+        assert ratings(book) == (1, 4, 4.0, histogram(s4=1))
+
+    def test_recount_command_refreshes_cached_book(self, api_client):
+        book = BookFactory()
+        BookLogFactory(book=book, score=4)
+        url = reverse('journal:books-detail', args=[book.pk])
+        Book.objects.filter(pk=book.pk).update(ratings_count=7, avg_score=1.0)
+        assert api_client.get(url).json()['avg_score'] == 1.0
+
+        call_command('recount_book_ratings')
+        response = api_client.get(url)
+
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['avg_score'] == 4.0
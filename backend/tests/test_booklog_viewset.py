@@ -0,0 +1,100 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from users.models import UserTypes
+from tests.factories import BookFactory, BookLogFactory, UserFactory
+
+
+@pytest.mark.django_db
+class TestBookLogOwnership:
+
+    def test_list_returns_only_own_entries(self, api_client):
+        me = UserFactory(user_type=UserTypes.JOURNALIST)
+        mine = BookLogFactory(owner=me, privat=True)
+        BookLogFactory(privat=False)
+        api_client.force_authenticate(user=me)
+
+        response = api_client.get(reverse('journal:book_logs-list'))
+        assert [item['id'] for item in response.json()] == [mine.pk]
+
+    def test_list_can_include_public_entries(self, api_client):
+        me = UserFactory()
+        mine = BookLogFactory(owner=me)
+        public = BookLogFactory(privat=False)
+        BookLogFactory(privat=True)
+        api_client.force_authenticate(user=me)
+
+        response = api_client.get(reverse('journal:book_logs-list'), {'include_public': 1})
+        assert {item['id'] for item in response.json()} == {mine.pk, public.pk}
+
+    def test_foreign_private_entry_is_hidden(self, api_client):
+        api_client.force_authenticate(user=UserFactory())
+        log = BookLogFactory(privat=True)
+        response = api_client.get(reverse('journal:book_logs-detail', args=[log.pk]))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_foreign_public_entry_is_read_only(self, api_client):
+        api_client.force_authenticate(user=UserFactory(user_type=UserTypes.JOURNALIST))
+        log = BookLogFactory(privat=False)
+        url = reverse('journal:book_logs-detail', args=[log.pk])
+
+        assert api_client.get(url).status_code == status.HTTP_200_OK
+        response = api_client.patch(url, {'score': 1}, format='json')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_create_sets_owner(self, api_client):
+        me = UserFactory(user_type=UserTypes.JOURNALIST)
+        book = BookFactory()
+        api_client.force_authenticate(user=me)
+
+        response = api_client.post(
+            reverse('journal:book_logs-list'),
+            {'book_id': book.pk, 'score': 8},
+            format='json',
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        data = response.json()
+        assert data['owner'] == me.pk
+        assert data['book']['id'] == book.pk
+
+
+@pytest.mark.django_db
+class TestBookLogSummaryList:
+
+    LONG_TEXTS = ['topic', 'three_sentences', 'new_knowledge', 'transformed_me', 'impressions',
+                  'ideas', 'heroes', 'begin', 'key_events', 'most_important_event', 'result']
+
+    @pytest.fixture
+    def me(self, api_client):
+        user = UserFactory()
+        api_client.force_authenticate(user=user)
+        return user
+
+    def test_list_is_summary(self, api_client, me):
+        log = BookLogFactory(owner=me)
+
+        item = api_client.get(reverse('journal:book_logs-list')).json()[0]
+
+        assert not set(self.LONG_TEXTS) & set(item)
+        assert item['score'] == log.score
+        assert item['book']['title'] == log.book.title
+
+    def test_list_does_not_read_long_texts(self, api_client, me):
+        BookLogFactory.create_batch(3, owner=me)
+
+        with CaptureQueriesContext(connection) as context:
+            api_client.get(reverse('journal:book_logs-list'))
+
+        sql = ' '.join(q['sql'] for q in context.captured_queries if 'FROM "journal_booklog"' in q['sql'])
+        assert '"journal_booklog"."score"' in sql
+        for column in self.LONG_TEXTS:
+            assert f'"journal_booklog"."{column}"' not in sql
+
+    def test_retrieve_is_full(self, api_client, me):
+        log = BookLogFactory(owner=me)
+        data = api_client.get(reverse('journal:book_logs-detail', args=[log.pk])).json()
+        assert data['ideas'] == log.ideas
+        assert set(self.LONG_TEXTS) <= set(data)
@@ -0,0 +1,80 @@
+import json
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from journal.models import BookLog, Quote
+from users.models import UserTypes
+from tests.factories import BookFactory, BookLogFactory, UserFactory
+
+
+@pytest.mark.django_db
+class TestBulkImport:
+
+    @pytest.fixture
+    def journalist(self, api_client):
+        user = UserFactory(user_type=UserTypes.JOURNALIST)
+        api_client.force_authenticate(user=user)
+        return user
+
+    def test_logs_json_array_with_item_errors(self, api_client, journalist):
+        book = BookFactory()
+        payload = [
+            {'book_id': book.pk, 'score': 7, 'topic': 'Война'},
+            {'book_id': book.pk, 'score': 11},
+            {'book_id': 999999, 'score': 5},
+            {'book_id': book.pk, 'score': 3},
+        ]
+
+        response = api_client.post(reverse('journal:book_logs-bulk'), payload, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        data = response.json()
+        assert data['created'] == 2
+        assert [error['index'] for error in data['errors']] == [1, 2]
+        assert 'score' in data['errors'][0]['errors']
+        assert 'book_id' in data['errors'][1]['errors']
+        assert set(BookLog.objects.values_list('owner_id', flat=True)) == {journalist.pk}
+
+    def test_quotes_ndjson(self, api_client, journalist):
+        book = BookFactory()
+        log = BookLogFactory(owner=journalist, book=book)
+        body = '\n'.join(json.dumps(item) for item in [
+            {'book_id': book.pk, 'note': 'Все счастливые семьи похожи друг на друга', 'book_log_id': log.pk},
+            {'book_id': book.pk, 'note': 'Рукописи не горят'},
+        ]) + '\n'
+
+        response = api_client.post(
+            reverse('journal:quotes-bulk'), body, content_type='application/x-ndjson',
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()['created'] == 2
+        assert Quote.objects.filter(book_log=log).count() == 1
+
+    def test_quote_cannot_reference_foreign_log(self, api_client, journalist):
+        foreign = BookLogFactory()
+        payload = [{'book_id': foreign.book_id, 'note': 'Чужая', 'book_log_id': foreign.pk}]
+
+        response = api_client.post(reverse('journal:quotes-bulk'), payload, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'book_log_id' in response.json()['errors'][0]['errors']
+
+    def test_query_count_does_not_grow_with_items(self, api_client, journalist, django_assert_max_num_queries):
+        book = BookFactory()
+        payload = [{'book_id': book.pk, 'score': 5}] * 200
+
+        with django_assert_max_num_queries(10):
+            response = api_client.post(reverse('journal:book_logs-bulk'), payload, format='json')
+        assert response.json()['created'] == 200
+
+    def test_rejects_non_list_payload(self, api_client, journalist):
+        response = api_client.post(reverse('journal:book_logs-bulk'), {'score': 5}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_readers_cannot_import_logs(self, api_client):
+        api_client.force_authenticate(user=UserFactory(user_type=UserTypes.READER))
+        response = api_client.post(reverse('journal:book_logs-bulk'), [], format='json')
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,87 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from journal.api.cache import cache_stats, invalidate_catalogue
+from users.models import UserTypes
+from tests.factories import AuthorFactory, BookFactory, UserFactory
+
+
+@pytest.mark.django_db
+class TestCatalogueCache:
+
+    def test_second_request_is_served_from_cache(self, api_client):
+        AuthorFactory()
+        url = reverse('journal:authors-list')
+
+        first = api_client.get(url)
+        second = api_client.get(url)
+
+        assert first['X-Cache'] == 'MISS'
+        assert second['X-Cache'] == 'HIT'
+        assert second.json() == first.json()
+        assert cache_stats() == {'hits': 1, 'misses': 1}
+
+    def test_query_params_are_part_of_the_key(self, api_client):
+        url = reverse('journal:authors-list')
+        api_client.get(url)
+        assert api_client.get(url, {'status': 0})['X-Cache'] == 'MISS'
+
+    def test_create_invalidates_list(self, api_client):
+        url = reverse('journal:authors-list')
+        assert api_client.get(url).json() == []
+
+        api_client.force_authenticate(user=UserFactory(user_type=UserTypes.JOURNALIST))
+        response = api_client.post(url, {'first_name': 'Лев', 'last_name': 'Толстой'}, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+
+        response = api_client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        assert len(response.json()) == 1
+
+    def test_approve_invalidates_only_that_object(self, api_client):
+        first, second = AuthorFactory(status=0), AuthorFactory(status=0)
+        first_url = reverse('journal:authors-detail', args=[first.pk])
+        second_url = reverse('journal:authors-detail', args=[second.pk])
+        api_client.get(first_url)
+        api_client.get(second_url)
+
+        api_client.force_authenticate(user=UserFactory(user_type=UserTypes.STAFF))
+        api_client.post(reverse('journal:authors-approve', args=[first.pk]))
+
+        response = api_client.get(first_url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['status'] == 1
+        assert api_client.get(second_url)['X-Cache'] == 'HIT'
+
+    def test_genre_change_invalidates_nested_books(self, api_client):
+        book = BookFactory()
+        url = reverse('journal:books-detail', args=[book.pk])
+        api_client.get(url)
+
+        api_client.force_authenticate(user=UserFactory(user_type=UserTypes.STAFF))
+        api_client.patch(
+            reverse('journal:genres-detail', args=[book.genre_id]),
+            {'title': 'Роман'},
+            format='json',
+        )
+
+        response = api_client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['genre']['title'] == 'Роман'
+
+    def test_padded_pk_shares_the_object_version(self, api_client):
+        book = BookFactory()
+        padded = reverse('journal:books-detail', args=[f'00{book.pk}'])
+        assert api_client.get(padded)['X-Cache'] == 'MISS'
+        assert api_client.get(padded)['X-Cache'] == 'HIT'
+
+        invalidate_catalogue('book', book.pk)
+
+        assert api_client.get(padded)['X-Cache'] == 'MISS'
+
+    def test_non_numeric_pk_is_not_cached(self, api_client):
+        url = reverse('journal:books-detail', args=['abc'])
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert 'X-Cache' not in response
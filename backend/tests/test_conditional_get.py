@@ -0,0 +1,66 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from journal.models import BookLog
+from users.models import UserTypes
+from tests.factories import AuthorFactory, BookLogFactory, UserFactory
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+
+    def test_catalogue_etag_roundtrip(self, api_client):
+        AuthorFactory()
+        url = reverse('journal:authors-list')
+
+        response = api_client.get(url)
+        etag = response['ETag']
+        assert response.status_code == status.HTTP_200_OK
+
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response['ETag'] == etag
+        assert not response.content
+
+    def test_catalogue_etag_changes_after_write(self, api_client):
+        author = AuthorFactory()
+        url = reverse('journal:authors-detail', args=[author.pk])
+        etag = api_client.get(url)['ETag']
+
+        api_client.force_authenticate(user=UserFactory(user_type=UserTypes.STAFF))
+        api_client.patch(url, {'first_name': 'Фёдор'}, format='json')
+
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != etag
+
+    def test_booklog_list_etag_tracks_updates_and_deletes(self, api_client):
+        user = UserFactory()
+        api_client.force_authenticate(user=user)
+        logs = BookLogFactory.create_batch(2, owner=user)
+        url = reverse('journal:book_logs-list')
+
+        etag = api_client.get(url)['ETag']
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_304_NOT_MODIFIED
+
+        BookLog.objects.filter(pk=logs[0].pk).delete()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()) == 1
+
+    def test_booklog_retrieve_last_modified(self, api_client):
+        log = BookLogFactory()
+        api_client.force_authenticate(user=log.owner)
+        url = reverse('journal:book_logs-detail', args=[log.pk])
+
+        response = api_client.get(url)
+        last_modified = response['Last-Modified']
+
+        response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_booklog_retrieve_missing(self, api_client):
+        api_client.force_authenticate(user=UserFactory())
+        response = api_client.get(reverse('journal:book_logs-detail', args=[999999]))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,44 @@
+import pytest
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+
+from BookLog import db
+from tests.factories import AuthorFactory
+
+
+@pytest.mark.django_db
+class TestDbConnections:
+
+    def test_requests_are_counted_per_worker(self, client):
+        AuthorFactory()
+        before = db.worker_stats()
+
+        for _ in range(3):
+            client.get(reverse('journal:authors-list'))
+
+        after = db.worker_stats()
+        assert after['requests'] - before['requests'] == 3
+        # соединение теста переживает запросы — новых не открывалось
+        assert after['connects'] == before['connects']
+        assert after['conn_max_age'] == settings.DATABASES['default']['CONN_MAX_AGE']
+        assert after['pool'] is None
+
+    def test_workers_publish_to_shared_cache(self):
+        db.publish()
+        cache.set(db.WORKERS_KEY, cache.get(db.WORKERS_KEY) + [-1], None)
+
+        reports = db.worker_reports()
+
+        # запись остановленного воркера истекла — он пропадает из списка
+        assert [stats['pid'] for stats in reports] == [db.worker_stats()['pid']]
+        assert cache.get(db.WORKERS_KEY) == [reports[0]['pid']]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_command_reports_connect_cost(self, capsys):
+        call_command('db_connections', '--repeat', 2)
+
+        output = capsys.readouterr().out
+        assert 'режим:' in output
+        assert 'открытие соединения' in output
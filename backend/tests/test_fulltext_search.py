@@ -0,0 +1,73 @@
+import pytest
+from django.contrib.postgres.search import SearchQuery
+from django.core.management import call_command
+from django.urls import reverse
+
+from journal.models import BookLog, Quote
+from users.models import UserTypes
+from tests.factories import BookFactory, BookLogFactory, QuoteFactory, UserFactory
+
+
+@pytest.mark.django_db
+class TestFullTextSearch:
+
+    @pytest.fixture
+    def reader(self, api_client):
+        user = UserFactory(user_type=UserTypes.JOURNALIST)
+        api_client.force_authenticate(user=user)
+        return user
+
+    def test_russian_word_forms_and_snippet(self, api_client, reader):
+        match = BookLogFactory(owner=reader, ideas='Книга о войне и мире')
+        BookLogFactory(owner=reader, ideas='Про сад и огород', topic='Огород')
+
+        response = api_client.get(reverse('journal:book_logs-list'), {'q': 'война'})
+
+        data = response.json()
+        assert [item['id'] for item in data] == [match.pk]
+        assert '<b>войне</b>' in data[0]['search_snippet']
+        assert data[0]['search_rank'] > 0
+
+    def test_english_and_weights(self, api_client, reader):
+        in_body = BookLogFactory(owner=reader, topic='Сад', impressions='He keeps running')
+        in_topic = BookLogFactory(owner=reader, topic='Running a marathon')
+
+        response = api_client.get(reverse('journal:book_logs-list'), {'q': 'run'})
+
+        assert [item['id'] for item in response.json()] == [in_topic.pk, in_body.pk]
+
+    def test_search_respects_owner_scope(self, api_client, reader):
+        BookLogFactory(ideas='Чужая война', privat=True)
+        response = api_client.get(reverse('journal:book_logs-list'), {'q': 'война'})
+        assert response.json() == []
+
+    def test_quotes_search_paginated_by_rank(self, api_client):
+        weak = QuoteFactory(note='Мир и ещё много разных слов про что-то совсем другое')
+        strong = QuoteFactory(note='Мир, мир, мир')
+        QuoteFactory(note='Без совпадений')
+
+        url = reverse('journal:quotes-list')
+        first = api_client.get(url, {'q': 'мир', 'page_size': 1}).json()
+        second = api_client.get(first['next']).json()
+
+        assert [first['results'][0]['id'], second['results'][0]['id']] == [strong.pk, weak.pk]
+        assert second['next'] is None
+
+    def test_bulk_import_is_indexed(self, api_client, reader):
+        book = BookFactory()
+        api_client.post(
+            reverse('journal:quotes-bulk'),
+            [{'book_id': book.pk, 'note': 'Рукописи не горят'}],
+            format='json',
+        )
+        response = api_client.get(reverse('journal:quotes-list'), {'q': 'рукописи горят'})
+        assert len(response.json()) == 1
+
+    def test_rebuild_command(self):
+        quote = QuoteFactory(note='Красота спасёт мир')
+        Quote.objects.update(search_vector=None)
+        BookLog.objects.update(search_vector=None)
+
+        call_command('rebuild_search_index', batch_size=1)
+
+        assert Quote.objects.filter(pk=quote.pk, search_vector=SearchQuery('красота', config='russian')).exists()
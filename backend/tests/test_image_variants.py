@@ -0,0 +1,118 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from PIL import Image
+
+from jobs.images import IMAGE_VARIANTS
+from jobs.models import Job
+from jobs.queue import run_pending
+from journal.models import Author, Book
+from tests.factories import AuthorFactory, BookFactory, UserFactory
+
+
+def image_file(name='cover.png', size=(1200, 800), mode='RGBA'):
+    buffer = BytesIO()
+    Image.new(mode, size, (200, 30, 30, 128) if mode == 'RGBA' else (200, 30, 30)).save(buffer, 'PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.mark.django_db
+class TestImageVariants:
+
+    def test_upload_queues_job_and_worker_builds_variants(self, media_root):
+        book = BookFactory(logo=image_file())
+        assert book.logo_variants == {}
+        assert Job.objects.filter(name=IMAGE_VARIANTS).count() == 1
+
+        run_pending()
+
+        book.refresh_from_db()
+        assert set(book.logo_variants) == {'64', '256', '768'}
+        webp = book.logo_variants['256']['webp']
+        assert webp.endswith('.webp')
+        with Image.open(media_root / webp) as image:
+            assert (image.format, image.size) == ('WEBP', (256, 171))
+        with Image.open(media_root / book.logo_variants['64']['jpg']) as image:
+            assert (image.format, image.mode, max(image.size)) == ('JPEG', 'RGB', 64)
+
+    def test_small_images_are_not_upscaled(self, media_root):
+        author = AuthorFactory(photo=image_file('face.png', size=(100, 50), mode='RGB'))
+        run_pending()
+        author.refresh_from_db()
+        with Image.open(media_root / author.photo_variants['768']['webp']) as image:
+            assert image.size == (100, 50)
+
+    def test_replaced_image_resets_variants(self):
+        book = BookFactory(logo=image_file())
+        run_pending()
+        book.refresh_from_db()
+        old_variants = book.logo_variants
+
+        book.logo = image_file('new.png', size=(900, 900))
+        book.save()
+
+        book.refresh_from_db()
+        assert book.logo_variants == {}
+        run_pending()
+        book.refresh_from_db()
+        assert book.logo_variants['64']['webp'] != old_variants['64']['webp']
+
+    def test_stale_job_is_skipped(self):
+        book = BookFactory(logo=image_file())
+        Book.objects.filter(pk=book.pk).update(logo='book_logos/other.png')
+        run_pending()
+        book.refresh_from_db()
+        assert book.logo_variants == {}
+
+    def test_serializers_expose_variant_urls(self, api_client):
+        book = BookFactory(logo=image_file())
+        user = UserFactory()
+        user.logo = image_file('me.png')
+        user.save()
+        run_pending()
+
+        data = api_client.get(reverse('journal:books-detail', args=[book.pk])).json()
+        assert data['logo_variants']['256']['webp'].startswith('http://testserver/media/cas/')
+
+        user.refresh_from_db()
+        api_client.force_authenticate(user=user)
+        data = api_client.get(reverse('users:user-current')).json()
+        assert set(data['logo_variants']['64']) == {'webp', 'jpg'}
+
+    def test_variants_invalidate_cached_catalogue(self, api_client):
+        book = BookFactory(logo=image_file())
+        url = reverse('journal:books-detail', args=[book.pk])
+        first = api_client.get(url)
+        assert first.json()['logo_variants'] == {}
+
+        run_pending()
+
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        assert response.status_code == 200
+        assert response['X-Cache'] == 'MISS'
+        assert set(response.json()['logo_variants']) == {'64', '256', '768'}
+
+    def test_backfill_command(self):
+        author = AuthorFactory()
+        name = author.photo.storage.save('author_photos/old.png', ContentFile(image_file().read()))
+        Author.objects.filter(pk=author.pk).update(photo=name)
+
+        call_command('build_image_variants')
+        assert Job.objects.filter(name=IMAGE_VARIANTS).count() == 1
+        run_pending()
+
+        author.refresh_from_db()
+        assert set(author.photo_variants) == {'64', '256', '768'}
+
+        call_command('build_image_variants')
+        assert Job.objects.filter(name=IMAGE_VARIANTS).count() == 1
@@ -0,0 +1,124 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+from journal.models import ApprovalStatus, Author, Book, BookLog, Genre, Quote
+from tests.factories import BookFactory, UserFactory
+
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(connection.vendor != 'postgresql', reason="EXPLAIN-проверки только для PostgreSQL"),
+]
+
+
+@pytest.fixture
+def no_seqscan(db):
+    """
+    На тестовых объёмах планировщик всегда выберет seq scan,
+    поэтому запрещаем его и проверяем, что подходящий индекс вообще есть.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+
+
+def analyze(*models):
+    with connection.cursor() as cursor:
+        for model in models:
+            cursor.execute(f'ANALYZE {model._meta.db_table}')
+
+
+@pytest.fixture
+def fresh_catalogue_stats(db):
+    """
+    Статистика, оставшаяся от соседних тестов (или от autovacuum), сбивает выбор
+    между индексами почти пустых таблиц — пересобираем её перед проверкой.
+    """
+    book = BookFactory()
+    analyze(Author, Genre, Book)
+    return book
+
+
+@pytest.fixture
+def feed_stats(db):
+    """
+    У лент несколько подходящих индексов (по updated_at / по pk), и на пустой
+    таблице выбор между ними случаен. Наполняем таблицы в «боевых» пропорциях:
+    публичных записей мало, у владельца — несколько страниц из многих.
+    """
+    book = BookFactory()
+    user, owner = UserFactory(), UserFactory()
+    BookLog.objects.bulk_create(
+        BookLog(owner=owner if i % 10 == 0 else user, book=book, privat=i % 50 != 1, score=5)
+        for i in range(3000)
+    )
+    Quote.objects.bulk_create(
+        Quote(book=book, note='q', privat=i % 50 != 1)
+        for i in range(3000)
+    )
+    analyze(BookLog, Quote)
+    return owner
+
+
+def plan(queryset):
+    return queryset.explain()
+
+
+@pytest.mark.usefixtures('no_seqscan')
+class TestHotQueriesUseIndexes:
+
+    def test_moderation_queue(self, fresh_catalogue_stats):
+        qs = Author.objects.filter(status=ApprovalStatus.PENDING).order_by('id')
+        assert 'author_pending_idx' in plan(qs)
+
+    def test_approved_books_listing(self, fresh_catalogue_stats):
+        qs = Book.objects.filter(status=ApprovalStatus.APPROVED).order_by('id')[:50]
+        assert 'book_status_idx' in plan(qs)
+
+    def test_approved_books_by_author(self, fresh_catalogue_stats):
+        # (author, status) выигрывает у FK-индекса по author, когда статус отсекает строки:
+        # 100 авторов по 20 книг, одобрена примерно каждая седьмая
+        book = fresh_catalogue_stats
+        authors = Author.objects.bulk_create(
+            Author(first_name='a', last_name=f'a{i}', created_by_id=book.created_by_id, status=ApprovalStatus.APPROVED)
+            for i in range(100)
+        )
+        Book.objects.bulk_create(
+            Book(title=f'b{i}', author=authors[i % 100], genre_id=book.genre_id, type=book.type,
+                 created_by_id=book.created_by_id,
+                 status=ApprovalStatus.APPROVED if i % 7 == 0 else ApprovalStatus.PENDING)
+            for i in range(2000)
+        )
+        analyze(Author, Book)
+        qs = Book.objects.filter(author=authors[0], status=ApprovalStatus.APPROVED)
+        assert 'book_author_status_idx' in plan(qs)
+
+    def test_public_quote_feed(self, feed_stats):
+        qs = Quote.objects.filter(privat=False).order_by('-id')[:50]
+        assert 'quote_privat_idx' in plan(qs)
+
+    def test_quotes_by_date_range(self, feed_stats):
+        qs = Quote.objects.filter(created_at__gte=timezone.now() - timedelta(days=30))
+        assert 'quote_created_brin_idx' in plan(qs)
+
+    def test_quotes_by_book_and_date_range(self, feed_stats):
+        qs = Quote.objects.filter(book_id=1, created_at__gte=timezone.now() - timedelta(days=30))
+        assert 'quote_book_created_idx' in plan(qs)
+
+    def test_author_autocomplete(self, fresh_catalogue_stats):
+        qs = Author.objects.filter(last_name__trigram_word_similar='толст')
+        assert 'author_last_name_trgm_idx' in plan(qs)
+
+    def test_book_autocomplete(self, fresh_catalogue_stats):
+        qs = Book.objects.filter(title__trigram_word_similar='война')
+        assert 'book_title_trgm_idx' in plan(qs)
+
+    def test_public_journal_feed(self, feed_stats):
+        qs = BookLog.objects.filter(privat=False).order_by('-updated_at')[:50]
+        assert 'booklog_privat_updated_idx' in plan(qs)
+
+    def test_user_journal_page(self, feed_stats):
+        qs = BookLog.objects.filter(owner=feed_stats).order_by('-updated_at', '-id')[:50]
+        assert 'booklog_owner_updated_idx' in plan(qs)
@@ -0,0 +1,112 @@
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.core.mail import EmailMultiAlternatives, send_mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from jobs.mail import SEND_EMAIL
+from jobs.models import Job, JobStatus
+from jobs.queue import claim, queue_stats, run_pending
+from tests.factories import UserFactory
+
+
+class BrokenSMTPBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise ConnectionRefusedError('SMTP недоступен')
+
+
+@pytest.fixture
+def queued_mail(settings):
+    settings.EMAIL_BACKEND = 'jobs.mail.QueuedEmailBackend'
+    settings.EMAIL_DELIVERY_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+    return settings
+
+
+@pytest.mark.django_db
+class TestEmailQueue:
+
+    def test_send_mail_is_queued_and_delivered_by_worker(self, queued_mail):
+        send_mail('Тема', 'Текст', 'noreply@booklog.local', ['reader@example.com'])
+
+        assert mail.outbox == []
+        job = Job.objects.get()
+        assert (job.name, job.status) == (SEND_EMAIL, JobStatus.PENDING)
+
+        assert run_pending() == 1
+
+        assert [message.subject for message in mail.outbox] == ['Тема']
+        assert mail.outbox[0].to == ['reader@example.com']
+        job.refresh_from_db()
+        assert job.status == JobStatus.DONE
+        assert job.attempts == 1
+
+    def test_alternatives_and_attachments_survive_the_queue(self, queued_mail):
+        message = EmailMultiAlternatives('Отчёт', 'Текст', 'noreply@booklog.local', ['reader@example.com'])
+        message.attach_alternative('<p>Текст</p>', 'text/html')
+        message.attach('notes.txt', 'Заметки', 'text/plain')
+        message.attach('cover.bin', b'\x00\xff', 'application/octet-stream')
+        message.send()
+
+        run_pending()
+
+        sent = mail.outbox[0]
+        assert sent.alternatives[0][:2] == ('<p>Текст</p>', 'text/html')
+        assert [attachment[:2] for attachment in sent.attachments] == [('notes.txt', 'Заметки'), ('cover.bin', b'\x00\xff')]
+
+    def test_profile_deletion_request_does_not_send_inline(self, api_client, queued_mail):
+        queued_mail.EMAIL_DELIVERY_BACKEND = 'tests.test_jobs.BrokenSMTPBackend'
+        user = UserFactory(email='reader@example.com')
+        api_client.force_authenticate(user=user)
+
+        response = api_client.post(reverse('users:profile-delete-request'))
+
+        assert response.status_code == 200
+        assert Job.objects.filter(name=SEND_EMAIL, status=JobStatus.PENDING).count() == 1
+
+    def test_failures_are_retried_with_backoff(self, queued_mail):
+        queued_mail.EMAIL_DELIVERY_BACKEND = 'tests.test_jobs.BrokenSMTPBackend'
+        queued_mail.JOBS_RETRY_BASE_SECONDS = 10
+        send_mail('Тема', 'Текст', 'noreply@booklog.local', ['reader@example.com'])
+        job = Job.objects.get()
+        job.max_attempts = 2
+        job.save()
+
+        run_pending()
+        job.refresh_from_db()
+        assert job.status == JobStatus.PENDING
+        assert 'SMTP недоступен' in job.last_error
+        assert job.run_at - job.started_at >= timedelta(seconds=10)
+        # повтор ещё не наступил
+        assert run_pending() == 0
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        run_pending()
+        job.refresh_from_db()
+        assert (job.status, job.attempts) == (JobStatus.FAILED, 2)
+        assert mail.outbox == []
+
+    def test_expired_lease_is_reclaimed(self, queued_mail):
+        send_mail('Тема', 'Текст', 'noreply@booklog.local', ['reader@example.com'])
+        [job] = claim()
+        assert claim() == []
+
+        Job.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+
+        assert run_pending() == 1
+        assert len(mail.outbox) == 1
+
+    def test_queue_stats_and_worker_command(self, queued_mail):
+        for n in range(3):
+            send_mail(f'Тема {n}', 'Текст', 'noreply@booklog.local', ['reader@example.com'])
+        assert queue_stats()['due'] == 3
+
+        call_command('run_jobs', '--once')
+
+        stats = queue_stats()
+        assert (stats['pending'], stats['done'], stats['failed']) == (0, 3, 0)
+        assert stats['wait_avg'] is not None
+        assert len(mail.outbox) == 3
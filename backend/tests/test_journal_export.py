@@ -0,0 +1,84 @@
+import csv
+import io
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.test import AsyncRequestFactory
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import force_authenticate
+
+from journal.api.views import BookLogViewSet
+
+from tests.factories import BookLogFactory, QuoteFactory, UserFactory
+
+
+@pytest.mark.django_db
+class TestJournalExport:
+
+    @pytest.fixture
+    def journal(self):
+        user = UserFactory()
+        first, second = BookLogFactory.create_batch(2, owner=user)
+        QuoteFactory(book_log=first, book=first.book, note='Первая')
+        QuoteFactory(book_log=first, book=first.book, note='Вторая')
+        BookLogFactory()  # чужая запись не должна попасть в выгрузку
+        return user, [first, second]
+
+    def test_ndjson_stream(self, api_client, journal):
+        user, logs = journal
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get(reverse('journal:book_logs-export'))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        assert [row['id'] for row in rows] == [log.pk for log in logs]
+        assert [q['note'] for q in rows[0]['quotes']] == ['Первая', 'Вторая']
+        assert rows[1]['quotes'] == []
+
+    def test_csv_stream(self, api_client, journal):
+        user, logs = journal
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get(reverse('journal:book_logs-export'), {'export_format': 'csv'})
+
+        assert response['Content-Type'].startswith('text/csv')
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        assert [int(row['id']) for row in rows] == [log.pk for log in logs]
+        assert rows[0]['quotes'] == 'Первая\nВторая'
+
+    def test_asgi_stream_is_async(self, journal):
+        user, logs = journal
+        request = AsyncRequestFactory().get(reverse('journal:book_logs-export'))
+        force_authenticate(request, user=user)
+
+        response = BookLogViewSet.as_view({'get': 'export'})(request)
+
+        assert response.is_async
+
+        async def read():
+            return b''.join([chunk async for chunk in response.streaming_content])
+
+        rows = [json.loads(line) for line in async_to_sync(read)().decode().splitlines()]
+        assert [row['id'] for row in rows] == [log.pk for log in logs]
+        assert [q['note'] for q in rows[0]['quotes']] == ['Первая', 'Вторая']
+
+    def test_unknown_format(self, api_client, journal):
+        api_client.force_authenticate(user=journal[0])
+        response = api_client.get(reverse('journal:book_logs-export'), {'export_format': 'xml'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_anonymous_is_rejected(self, api_client):
+        response = api_client.get(reverse('journal:book_logs-export'))
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.json()['detail']
+
+    def test_management_command(self, journal):
+        user, logs = journal
+        out = io.StringIO()
+        call_command('export_journal', user.username, stdout=out)
+        assert len(out.getvalue().splitlines()) == len(logs)
@@ -0,0 +1,123 @@
+import os
+import time
+from collections import Counter
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import RequestFactory
+
+from journal.models import Author, Book
+from journal import storage
+from journal.storage import BLOB_PREFIX, collect_garbage, is_blob
+from journal.views import IMMUTABLE_CACHE_CONTROL, serve_blob
+from tests.factories import AuthorFactory, BookFactory
+
+
+def upload(name, content=b'cover-bytes'):
+    return SimpleUploadedFile(name, content, content_type='application/octet-stream')
+
+
+def blob_files(root):
+    return sorted(
+        os.path.relpath(os.path.join(directory, filename), root)
+        for directory, _, filenames in os.walk(root / 'cas') for filename in filenames
+    )
+
+
+def age(root, name, seconds):
+    path = root / name
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.mark.django_db
+class TestContentAddressedStorage:
+
+    def test_same_content_is_stored_once(self, media_root):
+        first = default_storage.save('book_logos/cover.PNG', ContentFile(b'one'))
+        second = default_storage.save('author_photos/other-name.png', ContentFile(b'one'))
+        third = default_storage.save('book_logos/cover.png', ContentFile(b'two'))
+
+        assert first == second != third
+        assert is_blob(first) and first.endswith('.png')
+        assert len(blob_files(media_root)) == 2
+
+    def test_models_share_blob_and_delete_keeps_it(self, media_root):
+        first = BookFactory(logo=upload('a.jpg'))
+        second = BookFactory(logo=upload('b.jpg'))
+        assert first.logo.name == second.logo.name
+
+        first.logo.delete(save=False)
+        assert default_storage.exists(second.logo.name)
+
+    def test_blob_is_served_with_immutable_cache_headers(self):
+        name = default_storage.save('book_logos/cover.png', ContentFile(b'one'))
+        # маршрут есть только при DEBUG (в проде отдаёт nginx) — вызываем view напрямую
+        request = RequestFactory().get(default_storage.url(name))
+        response = serve_blob(request, name.removeprefix(f'{BLOB_PREFIX}/'))
+
+        assert response.status_code == 200
+        assert response['Cache-Control'] == IMMUTABLE_CACHE_CONTROL
+        assert b''.join(response.streaming_content) == b'one'
+
+    def test_garbage_collection_counts_references(self, media_root):
+        kept = BookFactory(logo=upload('a.jpg', b'kept')).logo.name
+        Author.objects.filter(pk=AuthorFactory().pk).update(photo_variants={'64': {'webp': kept}})
+        orphan = default_storage.save('book_logos/old.jpg', ContentFile(b'orphan'))
+        fresh = default_storage.save('book_logos/new.jpg', ContentFile(b'fresh'))
+        # у книги обложку убрали — на kept ссылается только копия у автора
+        Book.objects.update(logo=None)
+        for name in (kept, orphan):
+            age(media_root, name, 2 * 24 * 3600)
+
+        assert collect_garbage(dry_run=True) == (1, len(b'orphan'))
+        assert collect_garbage() == (1, len(b'orphan'))
+
+        assert default_storage.exists(kept)
+        assert default_storage.exists(fresh)
+        assert not default_storage.exists(orphan)
+
+    def test_dedup_hit_makes_old_blob_fresh(self, media_root):
+        name = default_storage.save('book_logos/cover.png', ContentFile(b'again'))
+        age(media_root, name, 2 * 24 * 3600)
+
+        default_storage.save('book_logos/copy.png', ContentFile(b'again'))
+
+        assert collect_garbage() == (0, 0)
+        assert default_storage.exists(name)
+
+    def test_references_are_rechecked_before_delete(self, media_root, monkeypatch):
+        logo = default_storage.save('book_logos/a.png', ContentFile(b'logo'))
+        variant = default_storage.save('book_logos/a.png.64.webp', ContentFile(b'variant'))
+        for name in (logo, variant):
+            age(media_root, name, 2 * 24 * 3600)
+        # снимок ссылок сделан до того, как записи сослались на файлы
+        monkeypatch.setattr(storage, 'blob_references', Counter)
+        Book.objects.filter(pk=BookFactory().pk).update(logo=logo)
+        Author.objects.filter(pk=AuthorFactory().pk).update(photo_variants={'64': {'webp': variant}})
+
+        assert collect_garbage(dry_run=True) == (2, len(b'logo') + len(b'variant'))
+        assert collect_garbage() == (0, 0)
+        assert default_storage.exists(logo) and default_storage.exists(variant)
+
+    def test_legacy_files_are_imported(self, media_root):
+        (media_root / 'book_logos').mkdir()
+        (media_root / 'book_logos' / 'old.jpg').write_bytes(b'legacy')
+        book = BookFactory()
+        Book.objects.filter(pk=book.pk).update(logo='book_logos/old.jpg')
+
+        call_command('gc_media', '--import-legacy')
+
+        book.refresh_from_db()
+        assert is_blob(book.logo.name)
+        assert book.logo.read() == b'legacy'
+        assert not (media_root / 'book_logos' / 'old.jpg').exists()
@@ -0,0 +1,52 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from tests.factories import QuoteFactory, ShareFactory
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+
+    def test_list_without_params_is_plain_list(self, api_client):
+        QuoteFactory.create_batch(3)
+        response = api_client.get(reverse('journal:quotes-list'))
+        assert response.status_code == status.HTTP_200_OK
+        assert isinstance(response.json(), list)
+
+    def test_pages_follow_cursor_without_gaps(self, api_client):
+        quotes = QuoteFactory.create_batch(5)
+        expected = sorted((q.id for q in quotes), reverse=True)
+
+        url = reverse('journal:quotes-list') + '?page_size=2'
+        seen = []
+        while url:
+            response = api_client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            data = response.json()
+            assert len(data['results']) <= 2
+            seen += [item['id'] for item in data['results']]
+            url = data['next']
+
+        assert seen == expected
+
+    def test_page_size_is_capped(self, api_client, settings):
+        settings.JOURNAL_MAX_PAGE_SIZE = 2
+        QuoteFactory.create_batch(4)
+        response = api_client.get(reverse('journal:quotes-list'), {'page_size': 100})
+        assert len(response.json()['results']) == 2
+
+    def test_required_mode_uses_default_page_size(self, api_client, settings):
+        settings.JOURNAL_PAGINATION_REQUIRED = True
+        settings.JOURNAL_PAGE_SIZE = 3
+        QuoteFactory.create_batch(4)
+        response = api_client.get(reverse('journal:quotes-list'))
+        data = response.json()
+        assert len(data['results']) == 3
+        assert data['next'] is not None
+
+    def test_shares_ordered_by_moment(self, api_client):
+        shares = ShareFactory.create_batch(3)
+        response = api_client.get(reverse('journal:shares-list'), {'page_size': 10})
+        ids = [item['id'] for item in response.json()['results']]
+        assert ids == [s.id for s in sorted(shares, key=lambda s: (s.moment, s.id), reverse=True)]
@@ -0,0 +1,137 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status, viewsets
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from BookLog.permissions import (
+    ActionBasedPermissionsMixin, IsStaff, OrPermission, RolePermission, is_self, owned_by_user, request_role,
+)
+from journal.api.serializers import LikeSerializer
+from journal.api.views import AuthorViewSet, BookLogViewSet, QuoteViewSet
+from journal.models import ApprovalStatus, Like, Quote
+from tests.factories import BookLogFactory, GenreFactory, LikeFactory, QuoteFactory, UserFactory
+from users.models import UserTypes
+
+
+class OwnLikesViewSet(ActionBasedPermissionsMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = Like.objects.select_related('user')
+    serializer_class = LikeSerializer
+    permission_map = {
+        'list':     [is_self, IsStaff],
+        'retrieve': [is_self, IsStaff],
+    }
+
+
+def get(user, action='list', **kwargs):
+    request = APIRequestFactory().get('/')
+    if user is not None:
+        force_authenticate(request, user=user)
+    detail = action == 'retrieve'
+    return OwnLikesViewSet.as_view({'get': action}, detail=detail)(request, **kwargs)
+
+
+class TestCompiledPermissions:
+
+    def test_roles_are_merged_once_per_class(self):
+        create = AuthorViewSet.compiled_permissions['create']
+        assert type(create) is RolePermission
+        assert create.roles == {'JOURNALIST', 'STAFF', 'ADMIN'}
+        first, second = AuthorViewSet(action='create'), AuthorViewSet(action='create')
+        assert first.get_permissions()[0] is second.get_permissions()[0] is create
+
+    def test_only_owner_checked_lists_are_filtered(self):
+        assert OwnLikesViewSet.filtered_actions == {'list', 'retrieve'}
+        assert 'list' in BookLogViewSet.filtered_actions
+        # is_self у цитат стоит только на изменении, списки не фильтруются
+        assert 'list' not in QuoteViewSet.filtered_actions
+        assert AuthorViewSet.filtered_actions == frozenset()
+
+    def test_checkers_stay_separate(self):
+        update = QuoteViewSet.compiled_permissions['update']
+        assert isinstance(update, OrPermission)
+        roles, checker = update.perms
+        assert roles.roles == {'STAFF', 'ADMIN'}
+        assert checker.checker is is_self
+
+
+@pytest.mark.django_db
+class TestPermissionEngine:
+
+    def test_role_is_resolved_once_per_request(self):
+        user = UserFactory(user_type=UserTypes.READER.value)
+        request = APIRequestFactory().get('/')
+        force_authenticate(request, user=user)
+        request = Request(request)
+
+        assert request_role(request) == 'READER'
+        user.user_type = UserTypes.ADMIN.value
+        assert request_role(request) == 'READER'
+
+    def test_is_self_without_object_does_not_query(self, django_assert_num_queries):
+        request = Request(APIRequestFactory().get('/'))
+        request.user = UserFactory()
+        with django_assert_num_queries(0):
+            assert is_self(request, view=None)
+
+    def test_list_is_filtered_by_owner_in_sql(self):
+        reader = UserFactory(user_type=UserTypes.READER.value)
+        own = LikeFactory(user=reader)
+        LikeFactory()
+
+        assert [like['id'] for like in get(reader).data] == [own.pk]
+        assert len(get(UserFactory(user_type=UserTypes.STAFF.value)).data) == 2
+        assert get(None).status_code in (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN)
+
+    def test_book_log_list_is_filtered_in_sql(self, api_client):
+        me = UserFactory(user_type=UserTypes.JOURNALIST)
+        mine = BookLogFactory(owner=me)
+        BookLogFactory()
+        api_client.force_authenticate(user=me)
+
+        with CaptureQueriesContext(connection) as queries:
+            data = api_client.get(reverse('journal:book_logs-list')).json()
+
+        assert [item['id'] for item in data] == [mine.pk]
+        select = next(q['sql'] for q in queries if q['sql'].startswith('SELECT') and 'FROM "journal_booklog"' in q['sql'])
+        assert f'"journal_booklog"."owner_id" = {me.pk}' in select
+
+    def test_quote_owner_is_found_through_book_log(self, api_client):
+        owner = UserFactory(user_type=UserTypes.JOURNALIST)
+        quote = QuoteFactory(book_log=BookLogFactory(owner=owner))
+        QuoteFactory()
+        request = Request(APIRequestFactory().get('/'))
+        request.user = owner
+
+        condition = owned_by_user(request, QuoteViewSet(), Quote.objects.all())
+        assert list(Quote.objects.filter(condition)) == [quote]
+
+        url = reverse('journal:quotes-detail', args=[quote.pk])
+        api_client.force_authenticate(user=UserFactory(user_type=UserTypes.JOURNALIST))
+        assert api_client.patch(url, {'note': 'чужая'}, format='json').status_code == status.HTTP_403_FORBIDDEN
+        api_client.force_authenticate(user=owner)
+        assert api_client.patch(url, {'note': 'своя'}, format='json').status_code == status.HTTP_200_OK
+
+    def test_foreign_object_is_still_checked(self):
+        reader = UserFactory(user_type=UserTypes.READER.value)
+        foreign = LikeFactory()
+
+        assert get(reader, 'retrieve', pk=foreign.pk).status_code == status.HTTP_403_FORBIDDEN
+        assert get(foreign.user, 'retrieve', pk=foreign.pk).status_code == status.HTTP_200_OK
+
+    @pytest.mark.parametrize('user_type,expected', [
+        (UserTypes.READER, status.HTTP_403_FORBIDDEN),
+        (UserTypes.JOURNALIST, status.HTTP_403_FORBIDDEN),
+        (UserTypes.STAFF, status.HTTP_200_OK),
+    ])
+    def test_genre_moderation_requires_staff(self, api_client, user_type, expected):
+        genre = GenreFactory(status=ApprovalStatus.PENDING)
+        api_client.force_authenticate(user=UserFactory(user_type=user_type.value))
+
+        response = api_client.post(reverse('journal:genres-approve', args=[genre.pk]))
+
+        assert response.status_code == expected
+        genre.refresh_from_db()
+        assert (genre.status == ApprovalStatus.APPROVED) == (expected == status.HTTP_200_OK)
@@ -0,0 +1,223 @@
+"""
+Число SQL-запросов на list/retrieve каждого эндпоинта journal/api/urls.py и
+users/api/urls.py не должно зависеть от числа строк в таблицах.
+
+Каждый эндпоинт опрашивается трижды — при 10, 100 и 1000 строках (данные
+досеиваются между замерами). Если запросов становится больше, тест падает
+и показывает, какие запросы размножились (обычно это забытый
+select_related/prefetch_related в queryset или обращение к связи в сериализаторе).
+
+Новый эндпоинт: добавить Endpoint в ENDPOINTS с функцией, которая досеивает
+строки, влияющие на ответ.
+"""
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from journal.models import Author, Book, BookLog, Genre, Like, Quote, Share
+from tests.factories import (
+    AuthorFactory, BookFactory, BookLogFactory, GenreFactory, QuoteFactory, ShareFactory, UserFactory,
+)
+from users.models import User
+
+SIZES = (10, 100, 1000)
+
+
+def add_rows(factory, count, **kwargs):
+    """
+    count строк одним INSERT. Все внешние ключи передаются явно —
+    build_batch не сохраняет объекты SubFactory.
+    """
+    model = factory._meta.model
+    return model.objects.bulk_create(factory.build_batch(count, **kwargs))
+
+
+def add_users(count):
+    return add_rows(UserFactory, count)
+
+
+def add_likes(quote, count):
+    Like.objects.bulk_create(Like(user=user, quote=quote) for user in add_users(count))
+
+
+@dataclass
+class World:
+    """
+    Минимальный набор связанных объектов, на которых строятся замеры.
+    """
+    user: User
+    author: Author
+    genre: Genre
+    book: Book
+    book_log: BookLog
+    quote: Quote
+
+    @classmethod
+    def create(cls):
+        user = UserFactory()
+        author = AuthorFactory(created_by=user)
+        genre = GenreFactory(created_by=user)
+        book = BookFactory(author=author, genre=genre, created_by=user)
+        book_log = BookLogFactory(owner=user, book=book)
+        quote = QuoteFactory(book=book, book_log=book_log)
+        return cls(user, author, genre, book, book_log, quote)
+
+    def add_books(self, count):
+        return add_rows(BookFactory, count, author=self.author, genre=self.genre, created_by=self.user)
+
+    def add_book_logs(self, count, **kwargs):
+        kwargs.setdefault('owner', self.user)
+        return add_rows(BookLogFactory, count, book=self.book, **kwargs)
+
+    def add_quotes(self, count):
+        return add_rows(QuoteFactory, count, book=self.book, book_log=self.book_log)
+
+
+@dataclass
+class Endpoint:
+    name: str
+    url: Callable[[World], str]
+    grow: Callable[[World, int], object]
+    params: dict = field(default_factory=dict)
+    authenticated: bool = False
+
+    def __str__(self):
+        return self.name
+
+
+def detail(name, attr):
+    return lambda world: reverse(name, args=[getattr(world, attr).pk])
+
+
+def record_detail(name, model):
+    return lambda world: reverse(name, args=[model.objects.filter(quote=world.quote).first().pk])
+
+
+ENDPOINTS = [
+    # ——— каталог ———
+    Endpoint('authors-list', lambda world: reverse('journal:authors-list'),
+             lambda world, n: add_rows(AuthorFactory, n, created_by=world.user)),
+    Endpoint('authors-list-paginated', lambda world: reverse('journal:authors-list'),
+             lambda world, n: add_rows(AuthorFactory, n, created_by=world.user), {'page_size': 500}),
+    Endpoint('authors-detail', detail('journal:authors-detail', 'author'), World.add_books),
+    Endpoint('genres-list', lambda world: reverse('journal:genres-list'),
+             lambda world, n: add_rows(GenreFactory, n, created_by=world.user)),
+    Endpoint('genres-detail', detail('journal:genres-detail', 'genre'), World.add_books),
+    Endpoint('books-list', lambda world: reverse('journal:books-list'), World.add_books),
+    Endpoint('books-list-by-rating', lambda world: reverse('journal:books-list'), World.add_books,
+             {'ordering': '-avg_score', 'page_size': 500}),
+    Endpoint('books-detail', detail('journal:books-detail', 'book'), World.add_book_logs),
+    # ——— журнал ———
+    Endpoint('book_logs-list', lambda world: reverse('journal:book_logs-list'), World.add_book_logs,
+             authenticated=True),
+    Endpoint('book_logs-list-public', lambda world: reverse('journal:book_logs-list'),
+             lambda world, n: world.add_book_logs(n, owner=add_users(1)[0], privat=False),
+             {'include_public': 1}, authenticated=True),
+    Endpoint('book_logs-detail', detail('journal:book_logs-detail', 'book_log'), World.add_quotes,
+             authenticated=True),
+    Endpoint('stats-list', lambda world: reverse('journal:stats-list'), World.add_book_logs,
+             authenticated=True),
+    # ——— цитаты ———
+    Endpoint('quotes-list', lambda world: reverse('journal:quotes-list'), World.add_quotes),
+    Endpoint('quotes-list-authenticated', lambda world: reverse('journal:quotes-list'), World.add_quotes,
+             authenticated=True),
+    Endpoint('quotes-list-recent-likers', lambda world: reverse('journal:quotes-list'),
+             lambda world, n: [add_likes(quote, 1) for quote in world.add_quotes(n)[:50]],
+             {'recent_likers': 10}),
+    Endpoint('quotes-detail', detail('journal:quotes-detail', 'quote'),
+             lambda world, n: add_likes(world.quote, n), {'recent_likers': 10}),
+    Endpoint('quotes-likes', detail('journal:quotes-likes', 'quote'),
+             lambda world, n: add_likes(world.quote, n)),
+    Endpoint('quotes-shares', detail('journal:quotes-shares', 'quote'),
+             lambda world, n: add_rows(ShareFactory, n, user=world.user, quote=world.quote)),
+    Endpoint('likes-list', lambda world: reverse('journal:likes-list'),
+             lambda world, n: add_likes(world.quote, n)),
+    Endpoint('likes-detail', record_detail('journal:likes-detail', Like),
+             lambda world, n: add_likes(world.quote, n)),
+    Endpoint('shares-list', lambda world: reverse('journal:shares-list'),
+             lambda world, n: add_rows(ShareFactory, n, user=world.user, quote=world.quote)),
+    Endpoint('shares-detail', record_detail('journal:shares-detail', Share),
+             lambda world, n: add_rows(ShareFactory, n, user=world.user, quote=world.quote)),
+    Endpoint('autocomplete-list', lambda world: reverse('journal:autocomplete-list'), World.add_books,
+             {'q': 'the'}),
+    # ——— асинхронное чтение ———
+    Endpoint('async-books', lambda world: reverse('journal:async-books'), World.add_books),
+    Endpoint('async-quotes', lambda world: reverse('journal:async-quotes'), World.add_quotes),
+    # ——— пользователи ———
+    Endpoint('user-list', lambda world: reverse('users:user-list'), lambda world, n: add_users(n),
+             authenticated=True),
+    Endpoint('user-detail', detail('users:user-detail', 'user'), lambda world, n: add_users(n),
+             authenticated=True),
+    Endpoint('user-current', lambda world: reverse('users:user-current'), lambda world, n: add_users(n),
+             authenticated=True),
+]
+
+_LITERALS = [
+    (re.compile(r"'(?:[^']|'')*'"), "'?'"),
+    (re.compile(r'\b\d+(\.\d+)?\b'), '?'),
+    (re.compile(r'\((\?, )+\?\)'), '(...)'),
+]
+
+
+def normalize(sql):
+    for pattern, replacement in _LITERALS:
+        sql = pattern.sub(replacement, sql)
+    return sql
+
+
+def capture(api_client, url, params):
+    # ответы каталога кэшируются, а досеивание кэш не сбрасывает — замеряем «холодный» запрос
+    cache.clear()
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get(url, params)
+    assert response.status_code == 200, response.content[:500]
+    return [query['sql'] for query in context.captured_queries]
+
+
+def growth_report(endpoint, url, counts):
+    """
+    Сообщение об ошибке: сколько запросов на каждом размере и какие из них размножились.
+    """
+    (small, first), (large, last) = counts[0], counts[-1]
+    grown = Counter(map(normalize, last))
+    grown.subtract(Counter(map(normalize, first)))
+    lines = [f'{endpoint} (GET {url}): число запросов зависит от числа строк']
+    lines += [f'  {size} строк: {len(queries)} запросов' for size, queries in counts]
+    lines.append(f'запросы, которых при {large} строках больше, чем при {small}:')
+    lines += [f'  +{extra} × {sql}' for sql, extra in grown.most_common() if extra > 0]
+    return '\n'.join(lines)
+
+
+@pytest.mark.django_db
+class TestQueryCounts:
+
+    @pytest.mark.parametrize('endpoint', ENDPOINTS, ids=str)
+    def test_query_count_does_not_grow_with_rows(self, api_client, endpoint):
+        world = World.create()
+        if endpoint.authenticated:
+            api_client.force_authenticate(user=world.user)
+
+        counts, seeded = [], 0
+        for size in SIZES:
+            endpoint.grow(world, size - seeded)
+            seeded = size
+            url = endpoint.url(world)
+            counts.append((size, capture(api_client, url, endpoint.params)))
+
+        assert len({len(queries) for _, queries in counts}) == 1, growth_report(endpoint, url, counts)
+
+    def test_report_shows_repeated_query(self):
+        counts = [
+            (10, ['SELECT 1', 'SELECT * FROM "users_user" WHERE "id" = 1']),
+            (100, ['SELECT 1'] + [f'SELECT * FROM "users_user" WHERE "id" = {pk}' for pk in range(5)]),
+        ]
+        report = growth_report('likes-list', '/likes/', counts)
+        assert '+4 × SELECT * FROM "users_user" WHERE "id" = ?' in report
+        assert 'SELECT 1' not in report
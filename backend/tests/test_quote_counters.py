@@ -0,0 +1,96 @@
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from journal.api.views import LikeViewSet, ShareViewSet
+from journal.models import Like, Quote, Share
+from tests.factories import LikeFactory, QuoteFactory, ShareFactory, UserFactory
+
+
+@pytest.mark.django_db
+class TestQuoteCounters:
+
+    def test_like_create_and_destroy_update_counter(self, api_client):
+        quote = QuoteFactory()
+        user = UserFactory()
+        api_client.force_authenticate(user=user)
+
+        response = api_client.post(reverse('journal:likes-list'), {'quote': quote.pk}, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+        quote.refresh_from_db()
+        assert quote.like_count == 1
+
+        response = api_client.delete(reverse('journal:likes-detail', args=[response.json()['id']]))
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        quote.refresh_from_db()
+        assert quote.like_count == 0
+
+    def test_duplicate_like_keeps_counter(self, api_client):
+        quote = QuoteFactory()
+        user = UserFactory()
+        api_client.force_authenticate(user=user)
+        url = reverse('journal:likes-list')
+
+        api_client.post(url, {'quote': quote.pk}, format='json')
+        response = api_client.post(url, {'quote': quote.pk}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        quote.refresh_from_db()
+        assert quote.like_count == 1
+
+    def test_foreign_like_cannot_be_deleted(self, api_client):
+        like = LikeFactory()
+        api_client.force_authenticate(user=UserFactory())
+        response = api_client.delete(reverse('journal:likes-detail', args=[like.pk]))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_share_create_and_destroy_update_counter(self, api_client):
+        quote = QuoteFactory()
+        api_client.force_authenticate(user=UserFactory())
+
+        response = api_client.post(
+            reverse('journal:shares-list'),
+            {'quote': quote.pk, 'destination': 'telegram'},
+            format='json',
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        quote.refresh_from_db()
+        assert quote.share_count == 1
+
+        api_client.delete(reverse('journal:shares-detail', args=[response.json()['id']]))
+        quote.refresh_from_db()
+        assert quote.share_count == 0
+
+    @pytest.mark.parametrize('model, viewset, factory, field', [
+        (Like, LikeViewSet, LikeFactory, 'like_count'),
+        (Share, ShareViewSet, ShareFactory, 'share_count'),
+    ])
+    def test_concurrent_destroy_decrements_once(self, model, viewset, factory, field):
+        record = factory()
+        factory(quote=record.quote)
+        Quote.objects.filter(pk=record.quote_id).update(**{field: 2})
+        # оба запроса успели загрузить запись до удаления
+        first, second = model.objects.get(pk=record.pk), model.objects.get(pk=record.pk)
+
+        viewset().perform_destroy(first)
+        viewset().perform_destroy(second)
+
+        assert getattr(Quote.objects.get(pk=record.quote_id), field) == 1
+
+    def test_order_by_popularity(self, api_client):
+        calm, popular = QuoteFactory(), QuoteFactory()
+        Quote.objects.filter(pk=popular.pk).update(like_count=5)
+
+        response = api_client.get(reverse('journal:quotes-list'), {'ordering': '-like_count'})
+        assert [item['id'] for item in response.json()] == [popular.pk, calm.pk]
+
+    def test_recount_command_repairs_drift(self):
+        quote = QuoteFactory()
+        LikeFactory.create_batch(2, quote=quote)
+        ShareFactory(quote=quote)
+        Quote.objects.filter(pk=quote.pk).update(like_count=7, share_count=0)
+
+        call_command('recount_quote_counters')
+
+        quote.refresh_from_db()
+        assert (quote.like_count, quote.share_count) == (2, 1)
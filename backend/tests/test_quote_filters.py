@@ -0,0 +1,52 @@
+from datetime import datetime
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from journal.models import Quote
+from tests.factories import BookFactory, QuoteFactory
+
+
+def at(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+@pytest.mark.django_db
+class TestQuoteDateFilter:
+
+    url = reverse('journal:quotes-list')
+
+    def make_quote(self, moment, **kwargs):
+        quote = QuoteFactory(**kwargs)
+        # auto_now_add не даёт задать дату при создании
+        Quote.objects.filter(pk=quote.pk).update(created_at=moment)
+        return quote
+
+    def ids(self, api_client, **params):
+        return {item['id'] for item in api_client.get(self.url, params).json()}
+
+    def test_range_includes_whole_last_day(self, api_client):
+        before = self.make_quote(at(2026, 8, 31, 23, 59))
+        first = self.make_quote(at(2026, 9, 1, 0, 0))
+        last = self.make_quote(at(2026, 9, 30, 23, 59))
+        after = self.make_quote(at(2026, 10, 1, 0, 0))
+
+        assert self.ids(api_client, date_from='2026-09-01', date_to='2026-09-30') == {first.pk, last.pk}
+        assert self.ids(api_client, date_from='2026-09-01') == {first.pk, last.pk, after.pk}
+        assert self.ids(api_client, date_to='2026-08-31') == {before.pk}
+
+    def test_by_author_and_month(self, api_client):
+        book = BookFactory()
+        wanted = self.make_quote(at(2026, 9, 15), book=book)
+        self.make_quote(at(2026, 8, 15), book=book)
+        self.make_quote(at(2026, 9, 15))
+
+        found = self.ids(api_client, author=book.author_id, date_from='2026-09-01', date_to='2026-09-30')
+
+        assert found == {wanted.pk}
+
+    def test_created_at_is_returned(self, api_client):
+        quote = QuoteFactory()
+        data = api_client.get(reverse('journal:quotes-detail', args=[quote.pk])).json()
+        assert data['created_at'] is not None
@@ -0,0 +1,105 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from journal.counters import repair_counters
+from tests.factories import BookLogFactory, LikeFactory, QuoteFactory, ShareFactory, UserFactory
+
+
+@pytest.mark.django_db
+class TestQuoteCompactRepresentation:
+
+    def test_counts_instead_of_nested_lists(self, api_client):
+        quote = QuoteFactory()
+        LikeFactory.create_batch(3, quote=quote)
+        ShareFactory.create_batch(2, quote=quote)
+        repair_counters()  # фабрики создают строки мимо API, счётчики выравниваем вручную
+
+        response = api_client.get(reverse('journal:quotes-detail', args=[quote.pk]))
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data['likes_count'] == 3
+        assert data['shares_count'] == 2
+        assert data['liked_by_me'] is False
+        assert data['recent_likers'] == []
+        assert 'likes' not in data and 'shared' not in data
+
+    def test_liked_by_me(self, api_client):
+        user = UserFactory()
+        liked, other = QuoteFactory(), QuoteFactory()
+        LikeFactory(quote=liked, user=user)
+        LikeFactory(quote=other)
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get(reverse('journal:quotes-list'))
+        flags = {item['id']: item['liked_by_me'] for item in response.json()}
+        assert flags == {liked.pk: True, other.pk: False}
+
+    def test_recent_likers_are_limited(self, api_client):
+        quote = QuoteFactory()
+        likes = LikeFactory.create_batch(4, quote=quote)
+
+        response = api_client.get(reverse('journal:quotes-list'), {'recent_likers': 2})
+        likers = response.json()[0]['recent_likers']
+        assert [u['id'] for u in likers] == [likes[3].user_id, likes[2].user_id]
+        assert 'email' not in likers[0]
+
+    def test_likes_subresource_is_paginated(self, api_client):
+        quote = QuoteFactory()
+        LikeFactory.create_batch(3, quote=quote)
+        LikeFactory()  # лайк другой цитаты не должен попасть в выдачу
+
+        url = reverse('journal:quotes-likes', args=[quote.pk])
+        response = api_client.get(url, {'page_size': 2})
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert len(data['results']) == 2
+        assert all(item['quote'] == quote.pk for item in data['results'])
+
+        rest = api_client.get(data['next']).json()
+        assert len(rest['results']) == 1
+
+    @pytest.mark.parametrize('name,factory', [('quotes-likes', LikeFactory), ('quotes-shares', ShareFactory)])
+    def test_subresources_hide_email(self, api_client, name, factory):
+        record = factory(user=UserFactory(email='liker@example.com'))
+
+        response = api_client.get(reverse(f'journal:{name}', args=[record.quote_id]))
+
+        user = response.json()['results'][0]['user']
+        assert user['id'] == record.user_id
+        assert 'email' not in user and 'email_confirmed' not in user and 'user_type' not in user
+        assert 'liker@example.com' not in response.content.decode()
+
+    def test_likes_subresource_unknown_quote(self, api_client):
+        response = api_client.get(reverse('journal:quotes-likes', args=[999999]))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestQuoteBookLogPrivacy:
+
+    @pytest.fixture
+    def private_quote(self):
+        book_log = BookLogFactory(privat=True, topic='секретная тема')
+        return QuoteFactory(book_log=book_log, book=book_log.book, note='публичная цитата')
+
+    def test_private_log_is_hidden_from_others(self, api_client, private_quote):
+        detail = api_client.get(reverse('journal:quotes-detail', args=[private_quote.pk])).json()
+        listed = api_client.get(reverse('journal:quotes-list')).json()
+        found = api_client.get(reverse('journal:quotes-list'), {'q': 'публичная'}).json()
+
+        assert detail['book_log'] is None
+        assert [quote['book_log'] for quote in listed] == [None]
+        assert [quote['id'] for quote in found] == [private_quote.pk]
+        assert 'секретная' not in str(found)
+
+        api_client.force_authenticate(user=UserFactory())
+        response = api_client.get(reverse('journal:quotes-list'), {'fields': 'id,book_log.topic'})
+        assert response.json() == [{'id': private_quote.pk, 'book_log': None}]
+
+    def test_owner_sees_own_private_log(self, api_client, private_quote):
+        api_client.force_authenticate(user=private_quote.book_log.owner)
+
+        data = api_client.get(reverse('journal:quotes-detail', args=[private_quote.pk])).json()
+
+        assert data['book_log']['topic'] == 'секретная тема'
@@ -0,0 +1,114 @@
+from datetime import date
+from importlib import import_module
+
+import pytest
+from django.apps import apps
+from django.core.management import call_command
+from django.urls import reverse
+
+from journal.models import ReadingStats
+from journal.stats import rebuild_stats
+from users.models import UserTypes
+from tests.factories import AuthorFactory, BookFactory, BookLogFactory, GenreFactory, UserFactory
+
+
+def snapshot(user):
+    return sorted(
+        ReadingStats.objects.filter(user=user).values_list(
+            'dimension', 'key', 'books', 'score_sum', 'symbols', 'timed_books', 'timed_symbols', 'reading_days',
+        )
+    )
+
+
+@pytest.mark.django_db
+class TestReadingStats:
+
+    @pytest.fixture
+    def reader(self, api_client):
+        user = UserFactory(user_type=UserTypes.JOURNALIST)
+        api_client.force_authenticate(user=user)
+        return user
+
+    def assert_matches_rebuild(self, user):
+        incremental = snapshot(user)
+        rebuild_stats([user.pk])
+        assert incremental == snapshot(user)
+
+    def test_incremental_updates_match_rebuild(self, reader):
+        book = BookFactory(symbols=1000)
+        log = BookLogFactory(owner=reader, book=book, score=8, start=date(2026, 9, 1), end=date(2026, 9, 10))
+        BookLogFactory(owner=reader, score=4, start=None, end=date(2026, 8, 5))
+        self.assert_matches_rebuild(reader)
+
+        log.score = 10
+        log.end = date(2026, 10, 2)
+        log.book = BookFactory(symbols=500)
+        log.save()
+        self.assert_matches_rebuild(reader)
+
+        log.delete()
+        self.assert_matches_rebuild(reader)
+        assert not ReadingStats.objects.filter(user=reader, key=book.genre_id, dimension='genre').exists()
+
+    def test_bulk_import_is_counted(self, api_client, reader):
+        book = BookFactory()
+        api_client.post(
+            reverse('journal:book_logs-bulk'),
+            [{'book_id': book.pk, 'score': 7, 'end': '2026-09-03'}] * 3,
+            format='json',
+        )
+        month = ReadingStats.objects.get(user=reader, dimension='month', key=202609)
+        assert (month.books, month.score_sum) == (3, 21)
+
+    def test_book_change_rebuilds_readers(self, reader):
+        log = BookLogFactory(owner=reader)
+        new_genre = GenreFactory()
+        log.book.genre = new_genre
+        log.book.save()
+
+        assert ReadingStats.objects.filter(user=reader, dimension='genre', key=new_genre.pk, books=1).exists()
+        self.assert_matches_rebuild(reader)
+
+    def test_endpoint(self, api_client, reader):
+        author = AuthorFactory(last_name='Толстой', first_name='Лев')
+        genre = GenreFactory(title='Роман')
+        book = BookFactory(author=author, genre=genre, symbols=3000)
+        BookLogFactory(owner=reader, book=book, score=10, start=date(2026, 9, 1), end=date(2026, 9, 3))
+        BookLogFactory(owner=reader, book=book, score=6, start=None, end=date(2026, 10, 1))
+        BookLogFactory(score=1)  # чужая запись
+
+        data = api_client.get(reverse('journal:stats-list')).json()
+
+        assert data['total'] == {
+            'books': 2, 'avg_score': 8.0, 'symbols': 6000, 'avg_days': 3.0, 'symbols_per_day': 1000,
+        }
+        assert [month['month'] for month in data['months']] == ['2026-09', '2026-10']
+        assert data['genres'][0]['title'] == 'Роман'
+        assert data['authors'][0] == {
+            'id': author.pk, 'name': 'Толстой Лев', 'books': 2, 'avg_score': 8.0,
+            'symbols': 6000, 'avg_days': 3.0, 'symbols_per_day': 1000,
+        }
+
+    def test_endpoint_requires_login(self, api_client):
+        assert api_client.get(reverse('journal:stats-list')).status_code in (401, 403)
+
+    def test_rebuild_command(self, reader):
+        BookLogFactory(owner=reader)
+        expected = snapshot(reader)
+        ReadingStats.objects.all().delete()
+        ReadingStats.objects.create(user=UserFactory(), dimension='month', key=202001, books=5)
+
+        call_command('rebuild_reading_stats')
+
+        assert snapshot(reader) == expected
+        assert ReadingStats.objects.count() == len(expected)
+
+    def test_migration_backfills_existing_logs(self, reader):
+        BookLogFactory(owner=reader, score=7, start=date(2026, 9, 1), end=date(2026, 9, 3))
+        BookLogFactory(owner=reader, score=5)
+        expected = snapshot(reader)
+        ReadingStats.objects.all().delete()
+
+        import_module('journal.migrations.0011_reading_stats').fill_stats(apps, None)
+
+        assert snapshot(reader) == expected
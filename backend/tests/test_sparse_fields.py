@@ -0,0 +1,74 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from users.models import UserTypes
+from tests.factories import BookLogFactory, QuoteFactory, UserFactory
+
+
+def selects(context):
+    return [q['sql'] for q in context.captured_queries if q['sql'].startswith('SELECT')]
+
+
+@pytest.mark.django_db
+class TestSparseFields:
+
+    quotes_url = reverse('journal:quotes-list')
+
+    def test_default_representation_unchanged(self, api_client):
+        QuoteFactory()
+        item = api_client.get(self.quotes_url).json()[0]
+        assert item['book']['genre']['title']
+        assert item['book_log']['ideas']
+
+    def test_fields_with_nested_paths(self, api_client):
+        quote = QuoteFactory()
+        item = api_client.get(self.quotes_url, {'fields': 'id,note,book.title,book.genre.title'}).json()[0]
+        assert item == {
+            'id': quote.pk,
+            'note': quote.note,
+            'book': {'title': quote.book.title, 'genre': {'title': quote.book.genre.title}},
+        }
+
+    def test_expand_collapses_other_relations_to_ids(self, api_client):
+        quote = QuoteFactory()
+        item = api_client.get(self.quotes_url, {'expand': 'book'}).json()[0]
+        assert item['book_log'] == quote.book_log_id
+        assert item['book']['genre'] == quote.book.genre_id
+
+        item = api_client.get(self.quotes_url, {'expand': 'book_log.book'}).json()[0]
+        assert item['book'] == quote.book_id
+        assert item['book_log']['book']['id'] == quote.book_log.book_id
+
+    def test_quote_list_does_not_read_log_texts(self, api_client):
+        QuoteFactory.create_batch(3)
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get(self.quotes_url, {'fields': 'id,note,book_log.topic'})
+        assert response.status_code == 200
+        sql = ' '.join(selects(context))
+        assert '"journal_booklog"."topic"' in sql
+        assert '"journal_booklog"."ideas"' not in sql
+        assert 'search_vector' not in sql
+        # книга в ответ не попала — и JOIN на неё не нужен
+        assert '"journal_book"' not in sql
+
+    def test_collapsed_relations_are_not_joined(self, api_client):
+        user = UserFactory(user_type=UserTypes.JOURNALIST)
+        api_client.force_authenticate(user=user)
+        log = BookLogFactory(owner=user)
+        with CaptureQueriesContext(connection) as context:
+            data = api_client.get(reverse('journal:book_logs-list'), {'expand': ''}).json()
+        assert data[0]['book'] == log.book_id
+        assert 'JOIN' not in ' '.join(selects(context))
+
+    def test_writes_ignore_sparse_params(self, api_client):
+        user = UserFactory(user_type=UserTypes.JOURNALIST)
+        api_client.force_authenticate(user=user)
+        log = BookLogFactory(owner=user)
+        response = api_client.patch(
+            reverse('journal:book_logs-detail', args=[log.pk]) + '?fields=id',
+            {'topic': 'Новая тема'}, format='json',
+        )
+        assert response.status_code == 200
+        assert response.json()['topic'] == 'Новая тема'
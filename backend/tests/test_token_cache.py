@@ -0,0 +1,100 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from authentication.token_cache import HITS_FLUSH_EVERY, auth_stats, verified_tokens
+from tests.factories import UserFactory
+
+
+@pytest.mark.django_db
+class TestVerifiedTokenCache:
+
+    current_url = reverse('users:user-current')
+
+    @pytest.fixture
+    def tokens(self):
+        user = UserFactory(name='Лев')
+        refresh = RefreshToken.for_user(user)
+        return user, refresh, str(refresh.access_token)
+
+    def get_current(self, api_client, access):
+        return api_client.get(self.current_url, HTTP_AUTHORIZATION=f'Bearer {access}')
+
+    def test_repeated_requests_skip_user_query(self, api_client, tokens, django_assert_num_queries):
+        user, _, access = tokens
+        # пользователь и проверка отзыва (BlacklistedToken)
+        with django_assert_num_queries(2):
+            assert self.get_current(api_client, access).json()['id'] == user.pk
+        with django_assert_num_queries(0):
+            assert self.get_current(api_client, access).json()['id'] == user.pk
+        assert auth_stats()['token_cache_misses'] == 1
+
+    def test_hits_are_counted_in_batches(self, api_client, tokens):
+        _, _, access = tokens
+        for _ in range(HITS_FLUSH_EVERY + 1):
+            self.get_current(api_client, access)
+        assert auth_stats()['token_cache_hits'] == HITS_FLUSH_EVERY
+
+    def test_user_save_invalidates_cached_user(self, api_client, tokens):
+        user, _, access = tokens
+        self.get_current(api_client, access)
+
+        user.name = 'Фёдор'
+        user.save()
+
+        assert self.get_current(api_client, access).json()['name'] == 'Фёдор'
+
+    def test_logout_revokes_access_token(self, api_client, tokens):
+        _, refresh, _ = tokens
+        # отзываются токены, выданные раньше секунды выхода
+        token = refresh.access_token
+        token['iat'] -= 5
+        access = str(token)
+        assert self.get_current(api_client, access).status_code == 200
+
+        refresh.blacklist()
+
+        assert self.get_current(api_client, access).status_code == 401
+
+    def test_logout_is_seen_by_other_workers(self, api_client, tokens):
+        _, refresh, _ = tokens
+        token = refresh.access_token
+        token['iat'] -= 5
+        access = str(token)
+        refresh.blacklist()
+        # другой воркер: своего кэша токенов и locmem-кэша Django у него нет
+        verified_tokens.clear()
+        cache.clear()
+
+        assert self.get_current(api_client, access).status_code == 401
+
+    def test_token_issued_after_logout_is_accepted(self, api_client, tokens):
+        user, refresh, _ = tokens
+        refresh.blacklist()
+        # вышел 10 секунд назад и снова вошёл
+        BlacklistedToken.objects.update(blacklisted_at=timezone.now() - timedelta(seconds=10))
+        access = str(RefreshToken.for_user(user).access_token)
+
+        assert self.get_current(api_client, access).status_code == 200
+
+    def test_disabled_cache(self, api_client, tokens, settings, django_assert_num_queries):
+        settings.AUTH_TOKEN_CACHE_TTL = 0
+        _, _, access = tokens
+        self.get_current(api_client, access)
+        with django_assert_num_queries(2):
+            self.get_current(api_client, access)
+
+    def test_refreshes_are_counted(self, api_client, tokens):
+        _, refresh, _ = tokens
+        url = reverse('token_refresh')
+
+        assert api_client.post(url, {'refresh': str(refresh)}, format='json').status_code == 200
+        assert api_client.post(url, {'refresh': 'broken'}, format='json').status_code == 401
+
+        stats = auth_stats()
+        assert (stats['refreshes'], stats['refresh_failures']) == (1, 1)
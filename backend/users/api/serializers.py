@@ -8,12 +8,16 @@ from django.core.validators import EmailValidator
 
 from allauth.account.models import EmailAddress
 
+from journal.api.fields import ImageVariantsField
+
 class UserSerializer(serializers.ModelSerializer):
     logo = serializers.ImageField(
         use_url=True,
         allow_null=True,
         required=False
     )
+    # уменьшенные копии аватара (jobs/images.py)
+    logo_variants = ImageVariantsField()
     email = serializers.EmailField(
         required=False
     )
@@ -21,7 +25,7 @@ class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         # Разрешаем менять только эти поля
-        fields = ['id', 'username', 'name', 'email', 'email_confirmed', 'logo', 'user_type']
+        fields = ['id', 'username', 'name', 'email', 'email_confirmed', 'logo', 'logo_variants', 'user_type']
         read_only_fields = ['id', 'username', 'email_confirmed']
 
 
@@ -39,6 +43,19 @@ class UserSerializer(serializers.ModelSerializer):
         return instance
 
 
+class UserShortSerializer(serializers.ModelSerializer):
+    """
+    Публичная «карточка» пользователя без email — для списков лайкнувших и т.п.
+    """
+    logo = serializers.ImageField(use_url=True, read_only=True)
+    logo_variants = ImageVariantsField()
+
+    class Meta:
+        model = User
+        fields = ['id', 'username', 'name', 'logo', 'logo_variants']
+        read_only_fields = fields
+
+
 class ProfileDeletionConfirmSerializer(serializers.Serializer):
     token = serializers.CharField()
 
@@ -22,6 +22,13 @@ class User(AbstractUser):
         blank=True,
         null=True
     )
+    # уменьшенные копии logo (jobs/images.py)
+    logo_variants = models.JSONField(
+        verbose_name="Копии картинки профиля",
+        default=dict,
+        blank=True,
+        editable=False
+    )
     email_confirmed = models.BooleanField(
         verbose_name="Статус подтверждения электронной почты", 
         default=False